@@ -1,5 +1,4 @@
-import os
-import sqlite3
+import json
 from pathlib import Path
 from typing import Dict, Iterable, List, Sequence, Tuple
 
@@ -7,6 +6,7 @@ import pandas as pd
 import streamlit as st
 
 from utils import extractor_v4
+from utils.chart_parser import parse_chart
 from utils.db_manager import (
     init_db,
     list_cases,
@@ -24,9 +24,23 @@ from utils.db_manager import (
     search_relations,
     search_rules,
 )
+from utils.interpreter_v2 import interpret
+from utils.kb_snapshot import resolve_read_path
 from utils.logic_infer_explainable import infer_logic_explainable
-from utils.profile_manager import delete_profile, list_profiles, load_profile, save_profile
+from utils.profile_manager import (
+    PROFILE_PAGE_SIZE,
+    count_profiles,
+    delete_profile,
+    list_profiles,
+    load_profile,
+    save_profile,
+)
+from utils.read_cache import cached_case_index, data_versions
+from utils.records import CaseRecord, RuleRecord, TermRecord, records_frame
+from utils.relations import BRANCHES, STEMS
 from utils.saju_core_v2 import EARTHLY_BRANCHES, HEAVENLY_STEMS, analyze_saju
+from utils.timeline import TRANSIT_COUNT_COLUMNS, build_timeline
+from utils.upload_store import StoredFile, protected_store, upload_store
 from utils.visualize_v3 import draw_relation_network
 
 
@@ -40,6 +54,11 @@ st.title("🪶 AI 명리 해석 시스템 (Explainable Ver.)")
 DEFAULT_GAN = ["丁", "戊", "辛", "辛"]
 DEFAULT_ZHI = ["午", "卯", "亥", "子"]
 
+CASE_DB_PATH = Path(__file__).resolve().parent / "suri_db_system" / "db" / "suri_manual.db"
+# 최신 스냅샷이 있으면 읽기 전용으로 바로 사용하고, 없거나 낡았으면 원본 DB 를 초기화해 읽는다 (실행마다 한 번)
+CASE_READ_PATH = resolve_read_path(str(CASE_DB_PATH))
+SIMILAR_CASE_COUNT = 5
+
 GAN_KEYS = ["gan_si", "gan_il", "gan_wol", "gan_nyeon"]
 ZHI_KEYS = ["zhi_si", "zhi_il", "zhi_wol", "zhi_nyeon"]
 
@@ -93,11 +112,8 @@ init_db()
 # ---------------------------------------------------------------------------
 # Helper utilities
 # ---------------------------------------------------------------------------
-def _save_uploaded_file(uploaded_file) -> Tuple[Path, bool]:
-    """Persist an uploaded file, routing sensitive names to a secure folder."""
-
-    uploads_dir = Path("data/uploads")
-    secure_dir = Path("data/protected")
+def _save_uploaded_file(uploaded_file, protect: Iterable[str] = ()) -> Tuple[StoredFile, bool]:
+    """Stream an upload into the content-addressed store, routing sensitive names to a secure store."""
 
     sensitive_names = {".env", "env", "secrets.env", ".gitignore"}
     sensitive_suffixes = (".env", ".gitignore", ".streamlit", ".secrets")
@@ -106,14 +122,8 @@ def _save_uploaded_file(uploaded_file) -> Tuple[Path, bool]:
     file_lower = file_name.lower()
     is_sensitive = file_lower in sensitive_names or any(file_lower.endswith(suffix) for suffix in sensitive_suffixes)
 
-    target_dir = secure_dir if is_sensitive else uploads_dir
-    target_dir.mkdir(parents=True, exist_ok=True)
-
-    file_path = target_dir / file_name
-    with open(file_path, "wb") as buffer:
-        buffer.write(uploaded_file.read())
-
-    return file_path, is_sensitive
+    store = protected_store() if is_sensitive else upload_store()
+    return store.save(uploaded_file, file_name, protect=protect), is_sensitive
 
 
 def _convert_terms_to_principles(terms: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
@@ -142,6 +152,12 @@ def _cases_to_relations(cases: Iterable[Dict[str, str]]) -> List[Dict[str, str]]
     return payload
 
 
+def _similar_cases(gan_values: Sequence[str], zhi_values: Sequence[str]) -> List[Dict[str, object]]:
+    """Stored cases structurally closest to the given chart (one index per process, rebuilt only when cases change)."""
+    pillars = parse_chart(" ".join(gan + zhi for gan, zhi in zip(gan_values, zhi_values)))
+    return cached_case_index(CASE_READ_PATH).similar(pillars or {}, k=SIMILAR_CASE_COUNT)
+
+
 def _structure_relations_to_edges(relations: Sequence[str]) -> List[Tuple[str, str, str]]:
     edges: List[Tuple[str, str, str]] = []
     for relation in relations:
@@ -171,45 +187,79 @@ tabs = st.tabs(
 # ---------------------------------------------------------------------------
 with tabs[0]:
     st.header("📄 문서 업로드 및 지식 정리")
-    uploaded = st.file_uploader(
-        "문서를 업로드하세요",
+    uploaded_files = st.file_uploader(
+        "문서를 업로드하세요 (여러 개 선택 가능)",
         type=["txt", "md", "docx", "pdf", "json", "xlsx", "xls", "zip"],
+        accept_multiple_files=True,
     )
 
-    if uploaded is not None:
-        saved_path, is_sensitive = _save_uploaded_file(uploaded)
-        if is_sensitive:
-            st.warning(f"🔐 보안 파일로 분류되어 별도 영역에 저장되었습니다: {saved_path}")
-        else:
-            extracted = extractor_v4.extract_rules_terms_cases(str(saved_path))
-            st.session_state["doc_source"] = saved_path.name
-            st.session_state["doc_source_path"] = str(saved_path)
-            st.session_state["doc_concepts"] = [
+    if uploaded_files:
+        # 저장 경로는 내용 해시이므로 화면·출처에는 원래 파일 이름을 쓴다 (같은 내용은 한 번만 처리)
+        document_names: Dict[str, str] = {}
+        saved_keys: List[str] = []
+        for uploaded in uploaded_files:
+            stored, is_sensitive = _save_uploaded_file(uploaded, protect=saved_keys)
+            if is_sensitive:
+                st.warning(f"🔐 보안 파일로 분류되어 별도 영역에 저장되었습니다: {stored.name}")
+            else:
+                saved_keys.append(stored.key)
+                document_names.setdefault(str(stored.path), stored.name)
+        document_paths = list(document_names)
+
+        progress_rows: Dict[str, Dict[str, object]] = {
+            path: {"파일": name, "상태": "⏳ 대기", "개념": 0, "사례": 0, "오류": ""}
+            for path, name in document_names.items()
+        }
+        progress_table = st.empty()
+        concepts: List[Dict[str, str]] = []
+        cases: List[CaseRecord] = []
+        rules: List[RuleRecord] = []
+        terms: List[TermRecord] = []
+        for result in extractor_v4.extract_many(document_paths):
+            source = document_names[result["path"]]
+            row = progress_rows[result["path"]]
+            if result["error"]:
+                row["상태"] = "❌ 실패"
+                row["오류"] = result["error"]
+                progress_table.dataframe(pd.DataFrame(progress_rows.values()))
+                continue
+
+            extracted = result["payload"]
+            file_concepts = [
                 {
                     "title": concept.get("title", ""),
                     "content": concept.get("content", ""),
                     "category": concept.get("category", "") or "개념",
+                    "source": source,
                 }
                 for concept in extracted.get("concepts", [])
             ]
-            st.session_state["doc_cases"] = [
-                {
-                    "title": case.get("title", ""),
-                    "chart": case.get("chart", ""),
-                    "summary": case.get("summary", ""),
-                    "content": case.get("content", ""),
-                    "tags": ", ".join(case.get("tags", [])),
-                }
-                for case in extracted.get("cases", [])
-            ]
-            st.session_state["doc_rules"] = extracted.get("rules", [])
-            st.session_state["doc_terms"] = extracted.get("terms", [])
+            file_cases = extracted.get("cases", [])
+            for case in file_cases:
+                case.source = source
+            concepts.extend(file_concepts)
+            cases.extend(file_cases)
+            rules.extend(extracted.get("rules", []))
+            terms.extend(extracted.get("terms", []))
+            row.update({"상태": "✅ 완료", "개념": len(file_concepts), "사례": len(file_cases)})
+            progress_table.dataframe(pd.DataFrame(progress_rows.values()))
+
+        if document_paths:
+            st.session_state["doc_source"] = ", ".join(document_names.values())
+            st.session_state["doc_source_path"] = document_paths[0] if len(document_paths) == 1 else ""
+            st.session_state["doc_concepts"] = concepts
+            st.session_state["doc_cases"] = cases
+            st.session_state["doc_rules"] = rules
+            st.session_state["doc_terms"] = terms
+            failed = sum(1 for row in progress_rows.values() if row["오류"])
             st.success(
                 "📥 추출 완료 — 개념 {concepts}건, 사례 {cases}건. 저장 전에 수정할 수 있습니다.".format(
-                    concepts=len(st.session_state["doc_concepts"]),
-                    cases=len(st.session_state["doc_cases"]),
+                    concepts=len(concepts),
+                    cases=len(cases),
                 )
             )
+            if failed:
+                st.error(f"❌ {failed}개 파일 추출 실패 — 나머지 파일의 결과만 표시합니다.")
 
     concepts_state = st.session_state.get("doc_concepts", [])
     cases_state = st.session_state.get("doc_cases", [])
@@ -226,7 +276,7 @@ with tabs[0]:
 
         concept_df = pd.DataFrame(concepts_state)
         if concept_df.empty:
-            concept_df = pd.DataFrame(columns=["title", "content", "category"])
+            concept_df = pd.DataFrame(columns=["title", "content", "category", "source"])
         edited_concepts = st.data_editor(
             concept_df,
             num_rows="dynamic",
@@ -235,6 +285,7 @@ with tabs[0]:
                 "title": st.column_config.TextColumn("제목", width="medium"),
                 "content": st.column_config.TextColumn("내용", width="large"),
                 "category": st.column_config.TextColumn("분류", width="small"),
+                "source": st.column_config.TextColumn("출처", width="small"),
             },
             key="concept_editor",
         )
@@ -243,9 +294,10 @@ with tabs[0]:
         )
 
         st.markdown("### 사례 (본문 포함)")
-        cases_df = pd.DataFrame(cases_state)
-        if cases_df.empty:
-            cases_df = pd.DataFrame(columns=["title", "chart", "summary", "content", "tags"])
+        cases_df = records_frame(cases_state, CaseRecord).reindex(
+            columns=["title", "chart", "summary", "content", "tags", "source"]
+        )
+        cases_df["tags"] = [", ".join(tags) if isinstance(tags, (list, tuple)) else tags for tags in cases_df["tags"]]
         edited_cases = st.data_editor(
             cases_df,
             num_rows="dynamic",
@@ -256,6 +308,7 @@ with tabs[0]:
                 "summary": st.column_config.TextColumn("요약", width="medium"),
                 "content": st.column_config.TextColumn("본문", width="large"),
                 "tags": st.column_config.TextColumn("태그 (쉼표 구분)", width="medium"),
+                "source": st.column_config.TextColumn("출처", width="small"),
             },
             key="case_editor",
         )
@@ -265,9 +318,9 @@ with tabs[0]:
 
         with st.expander("🧾 규칙·용어 (참고)", expanded=False):
             st.markdown("**규칙**")
-            st.dataframe(pd.DataFrame(rules_state) if rules_state else pd.DataFrame(columns=["condition", "result"]))
+            st.dataframe(records_frame(rules_state, RuleRecord))
             st.markdown("**용어**")
-            st.dataframe(pd.DataFrame(terms_state) if terms_state else pd.DataFrame(columns=["term", "definition"]))
+            st.dataframe(records_frame(terms_state, TermRecord))
 
         if st.button("💾 수정 내용 DB 저장", type="primary"):
             source_label = st.session_state.get("doc_source", "")
@@ -276,7 +329,7 @@ with tabs[0]:
                     "title": item.get("title", "").strip(),
                     "content": item.get("content", "").strip(),
                     "category": item.get("category", "") or "개념",
-                    "source": source_label,
+                    "source": item.get("source") or source_label,
                 }
                 for item in st.session_state.get("doc_concepts", [])
                 if item.get("title") or item.get("content")
@@ -295,7 +348,7 @@ with tabs[0]:
                     "summary": item.get("summary", "").strip(),
                     "content": item.get("content", ""),
                     "tags": tags_list,
-                    "source": source_label,
+                    "source": item.get("source") or source_label,
                 }
                 if payload_item["title"] or payload_item["content"]:
                     case_payload.append(payload_item)
@@ -354,32 +407,46 @@ with tabs[0]:
 with tabs[1]:
     st.header("🪶 사주 명조 및 운세 해석")
 
-    profiles = list_profiles()
+    # 프로필 관리 탭과 같은 이름 필터·페이지로 요약만 읽고, JSON 은 불러오기를 누를 때만 디코딩한다
+    col_load_filter, col_load_page = st.columns([3, 1])
+    with col_load_filter:
+        load_filter = st.text_input("불러올 프로필 이름 (앞부분)", "", key="profile_load_filter")
+    load_total = count_profiles(load_filter)
+    load_page_count = max(1, -(-load_total // PROFILE_PAGE_SIZE))
+    with col_load_page:
+        load_page = st.number_input(
+            "페이지", min_value=1, max_value=load_page_count, value=1, step=1, key="profile_load_page"
+        )
+    profiles = list_profiles(
+        limit=PROFILE_PAGE_SIZE,
+        offset=(int(load_page) - 1) * PROFILE_PAGE_SIZE,
+        name_filter=load_filter,
+    )
     options = {"새 프로필": None}
-    options.update({f"{p['name']} (#{p['id']})": p["id"] for p in profiles})
+    options.update({f"{p['name']} (#{p['id']})": p for p in profiles})
     selected_option = st.selectbox("저장된 프로필 불러오기", list(options.keys()), key="profile_to_load")
-
-    if selected_option != "새 프로필":
-        selected_profile = load_profile(options[selected_option])
-    else:
-        selected_profile = None
+    selected_profile = options.get(selected_option)
 
     if selected_profile is not None and st.button("프로필 값 불러오기"):
-        gan_values = selected_profile["gan"].split()
-        zhi_values = selected_profile["zhi"].split()
+        loaded_profile = load_profile(selected_profile["id"])
+        if loaded_profile is None:
+            st.error("선택한 프로필을 찾을 수 없습니다.")
+            st.stop()
+        gan_values = loaded_profile["gan"].split()
+        zhi_values = loaded_profile["zhi"].split()
         for idx, key in enumerate(GAN_KEYS):
             if idx < len(gan_values) and gan_values[idx] in HEAVENLY_STEMS:
                 st.session_state[key] = gan_values[idx]
         for idx, key in enumerate(ZHI_KEYS):
             if idx < len(zhi_values) and zhi_values[idx] in EARTHLY_BRANCHES:
                 st.session_state[key] = zhi_values[idx]
-        st.session_state["gan_input"] = selected_profile["gan"]
-        st.session_state["zhi_input"] = selected_profile["zhi"]
-        st.session_state["daewoon"] = selected_profile["daewoon"]
-        st.session_state["sewoon"] = selected_profile["sewoon"]
-        st.session_state["latest_structure"] = selected_profile["structure"]
-        st.session_state["latest_results"] = selected_profile["results"]
-        st.session_state["latest_profile_name"] = selected_profile["name"]
+        st.session_state["gan_input"] = loaded_profile["gan"]
+        st.session_state["zhi_input"] = loaded_profile["zhi"]
+        st.session_state["daewoon"] = loaded_profile["daewoon"]
+        st.session_state["sewoon"] = loaded_profile["sewoon"]
+        st.session_state["latest_structure"] = loaded_profile["structure"]
+        st.session_state["latest_results"] = loaded_profile["results"]
+        st.session_state["latest_profile_name"] = loaded_profile["name"]
         st.experimental_rerun()
 
     col1, col2, col3 = st.columns(3)
@@ -423,12 +490,45 @@ with tabs[1]:
         st.subheader("🌿 원국 구조")
         st.json(structure)
 
+        st.subheader("🔄 대운·세운 관계")
+        try:
+            # 원국 관계는 명조별로 캐시되어, 대운/세운만 바꾸면 운 관계만 다시 계산한다
+            transit_structure, transit_results = interpret(
+                st.session_state["gan_input"],
+                st.session_state["zhi_input"],
+                st.session_state["daewoon"],
+                st.session_state["sewoon"],
+            )
+        except ValueError as exc:
+            st.error(str(exc))
+        else:
+            st.json(
+                {
+                    "원국관계": transit_structure.get("원국관계", transit_structure["감지관계"]),
+                    "운관계": transit_structure.get("운관계", []),
+                }
+            )
+            for result in transit_results:
+                st.markdown(f"- **{result['카테고리']}**: {result['결과']}")
+
         st.subheader("🧠 해석 결과 (원리 포함)")
         for result in results:
             with st.expander(f"📂 {result['분야']} — {result['결과']}"):
                 st.markdown(f"**근거:** {result['근거']}")
                 st.markdown(f"**해석 원리:** {result['원리']}")
 
+        st.subheader("🗂 유사 사례")
+        similar_cases = _similar_cases(gan_values, zhi_values)
+        if similar_cases:
+            st.dataframe(
+                pd.DataFrame(similar_cases).rename(
+                    columns={"id": "ID", "title": "제목", "chart": "명조", "score": "유사도"}
+                ),
+                use_container_width=True,
+            )
+        else:
+            st.info("구조가 비슷한 저장 사례가 없습니다.")
+
         save_profile(
             name or "무명",
             gender,
@@ -441,26 +541,67 @@ with tabs[1]:
         )
         st.success(f"✅ 프로필 [{name or '무명'}] 저장 완료")
 
+    st.markdown("---")
+    st.subheader("📈 대운·세운 타임라인")
+    col_birth, col_start = st.columns(2)
+    with col_birth:
+        birth_year = st.number_input("출생 연도", min_value=1900, max_value=2100, value=1990, step=1)
+    with col_start:
+        start_age = st.number_input("대운수 (첫 대운 시작 나이)", min_value=1, max_value=10, value=1, step=1)
+    if st.button("📈 100년 타임라인 계산"):
+        gan_values = st.session_state["gan_input"].split()
+        zhi_values = st.session_state["zhi_input"].split()
+        if len(gan_values) < 4 or len(zhi_values) < 4:
+            st.error("천간과 지지를 각각 4개(시 일 월 년 순) 입력해 주세요.")
+        elif not set(gan_values) <= set(STEMS) or not set(zhi_values) <= set(BRANCHES):
+            st.error("천간은 甲~癸, 지지는 子~亥 중에서 한 글자씩 입력해 주세요.")
+        else:
+            timeline = pd.DataFrame(
+                build_timeline(
+                    st.session_state["gan_input"],
+                    st.session_state["zhi_input"],
+                    gender,
+                    int(birth_year),
+                    start_age=int(start_age),
+                )
+            )
+            st.bar_chart(timeline.set_index("연도")[list(TRANSIT_COUNT_COLUMNS)])
+            st.dataframe(timeline, use_container_width=True)
+
 
 # ---------------------------------------------------------------------------
 # Tab 3: 프로필 관리
 # ---------------------------------------------------------------------------
 with tabs[2]:
     st.header("👤 프로필 관리")
-    profiles = list_profiles()
+    col_filter, col_page = st.columns([3, 1])
+    with col_filter:
+        profile_filter = st.text_input("이름으로 찾기 (앞부분)", "", key="profile_filter")
+    total_profiles = count_profiles(profile_filter)
+    page_count = max(1, -(-total_profiles // PROFILE_PAGE_SIZE))
+    with col_page:
+        page = st.number_input("페이지", min_value=1, max_value=page_count, value=1, step=1, key="profile_page")
+    profiles = list_profiles(
+        limit=PROFILE_PAGE_SIZE,
+        offset=(int(page) - 1) * PROFILE_PAGE_SIZE,
+        name_filter=profile_filter,
+    )
 
     if not profiles:
         st.info("저장된 프로필이 없습니다.")
     else:
+        st.caption(f"총 {total_profiles}건 — {page}/{page_count} 페이지")
         for profile in profiles:
-            with st.expander(f"🪶 {profile['name']} ({profile['gender']})"):
+            with st.expander(f"🪶 {profile['name']} ({profile['gender']}) — {profile['created_at'] or '-'}"):
                 st.markdown(f"**대운:** {profile['daewoon']} / **세운:** {profile['sewoon']}")
                 st.markdown(f"**명조:** {profile['gan']} | {profile['zhi']}")
-                structure = json.loads(profile["structure_json"])
-                results = json.loads(profile["result_json"])
-                st.json(structure)
-                for result in results:
-                    st.markdown(f"- {result['분야']}: {result['결과']}")
+                st.markdown(f"**대표 해석:** {profile['top_result'] or '-'} (총 {profile['result_count']}건)")
+                if st.checkbox("상세 보기", key=f"open_profile_{profile['id']}"):
+                    detail = load_profile(profile["id"])
+                    if detail is not None:
+                        st.json(detail["structure"])
+                        for result in detail["results"]:
+                            st.markdown(f"- {result['분야']}: {result['결과']}")
                 if st.button(f"삭제_{profile['id']}", key=f"delete_profile_{profile['id']}"):
                     delete_profile(profile["id"])
                     st.warning(f"{profile['name']} 프로필 삭제됨")
@@ -533,13 +674,14 @@ with tabs[4]:
 
     st.markdown("---")
     st.subheader("🗂 프로필 리포트")
-    profiles = list_profiles()
+    report_filter = st.text_input("프로필 이름 (앞부분)", "", key="report_profile_filter")
+    profiles = list_profiles(limit=PROFILE_PAGE_SIZE, name_filter=report_filter)
     if not profiles:
         st.info("다운로드할 프로필이 없습니다.")
     else:
-        profile_options = {f"{p['name']} (#{p['id']})": p for p in profiles}
+        profile_options = {f"{p['name']} (#{p['id']})": p["id"] for p in profiles}
         selected = st.selectbox("리포트로 확인할 프로필", list(profile_options.keys()))
-        profile_payload = profile_options[selected]
+        profile_payload = load_profile(profile_options[selected])
         payload = {
             "name": profile_payload["name"],
             "gender": profile_payload["gender"],
@@ -547,8 +689,8 @@ with tabs[4]:
             "zhi": profile_payload["zhi"],
             "daewoon": profile_payload["daewoon"],
             "sewoon": profile_payload["sewoon"],
-            "structure": json.loads(profile_payload["structure_json"]),
-            "results": json.loads(profile_payload["result_json"]),
+            "structure": profile_payload["structure"],
+            "results": profile_payload["results"],
         }
         st.json(payload)
         st.download_button(
@@ -561,21 +703,32 @@ with tabs[4]:
 
 
 from utils.db_manager_v2 import (
+    connect,
     delete_case,
-    fetch_cases,
-    fetch_rules,
-    fetch_terms,
-    init_db,
     insert_case,
     insert_rule,
     insert_term,
 )
-from utils.extractor_v4 import extract_rules_terms_cases
+from utils.dedupe import filter_near_duplicates
+from utils.extractor_v4 import extract_many
+from utils.master_data import load_master_data
+from utils.read_cache import (
+    cached_fetch_cases,
+    cached_fetch_rules,
+    cached_fetch_tag_counts,
+    cached_fetch_terms,
+    cached_near_duplicate_index,
+    cached_rule_network,
+)
+from utils.rule_compiler import chart_facts
+from utils.term_index import build_term_index
 from utils.visualize import draw_chart_relations
 
 BASE_DIR = Path(__file__).resolve().parent
 DB_PATH = str(BASE_DIR / "suri_db_system" / "db" / "suri_manual.db")
-init_db(DB_PATH)
+# 앞부분과 같은 DB 이므로 이미 확인한 읽기 경로를 그대로 쓴다
+READ_DB_PATH = CASE_READ_PATH
+MASTER_DATA_PATH = BASE_DIR / "suam_master_data.json"
 
 st.set_page_config(page_title="명리 자동 해석 시스템 v10.8", layout="wide")
 st.title("📘 명리 자동 해석 시스템 v10.8")
@@ -596,17 +749,65 @@ TABS = st.tabs(
 # ------------------------------------------------------------
 with TABS[0]:
     st.header("📄 문서 업로드 및 자동 구조화")
-    uploaded = st.file_uploader(
-        "문서를 업로드하세요", type=["txt", "docx", "pdf", "zip"]
+    uploaded_files = st.file_uploader(
+        "문서를 업로드하세요 (여러 개 선택 가능)",
+        type=["txt", "docx", "pdf", "zip"],
+        accept_multiple_files=True,
     )
-    if uploaded is not None:
-        upload_dir = os.path.join("data", "uploads")
-        os.makedirs(upload_dir, exist_ok=True)
-        save_path = os.path.join(upload_dir, uploaded.name)
-        with open(save_path, "wb") as f:
-            f.write(uploaded.read())
-
-        extracted = extract_rules_terms_cases(save_path)
+    if uploaded_files:
+        # 내용 해시로 저장하므로 같은 이름도 덮어쓰지 않고, 같은 내용은 한 번만 처리한다
+        store = upload_store()
+        file_names = {}
+        saved_keys = []
+        for uploaded in uploaded_files:
+            stored = store.save(uploaded, uploaded.name, protect=saved_keys)
+            saved_keys.append(stored.key)
+            file_names.setdefault(str(stored.path), stored.name)
+        saved_paths = list(file_names)
+
+        # 파일별 진행 상황 — 추출이 끝나는 순서대로 갱신한다
+        progress = {
+            path: {
+                "파일": name,
+                "상태": "⏳ 대기",
+                "규칙": 0,
+                "용어": 0,
+                "사례": 0,
+                "소요(초)": None,
+                "오류": "",
+            }
+            for path, name in file_names.items()
+        }
+        progress_bar = st.progress(0.0)
+        progress_table = st.empty()
+        progress_table.dataframe(list(progress.values()))
+
+        extracted = {"rules": [], "terms": [], "cases": []}
+        failed = 0
+        for done, result in enumerate(extract_many(saved_paths), start=1):
+            row = progress[result["path"]]
+            row["소요(초)"] = round(result["seconds"], 2)
+            if result["error"]:
+                failed += 1
+                row["상태"] = "❌ 실패"
+                row["오류"] = result["error"]
+            else:
+                row["상태"] = "✅ 완료"
+                for key, label in (("rules", "규칙"), ("terms", "용어"), ("cases", "사례")):
+                    items = result["payload"].get(key, [])
+                    for item in items:
+                        if item.source is None:
+                            item.source = file_names[result["path"]]
+                    extracted[key].extend(items)
+                    row[label] = len(items)
+            progress_bar.progress(done / len(saved_paths))
+            progress_table.dataframe(list(progress.values()))
+
+        if failed:
+            st.error(f"❌ {failed}개 파일 추출 실패 — 나머지 {len(saved_paths) - failed}개 파일은 계속 처리합니다.")
+
+        # 문서 간/기존 DB 와 거의 같은 규칙·용어·사례는 저장하지 않는다
+        extracted, duplicates = filter_near_duplicates(extracted, cached_near_duplicate_index(READ_DB_PATH))
 
         st.success(
             "✅ {case_count}개 사례 / {rule_count}개 규칙 / {term_count}개 용어 자동 추출".format(
@@ -615,18 +816,31 @@ with TABS[0]:
                 term_count=len(extracted.get("terms", [])),
             )
         )
+        if duplicates:
+            with st.expander(f"♻️ 중복으로 제외된 항목 {len(duplicates)}개", expanded=False):
+                st.dataframe(
+                    [
+                        {
+                            "종류": item["kind"],
+                            "내용": next((str(value) for value in item["record"].values() if value), ""),
+                            "중복 대상": item["duplicate_of"],
+                            "유사도": item["similarity"],
+                        }
+                        for item in duplicates
+                    ]
+                )
 
         with st.expander("🧩 규칙 요약", expanded=True):
             rules_data = extracted.get("rules", [])
             if rules_data:
-                st.dataframe(rules_data)
+                st.dataframe(records_frame(rules_data, RuleRecord))
             else:
                 st.info("추출된 규칙이 없습니다.")
 
         with st.expander("📘 용어 정리", expanded=False):
             terms_data = extracted.get("terms", [])
             if terms_data:
-                st.dataframe(terms_data)
+                st.dataframe(records_frame(terms_data, TermRecord))
             else:
                 st.info("추출된 용어가 없습니다.")
 
@@ -651,16 +865,22 @@ with TABS[0]:
                         tag_label = str(tags)
                     st.caption(f"자동 태그: {tag_label if tag_label else '없음'}")
 
-        conn = sqlite3.connect(DB_PATH)
+        # 모든 파일의 결과를 한 트랜잭션으로 저장한다
+        conn = connect(DB_PATH)
         try:
             for rule in extracted.get("rules", []):
-                insert_rule(conn, rule)
+                insert_rule(conn, rule, auto_commit=False)
             for term in extracted.get("terms", []):
-                insert_term(conn, term)
+                insert_term(conn, term, auto_commit=False)
             for case in extracted.get("cases", []):
-                insert_case(conn, case)
+                insert_case(conn, case, auto_commit=False)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
         finally:
             conn.close()
+        READ_DB_PATH = DB_PATH
 
 
 # ------------------------------------------------------------
@@ -669,13 +889,16 @@ with TABS[0]:
 with TABS[1]:
     st.header("📂 사례 관리")
     keyword = st.text_input("검색 (제목·요약·태그)", "")
+    tag_counts = {row["tag"]: row["case_count"] for row in cached_fetch_tag_counts(READ_DB_PATH)}
+    tag_options = ["전체"] + list(dict.fromkeys(["혼인", "직업", "재물", "건강", "기타", *tag_counts]))
     tag_filter = st.selectbox(
         "카테고리 필터",
-        ["전체", "혼인", "직업", "재물", "건강", "기타"],
+        tag_options,
         index=0,
+        format_func=lambda tag: tag if tag == "전체" else f"{tag} ({tag_counts.get(tag, 0)})",
     )
 
-    cases = fetch_cases(DB_PATH, keyword=keyword, tag_filter=tag_filter)
+    cases = cached_fetch_cases(READ_DB_PATH, keyword=keyword, tag_filter=tag_filter)
 
     if not cases:
         st.info("표시할 사례가 없습니다.")
@@ -721,7 +944,30 @@ with TABS[1]:
 # ------------------------------------------------------------
 with TABS[2]:
     st.header("📘 용어 정리")
-    terms = fetch_terms(DB_PATH)
+    # 자동완성 인덱스는 용어 데이터/마스터 데이터 파일이 바뀔 때만 다시 만든다
+    index_key = (
+        READ_DB_PATH,
+        data_versions(READ_DB_PATH)["terms"],
+        MASTER_DATA_PATH.stat().st_mtime_ns if MASTER_DATA_PATH.exists() else None,
+    )
+    if st.session_state.get("term_index_key") != index_key:
+        master = load_master_data(MASTER_DATA_PATH) if MASTER_DATA_PATH.exists() else None
+        try:
+            st.session_state["term_index"] = build_term_index(READ_DB_PATH, master)
+        finally:
+            if master is not None:
+                master.close()
+        st.session_state["term_index_key"] = index_key
+
+    term_prefix = st.text_input("용어 찾기 (한자·한글 독음)", "", key="term_prefix")
+    if term_prefix:
+        completions = st.session_state["term_index"].complete(term_prefix, limit=20)
+        if completions:
+            st.dataframe(completions)
+        else:
+            st.info("일치하는 용어가 없습니다.")
+
+    terms = cached_fetch_terms(READ_DB_PATH)
     if terms:
         st.dataframe(terms)
     else:
@@ -733,7 +979,15 @@ with TABS[2]:
 # ------------------------------------------------------------
 with TABS[3]:
     st.header("🔍 규칙 보기")
-    rules = fetch_rules(DB_PATH)
+    rules = cached_fetch_rules(READ_DB_PATH)
+    chart_text = st.text_input("명조로 규칙 찾기 (예: 戊戌日 丙午時 乙酉月 庚寅年)", "", key="rule_chart")
+    if chart_text:
+        pillars = parse_chart(chart_text)
+        if pillars:
+            matched_ids = set(cached_rule_network(READ_DB_PATH).match(chart_facts(pillars)))
+            rules = [rule for rule in rules if rule["id"] in matched_ids]
+        else:
+            st.warning("명조를 해석할 수 없습니다.")
     if rules:
         st.dataframe(rules)
     else:
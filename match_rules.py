@@ -1,5 +1,11 @@
+import argparse
+import csv
 import json
 import os
+import sys
+
+from utils import bulk_match
+from utils.bulk_match import DEFAULT_CHUNK_SIZE, iter_bulk_matches, master_rule_predicates
 
 def load_rules():
     with open("rules/rules_master.json", "r", encoding="utf-8") as f:
@@ -24,3 +30,40 @@ def match_rules(chart):
         matched[rule_id] = cond_day or cond_branch or cond_relation
 
     return matched
+
+def match_rules_bulk(charts, rules=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    대량 모드: 모든 명조 × 모든 규칙을 청크 단위 비트 연산으로 평가한다.
+    charts 는 명조 문자열("戊戌日 丙午時 乙酉月 庚寅年") 또는 match_rules 와 같은 dict 이고,
+    각 규칙은 조건 문장을 컴파일한 요구 조건(모두 충족해야 일치)으로 평가한다.
+    (rule_id, chart_indices) 를 규칙·청크별로 내보낸다.
+    """
+    if rules is None:
+        rules = load_rules()
+    return iter_bulk_matches(charts, master_rule_predicates(rules), chunk_size=chunk_size)
+
+def main():
+    parser = argparse.ArgumentParser(description="rules_master.json 규칙을 명조 목록 전체에 대해 평가")
+    parser.add_argument("charts", help="한 줄에 명조 하나인 텍스트 파일")
+    parser.add_argument("--output", default="rule_matches.csv", help="chart_index,rule_id CSV 경로")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+    if bulk_match.np is None:
+        # requirements.txt 로 설치하면 numpy 가 함께 설치된다
+        print("⚠️ numpy 가 없어 파이썬 정수 경로로 대조합니다 (느림): pip install numpy", file=sys.stderr)
+
+    with open(args.charts, "r", encoding="utf-8") as f:
+        charts = [line.strip() for line in f if line.strip()]
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    count = 0
+    with open(args.output, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["chart_index", "rule_id"])
+        for rule_id, indices in match_rules_bulk(charts, chunk_size=args.chunk_size):
+            writer.writerows((int(index), rule_id) for index in indices)
+            count += len(indices)
+    print(f"✅ 명조 {len(charts):,}개 × 규칙 평가 완료 — 일치 {count:,}건 → {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,11 @@ CREATE TABLE IF NOT EXISTS rules (
     content TEXT,
     keywords TEXT,
     example TEXT,
-    source TEXT
+    source TEXT,
+    related_case_count INTEGER NOT NULL DEFAULT 0,
+    -- title(없으면 example 의 → 왼쪽)을 컴파일한 술어 트리 JSON (인식할 패턴이 없으면 NULL)
+    predicate TEXT,
+    predicate_version INTEGER NOT NULL DEFAULT 0
 );
 
 -- 📙 용어 테이블
@@ -15,7 +19,8 @@ CREATE TABLE IF NOT EXISTS terms (
     term TEXT,
     definition TEXT,
     category TEXT,
-    source TEXT
+    source TEXT,
+    related_case_count INTEGER NOT NULL DEFAULT 0
 );
 
 -- 📗 사례 테이블
@@ -26,7 +31,17 @@ CREATE TABLE IF NOT EXISTS cases (
     summary TEXT,
     content TEXT,
     tags TEXT,
-    source TEXT
+    source TEXT,
+    -- chart 를 파싱한 기둥별 천간(0..9)/지지(0..11) 순번과 지지 비트마스크 (파싱 실패 시 NULL)
+    hour_stem INTEGER,
+    hour_branch INTEGER,
+    day_stem INTEGER,
+    day_branch INTEGER,
+    month_stem INTEGER,
+    month_branch INTEGER,
+    year_stem INTEGER,
+    year_branch INTEGER,
+    branch_mask INTEGER
 );
 
 -- 📎 규칙 ↔ 사례 관계 테이블
@@ -45,9 +60,92 @@ CREATE TABLE IF NOT EXISTS case_term_link (
     FOREIGN KEY(term_id) REFERENCES terms(id) ON DELETE CASCADE
 );
 
+-- 🏷 사례 ↔ 태그 정규화 테이블
+CREATE TABLE IF NOT EXISTS case_tag (
+    case_id INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (case_id, tag),
+    FOREIGN KEY(case_id) REFERENCES cases(id) ON DELETE CASCADE
+);
+
+-- 🏷 규칙 ↔ 키워드 정규화 테이블
+CREATE TABLE IF NOT EXISTS rule_keyword (
+    rule_id INTEGER NOT NULL,
+    keyword TEXT NOT NULL,
+    PRIMARY KEY (rule_id, keyword),
+    FOREIGN KEY(rule_id) REFERENCES rules(id) ON DELETE CASCADE
+);
+
+-- 🔄 읽기 캐시 무효화용 데이터 버전 (rules / terms / cases / links 범위별 쓰기 카운터)
+CREATE TABLE IF NOT EXISTS data_version (
+    scope TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
 -- 🔍 검색 성능 향상을 위한 인덱스
 CREATE INDEX IF NOT EXISTS idx_rules_category ON rules(category);
-CREATE INDEX IF NOT EXISTS idx_cases_tags ON cases(tags);
+-- cases.tags 는 LIKE '%태그%' 로만 조회되어 인덱스를 탈 수 없으므로 case_tag 로 대체
+DROP INDEX IF EXISTS idx_cases_tags;
 CREATE INDEX IF NOT EXISTS idx_terms_category ON terms(category);
 CREATE INDEX IF NOT EXISTS idx_case_rule ON case_rule_link(case_id, rule_id);
 CREATE INDEX IF NOT EXISTS idx_case_term ON case_term_link(case_id, term_id);
+CREATE INDEX IF NOT EXISTS idx_case_tag_tag ON case_tag(tag, case_id);
+CREATE INDEX IF NOT EXISTS idx_rule_keyword_keyword ON rule_keyword(keyword, rule_id);
+CREATE INDEX IF NOT EXISTS idx_case_rule_rule ON case_rule_link(rule_id);
+CREATE INDEX IF NOT EXISTS idx_case_term_term ON case_term_link(term_id);
+
+-- 🔢 related_case_count 유지 트리거 (링크 추가/삭제 시 규칙·용어의 연결 사례 수 갱신)
+CREATE TRIGGER IF NOT EXISTS trg_case_rule_link_insert AFTER INSERT ON case_rule_link
+WHEN NEW.case_id IS NOT NULL
+BEGIN
+    UPDATE rules SET related_case_count = related_case_count + 1 WHERE id = NEW.rule_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_case_rule_link_delete AFTER DELETE ON case_rule_link
+WHEN OLD.case_id IS NOT NULL
+BEGIN
+    UPDATE rules SET related_case_count = related_case_count - 1 WHERE id = OLD.rule_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_case_rule_link_update AFTER UPDATE OF case_id, rule_id ON case_rule_link
+BEGIN
+    UPDATE rules SET related_case_count = related_case_count - 1
+    WHERE id = OLD.rule_id AND OLD.case_id IS NOT NULL;
+    UPDATE rules SET related_case_count = related_case_count + 1
+    WHERE id = NEW.rule_id AND NEW.case_id IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_case_term_link_insert AFTER INSERT ON case_term_link
+WHEN NEW.case_id IS NOT NULL
+BEGIN
+    UPDATE terms SET related_case_count = related_case_count + 1 WHERE id = NEW.term_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_case_term_link_delete AFTER DELETE ON case_term_link
+WHEN OLD.case_id IS NOT NULL
+BEGIN
+    UPDATE terms SET related_case_count = related_case_count - 1 WHERE id = OLD.term_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_case_term_link_update AFTER UPDATE OF case_id, term_id ON case_term_link
+BEGIN
+    UPDATE terms SET related_case_count = related_case_count - 1
+    WHERE id = OLD.term_id AND OLD.case_id IS NOT NULL;
+    UPDATE terms SET related_case_count = related_case_count + 1
+    WHERE id = NEW.term_id AND NEW.case_id IS NOT NULL;
+END;
+
+-- 링크가 규칙/용어보다 먼저 들어온 경우를 위해 신규 행은 기존 링크 수로 시작
+CREATE TRIGGER IF NOT EXISTS trg_rules_insert_count AFTER INSERT ON rules
+BEGIN
+    UPDATE rules SET related_case_count = (
+        SELECT COUNT(case_id) FROM case_rule_link WHERE rule_id = NEW.id
+    ) WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_terms_insert_count AFTER INSERT ON terms
+BEGIN
+    UPDATE terms SET related_case_count = (
+        SELECT COUNT(case_id) FROM case_term_link WHERE term_id = NEW.id
+    ) WHERE id = NEW.id;
+END;
@@ -2,19 +2,59 @@
 
 JSON 데이터(rules, terms, cases)를 읽어 수암명리 DB에 적재하고
 사례-규칙, 사례-용어 연결 관계까지 생성한다.
+
+대용량 초기 적재는 ``--bulk`` 로 실행한다. JSON 배열을 디스크에서 한 건씩
+읽어 ``executemany`` 배치로 한 트랜잭션에 넣고, 보조 인덱스와 트리거는
+적재 전후로 삭제/재생성한다.
+
+    python suri_db_system/scripts/db_insert.py --bulk --batch-size 50000
+
+``{"rules": [...], "terms": [...], "cases": [...]}`` 형태의 지식 내보내기 파일은
+``--from-json`` 으로 같은 경로에 흘려 넣는다. 파일 전체를 읽지 않고 항목을
+하나씩 변환해 배치로 넣으므로 메모리 사용량이 파일 크기와 무관하다.
+
+    python suri_db_system/scripts/db_insert.py --bulk --from-json export.json
 """
 from __future__ import annotations
 
+import argparse
 import json
 import sqlite3
+import sys
+import time
+from itertools import groupby, islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
 BASE_DIR = Path(__file__).resolve().parents[1]
+ROOT_DIR = BASE_DIR.parent
 DB_PATH = BASE_DIR / "db" / "suri_manual.db"
 SCHEMA_PATH = BASE_DIR / "schema" / "suri_db_schema.sql"
 DATA_DIR = BASE_DIR / "data"
 
+sys.path.insert(0, str(ROOT_DIR))
+
+from utils.chart_parser import CHART_CODE_COLUMNS, chart_codes  # noqa: E402
+from utils.db_manager_v2 import VERSION_SCOPES, apply_migrations, bump_data_version  # noqa: E402
+from utils.extractor_v4 import iter_structured_json  # noqa: E402
+from utils.rule_compiler import COMPILER_VERSION, compile_rule, predicate_to_json  # noqa: E402
+from utils.json_stream import iter_json_array  # noqa: E402
+
+BULK_TABLES = ("rules", "terms", "cases", "case_rule_link", "case_term_link", "case_tag", "rule_keyword")
+RULE_COLUMNS = ("keywords", "category", "title", "content", "example", "source", "predicate", "predicate_version")
+RULE_INSERT_COLUMNS = ", ".join(RULE_COLUMNS)
+RULE_INSERT_PLACEHOLDERS = ", ".join("?" for _ in RULE_COLUMNS)
+RULE_UPSERT_ASSIGNMENTS = ", ".join(f"{column}=excluded.{column}" for column in RULE_COLUMNS)
+CASE_COLUMNS = ("title", "chart", "summary", "content", "tags", "source") + CHART_CODE_COLUMNS
+BULK_PRAGMAS = (
+    "PRAGMA journal_mode = MEMORY",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -262144",
+    "PRAGMA locking_mode = EXCLUSIVE",
+)
+
 
 def init_db() -> None:
     """스키마 파일을 실행하여 DB를 초기화한다."""
@@ -22,9 +62,14 @@ def init_db() -> None:
     with SCHEMA_PATH.open("r", encoding="utf-8") as schema_file:
         schema_sql = schema_file.read()
 
-    with sqlite3.connect(DB_PATH) as conn:
+    conn = sqlite3.connect(DB_PATH)
+    try:
         conn.executescript(schema_sql)
         conn.commit()
+        # 스키마 스크립트는 기존 DB 에 컬럼을 추가하거나 마이그레이션 전용 인덱스를 만들지 않는다
+        apply_migrations(conn)
+    finally:
+        conn.close()
     print("✅ DB 초기화 완료")
 
 
@@ -39,11 +84,31 @@ def load_json_data(filename: str) -> List[dict]:
 
 
 def normalize_keywords(value) -> str:
-    if isinstance(value, list):
+    if isinstance(value, (list, tuple)):
         return ",".join(value)
     return value or ""
 
 
+def split_labels(value) -> List[str]:
+    """쉼표로 연결된 태그/키워드를 중복 없는 목록으로 나눈다."""
+    items = value if isinstance(value, (list, tuple)) else (value or "").split(",")
+    return list(dict.fromkeys(str(item).strip() for item in items if str(item).strip()))
+
+
+def _rule_title(record: dict) -> str | None:
+    """규칙 제목 (추출 레코드는 condition 을 제목으로 쓴다)."""
+    return record.get("title") or record.get("condition")
+
+
+def _rule_content(record: dict) -> str | None:
+    return record.get("content") or record.get("result")
+
+
+def _rule_predicate(record: dict) -> Tuple[str | None, int]:
+    """rules.predicate / predicate_version 값 (조건 문장을 적재 시점에 컴파일)."""
+    return predicate_to_json(compile_rule(_rule_title(record), record.get("example"))), COMPILER_VERSION
+
+
 def insert_rules(conn: sqlite3.Connection, rules: Iterable[dict]) -> Dict[int, int]:
     """규칙 데이터를 삽입하고 JSON id → DB id 매핑을 반환한다."""
     id_map: Dict[int, int] = {}
@@ -55,34 +120,34 @@ def insert_rules(conn: sqlite3.Connection, rules: Iterable[dict]) -> Dict[int, i
             record.get("content"),
             record.get("example"),
             record.get("source"),
-        )
+        ) + _rule_predicate(record)
 
         if record.get("id") is not None:
             conn.execute(
-                """
-                INSERT INTO rules (id, keywords, category, title, content, example, source)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(id) DO UPDATE SET
-                    keywords=excluded.keywords,
-                    category=excluded.category,
-                    title=excluded.title,
-                    content=excluded.content,
-                    example=excluded.example,
-                    source=excluded.source
+                f"""
+                INSERT INTO rules (id, {RULE_INSERT_COLUMNS})
+                VALUES (?, {RULE_INSERT_PLACEHOLDERS})
+                ON CONFLICT(id) DO UPDATE SET {RULE_UPSERT_ASSIGNMENTS}
                 """,
                 (record["id"],) + payload,
             )
             db_id = int(record["id"])
         else:
             cursor = conn.execute(
-                """
-                INSERT INTO rules (keywords, category, title, content, example, source)
-                VALUES (?, ?, ?, ?, ?, ?)
+                f"""
+                INSERT INTO rules ({RULE_INSERT_COLUMNS})
+                VALUES ({RULE_INSERT_PLACEHOLDERS})
                 """,
                 payload,
             )
             db_id = cursor.lastrowid
 
+        conn.execute("DELETE FROM rule_keyword WHERE rule_id = ?", (db_id,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO rule_keyword (rule_id, keyword) VALUES (?, ?)",
+            [(db_id, keyword) for keyword in split_labels(record.get("keywords"))],
+        )
+
         if record.get("id") is not None:
             id_map[int(record["id"])] = db_id
     return id_map
@@ -140,9 +205,9 @@ def insert_cases(
         tags_value = ",".join(tags) if isinstance(tags, list) else (tags or "")
 
         cursor = conn.execute(
-            """
-            INSERT INTO cases (title, chart, summary, content, tags, source)
-            VALUES (?, ?, ?, ?, ?, ?)
+            f"""
+            INSERT INTO cases ({", ".join(CASE_COLUMNS)})
+            VALUES ({", ".join("?" for _ in CASE_COLUMNS)})
             """,
             (
                 record.get("title"),
@@ -151,10 +216,16 @@ def insert_cases(
                 record.get("content"),
                 tags_value,
                 record.get("source"),
-            ),
+            )
+            + chart_codes(record.get("chart")),
         )
         case_id = cursor.lastrowid
 
+        conn.executemany(
+            "INSERT OR IGNORE INTO case_tag (case_id, tag) VALUES (?, ?)",
+            [(case_id, tag) for tag in split_labels(tags)],
+        )
+
         for json_rule_id in record.get("linked_rules", []):
             rule_id = rule_id_map.get(json_rule_id, json_rule_id)
             conn.execute(
@@ -170,7 +241,238 @@ def insert_cases(
             )
 
 
-def main() -> None:
+def iter_json_data(filename: str) -> Iterator[dict]:
+    """data 디렉터리의 JSON 배열을 메모리에 올리지 않고 한 건씩 읽는다."""
+    path = DATA_DIR / filename
+    with path.open("r", encoding="utf-8") as json_file:
+        yield from iter_json_array(json_file)
+
+
+def _batches(records: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _data_dir_batches(size: int) -> Iterator[Tuple[str, List[Any]]]:
+    """data 디렉터리의 rules/terms/cases.json 을 (종류, 배치) 로 읽는다."""
+    for kind in ("rules", "terms", "cases"):
+        for batch in _batches(iter_json_data(f"{kind}.json"), size):
+            yield kind, batch
+
+
+def _export_batches(path: str, size: int) -> Iterator[Tuple[str, List[Any]]]:
+    """내보내기 파일의 배열을 파일 순서대로 스트리밍해 (종류, 배치) 로 묶는다."""
+    for kind, records in groupby(iter_structured_json(path), key=itemgetter(0)):
+        for batch in _batches((record for _, record in records), size):
+            yield kind, batch
+
+
+def _drop_secondary_objects(conn: sqlite3.Connection) -> List[str]:
+    """적재 대상 테이블의 명시적 인덱스와 트리거를 삭제하고 재생성용 SQL 을 반환한다."""
+    placeholders = ", ".join("?" for _ in BULK_TABLES)
+    rows = conn.execute(
+        f"""
+        SELECT type, name, sql FROM sqlite_master
+        WHERE type IN ('index', 'trigger') AND sql IS NOT NULL AND tbl_name IN ({placeholders})
+        """,
+        BULK_TABLES,
+    ).fetchall()
+    for object_type, name, _ in rows:
+        conn.execute(f"DROP {object_type.upper()} IF EXISTS {name}")
+    # 인덱스를 먼저 만들어야 트리거 재생성 후 집계 재계산이 인덱스를 탄다
+    return [sql for object_type, _, sql in sorted(rows, key=lambda row: row[0] != "index")]
+
+
+def _last_autoincrement_id(conn: sqlite3.Connection, table: str) -> int:
+    """AUTOINCREMENT 가 다음에 배정할 id 직전 값 (sqlite_sequence 와 MAX(id) 중 큰 값)."""
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+    max_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+    return max(row[0] if row else 0, max_id)
+
+
+def _bulk_rules(conn: sqlite3.Connection, batch: List[dict], last_id: int) -> Tuple[int, int]:
+    """id 없는 규칙도 행 단위 삽입과 같은 id 를 미리 배정해 키워드까지 배치로 넣는다."""
+    rule_rows = []
+    keyword_rows = []
+    for record in batch:
+        if record.get("id") is not None:
+            rule_id = int(record["id"])
+        else:
+            rule_id = last_id + 1
+        last_id = max(last_id, rule_id)
+        rule_rows.append(
+            (
+                rule_id,
+                normalize_keywords(record.get("keywords")),
+                record.get("category"),
+                _rule_title(record),
+                _rule_content(record),
+                record.get("example"),
+                record.get("source"),
+            )
+            + _rule_predicate(record)
+        )
+        keyword_rows.extend((rule_id, keyword) for keyword in split_labels(record.get("keywords")))
+
+    conn.executemany(
+        f"""
+        INSERT INTO rules (id, {RULE_INSERT_COLUMNS})
+        VALUES (?, {RULE_INSERT_PLACEHOLDERS})
+        ON CONFLICT(id) DO UPDATE SET {RULE_UPSERT_ASSIGNMENTS}
+        """,
+        rule_rows,
+    )
+    conn.executemany("DELETE FROM rule_keyword WHERE rule_id = ?", [(row[0],) for row in rule_rows])
+    conn.executemany("INSERT OR IGNORE INTO rule_keyword (rule_id, keyword) VALUES (?, ?)", keyword_rows)
+    return len(rule_rows) + len(keyword_rows), last_id
+
+
+def _bulk_terms(conn: sqlite3.Connection, batch: List[dict]) -> int:
+    conn.executemany(
+        """
+        INSERT INTO terms (id, term, definition, category, source)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            term=excluded.term,
+            definition=excluded.definition,
+            category=excluded.category,
+            source=excluded.source
+        """,
+        [
+            (
+                record.get("id"),
+                record.get("term"),
+                record.get("definition"),
+                record.get("category"),
+                record.get("source"),
+            )
+            for record in batch
+        ],
+    )
+    return len(batch)
+
+
+def _bulk_cases(conn: sqlite3.Connection, batch: List[dict], last_id: int) -> Tuple[int, int]:
+    """사례 id 를 미리 배정해 사례·링크·태그를 모두 executemany 로 넣는다."""
+    case_rows = []
+    rule_links = []
+    term_links = []
+    tag_rows = []
+    for record in batch:
+        last_id += 1
+        case_id = last_id
+        tags = record.get("tags")
+        case_rows.append(
+            (
+                case_id,
+                record.get("title"),
+                record.get("chart"),
+                record.get("summary"),
+                record.get("content"),
+                ",".join(tags) if isinstance(tags, (list, tuple)) else (tags or ""),
+                record.get("source"),
+            )
+            + chart_codes(record.get("chart"))
+        )
+        rule_links.extend((case_id, rule_id) for rule_id in record.get("linked_rules", []))
+        term_links.extend((case_id, term_id) for term_id in record.get("linked_terms", []))
+        tag_rows.extend((case_id, tag) for tag in split_labels(tags))
+
+    conn.executemany(
+        f"INSERT INTO cases (id, {', '.join(CASE_COLUMNS)}) VALUES (?{', ?' * len(CASE_COLUMNS)})",
+        case_rows,
+    )
+    conn.executemany("INSERT INTO case_rule_link (case_id, rule_id) VALUES (?, ?)", rule_links)
+    conn.executemany("INSERT INTO case_term_link (case_id, term_id) VALUES (?, ?)", term_links)
+    conn.executemany("INSERT OR IGNORE INTO case_tag (case_id, tag) VALUES (?, ?)", tag_rows)
+    return len(case_rows) + len(rule_links) + len(term_links) + len(tag_rows), last_id
+
+
+def bulk_load(batch_size: int = 20000, export_path: str | None = None) -> None:
+    """대용량 JSON 을 스트리밍으로 읽어 한 트랜잭션에 배치 적재한다.
+
+    ``export_path`` 가 있으면 data 디렉터리 대신 구조화 내보내기 파일 하나를 읽는다.
+    """
+    init_db()
+
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    try:
+        for pragma in BULK_PRAGMAS:
+            conn.execute(pragma)
+
+        started = time.perf_counter()
+        conn.execute("BEGIN")
+        recreate_sql = _drop_secondary_objects(conn)
+
+        totals: Dict[str, int] = {"rules": 0, "terms": 0, "cases": 0}
+        row_count = 0
+
+        last_rule_id = _last_autoincrement_id(conn, "rules")
+        last_case_id = _last_autoincrement_id(conn, "cases")
+        if export_path:
+            batches = _export_batches(export_path, batch_size)
+        else:
+            batches = _data_dir_batches(batch_size)
+        for kind, batch in batches:
+            if kind == "rules":
+                rows, last_rule_id = _bulk_rules(conn, batch, last_rule_id)
+            elif kind == "terms":
+                rows = _bulk_terms(conn, batch)
+            else:
+                rows, last_case_id = _bulk_cases(conn, batch, last_case_id)
+            totals[kind] += len(batch)
+            row_count += rows
+        loaded = time.perf_counter()
+
+        for sql in recreate_sql:
+            conn.execute(sql)
+        # 트리거를 끈 채 적재했으므로 연결 사례 수는 한 번에 다시 계산한다
+        conn.execute(
+            "UPDATE rules SET related_case_count = "
+            "(SELECT COUNT(case_id) FROM case_rule_link WHERE rule_id = rules.id)"
+        )
+        conn.execute(
+            "UPDATE terms SET related_case_count = "
+            "(SELECT COUNT(case_id) FROM case_term_link WHERE term_id = terms.id)"
+        )
+        bump_data_version(conn, *VERSION_SCOPES)
+        conn.execute("COMMIT")
+        conn.execute("ANALYZE")
+        finished = time.perf_counter()
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+    load_seconds = max(loaded - started, 1e-9)
+    print(
+        "✅ 대량 적재 완료 — 규칙 {rules:,} / 용어 {terms:,} / 사례 {cases:,}건".format(**totals)
+    )
+    print(
+        f"⏱ 적재 {load_seconds:.2f}s ({row_count / load_seconds:,.0f} rows/sec), "
+        f"인덱스·집계 재생성 포함 총 {finished - started:.2f}s"
+    )
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="수암명리 DB 초기화 및 JSON 데이터 적재")
+    parser.add_argument("--bulk", action="store_true", help="스트리밍 파싱 + 배치 적재 모드")
+    parser.add_argument("--batch-size", type=int, default=20000, help="--bulk 의 executemany 배치 크기")
+    parser.add_argument("--from-json", metavar="PATH", help="--bulk 로 적재할 rules/terms/cases 내보내기 파일")
+    args = parser.parse_args(argv)
+
+    if args.from_json and not args.bulk:
+        parser.error("--from-json 은 --bulk 와 함께 사용해야 합니다")
+    if args.bulk:
+        bulk_load(batch_size=args.batch_size, export_path=args.from_json)
+        return
+
     init_db()
 
     rules = load_json_data("rules.json")
@@ -181,6 +483,7 @@ def main() -> None:
         rule_map = insert_rules(conn, rules)
         term_map = insert_terms(conn, terms)
         insert_cases(conn, cases, rule_map, term_map)
+        bump_data_version(conn, *VERSION_SCOPES)
         conn.commit()
 
     print("✅ 데이터 삽입 완료")
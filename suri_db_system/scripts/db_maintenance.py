@@ -0,0 +1,213 @@
+"""수암명리 DB 유지보수 스크립트.
+
+외래 키 점검, 고아 링크 정리, 연결 사례 수(related_case_count) 점검,
+통계 갱신(ANALYZE/PRAGMA optimize), 증분 VACUUM, 페이지 사용량 보고,
+앱 시작용 읽기 전용 스냅샷 빌드, 중복 규칙/용어/사례 보고를 수행한다.
+
+    python suri_db_system/scripts/db_maintenance.py counts --check
+    python suri_db_system/scripts/db_maintenance.py counts --rebuild
+    python suri_db_system/scripts/db_maintenance.py orphans --sweep
+    python suri_db_system/scripts/db_maintenance.py vacuum --enable
+    python suri_db_system/scripts/db_maintenance.py size
+    python suri_db_system/scripts/db_maintenance.py all
+    python suri_db_system/scripts/db_maintenance.py snapshot
+    python suri_db_system/scripts/db_maintenance.py dupes --threshold 0.8
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+ROOT_DIR = BASE_DIR.parent
+DB_PATH = BASE_DIR / "db" / "suri_manual.db"
+
+sys.path.insert(0, str(ROOT_DIR))
+
+from utils.db_maintenance import (  # noqa: E402
+    count_orphans,
+    enable_incremental_vacuum,
+    foreign_key_violations,
+    incremental_vacuum,
+    optimize,
+    size_report,
+    sweep_orphans,
+)
+from utils.dedupe import DEFAULT_THRESHOLD, near_duplicate_report  # noqa: E402
+from utils.db_manager_v2 import (  # noqa: E402
+    check_related_case_counts,
+    init_db,
+    rebuild_related_case_counts,
+)
+from utils.kb_snapshot import build_snapshot, default_snapshot_path  # noqa: E402
+
+
+def run_counts(db_path: str, rebuild: bool) -> int:
+    """연결 사례 수를 점검하고, rebuild 가 참이면 재계산한다."""
+    mismatches = check_related_case_counts(db_path)
+    for row in mismatches:
+        print(
+            f"⚠️ {row['table_name']}#{row['id']}: 저장값 {row['stored_count']} / 실제 {row['actual_count']}"
+        )
+
+    if not mismatches:
+        print("✅ related_case_count 일치")
+        return 0
+
+    if rebuild:
+        rebuild_related_case_counts(db_path)
+        print(f"🔧 {len(mismatches)}건 재계산 완료")
+        return 0
+
+    print(f"❌ 불일치 {len(mismatches)}건 (--rebuild 로 재계산)")
+    return 1
+
+
+def run_fk_check(db_path: str) -> int:
+    violations = foreign_key_violations(db_path)
+    for row in violations:
+        print(f"⚠️ {row['table']} rowid={row['rowid']} → {row['parent']} 없음")
+    print("✅ 외래 키 위반 없음" if not violations else f"❌ 외래 키 위반 {len(violations)}건")
+    return 1 if violations else 0
+
+
+def run_orphans(db_path: str, sweep: bool) -> int:
+    results = sweep_orphans(db_path) if sweep else count_orphans(db_path)
+    label = "삭제" if sweep else "발견"
+    for target, count in results.items():
+        if count:
+            print(f"🧹 {target}: 고아 행 {count}건 {label}")
+    total = sum(results.values())
+    print(f"✅ 고아 행 {total}건 {label}" if sweep or not total else f"❌ 고아 행 {total}건 (--sweep 로 정리)")
+    return 0 if sweep or not total else 1
+
+
+def run_analyze(db_path: str, full: bool) -> int:
+    optimize(db_path, full_analyze=full)
+    print("✅ 통계 갱신 완료" + (" (ANALYZE)" if full else " (PRAGMA optimize)"))
+    return 0
+
+
+def run_vacuum(db_path: str, enable: bool, pages: int | None) -> int:
+    if enable and enable_incremental_vacuum(db_path):
+        print("🔧 auto_vacuum=INCREMENTAL 전환 (전체 VACUUM 수행)")
+    released = incremental_vacuum(db_path, pages)
+    print(f"✅ 빈 페이지 {released}개 반환")
+    return 0
+
+
+def run_size(db_path: str) -> int:
+    report = size_report(db_path)
+    print(
+        "📦 파일 {file_bytes:,} bytes / 페이지 {page_count:,} × {page_size:,} bytes"
+        " / 빈 페이지 {freelist_count:,} ({free_bytes:,} bytes) / auto_vacuum={auto_vacuum}".format(**report)
+    )
+    for item in report["objects"]:
+        print(
+            f"   {item['name']:<32} {item['pages']:>8,} pages {item['bytes']:>12,} bytes"
+            f" (미사용 {item['unused_bytes']:,})"
+        )
+    return 0
+
+
+def run_all(db_path: str) -> int:
+    run_orphans(db_path, sweep=True)
+    run_counts(db_path, rebuild=True)
+    run_analyze(db_path, full=False)
+    run_vacuum(db_path, enable=False, pages=None)
+    return run_size(db_path)
+
+
+def run_snapshot(db_path: str, output: str | None) -> int:
+    started = time.perf_counter()
+    snapshot_path = build_snapshot(db_path, output)
+    elapsed = time.perf_counter() - started
+    print(f"✅ 스냅샷 생성: {snapshot_path} ({snapshot_path.stat().st_size:,} bytes, {elapsed:.2f}s)")
+    return 0
+
+
+def run_dupes(db_path: str, threshold: float) -> int:
+    report = near_duplicate_report(db_path, threshold)
+    for row in report:
+        print(f"♻️ {row['kind']}#{row['id']} ≈ {row['kind']}#{row['duplicate_of']} (유사도 {row['similarity']:.2f})")
+    print("✅ 중복 의심 항목 없음" if not report else f"⚠️ 중복 의심 {len(report)}건")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="수암명리 DB 유지보수")
+    parser.add_argument("--db", default=str(DB_PATH), help="SQLite DB 경로")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    counts = commands.add_parser("counts", help="related_case_count 점검/재계산")
+    mode = counts.add_mutually_exclusive_group()
+    mode.add_argument("--check", action="store_true", help="불일치만 보고 (기본값)")
+    mode.add_argument("--rebuild", action="store_true", help="불일치가 있으면 재계산")
+
+    commands.add_parser("fk", help="PRAGMA foreign_key_check 결과 보고")
+
+    orphans = commands.add_parser("orphans", help="부모가 사라진 링크/태그 행 점검")
+    orphans.add_argument("--sweep", action="store_true", help="고아 행 삭제")
+
+    analyze = commands.add_parser("analyze", help="플래너 통계 갱신")
+    analyze.add_argument("--full", action="store_true", help="PRAGMA optimize 전에 전체 ANALYZE 실행")
+
+    vacuum = commands.add_parser("vacuum", help="증분 VACUUM 으로 빈 페이지 반환")
+    vacuum.add_argument("--enable", action="store_true", help="기존 DB 를 auto_vacuum=INCREMENTAL 로 전환")
+    vacuum.add_argument("--pages", type=int, default=None, help="반환할 최대 페이지 수 (기본: 전부)")
+
+    commands.add_parser("size", help="페이지 단위 용량 보고")
+    commands.add_parser("all", help="고아 정리 → 집계 재계산 → 통계 → 증분 VACUUM → 용량 보고")
+
+    snapshot = commands.add_parser("snapshot", help="앱 시작용 읽기 전용 스냅샷 빌드")
+    snapshot.add_argument(
+        "--output",
+        default=None,
+        help=f"스냅샷 경로 (기본: {default_snapshot_path(DB_PATH).name})",
+    )
+
+    dupes = commands.add_parser("dupes", help="MinHash/LSH 로 거의 같은 규칙/용어/사례 보고")
+    dupes.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"중복으로 볼 추정 자카드 유사도 (기본: {DEFAULT_THRESHOLD})",
+    )
+    return parser
+
+
+# 보고만 하는 명령 — DB 를 초기화하지 않아 파일(과 스냅샷 신선도)을 그대로 둔다
+READ_ONLY_COMMANDS = {"fk", "size", "dupes"}
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    read_only = args.command in READ_ONLY_COMMANDS or (args.command == "counts" and not args.rebuild)
+    if not read_only:
+        init_db(args.db)
+
+    if args.command == "counts":
+        return run_counts(args.db, rebuild=args.rebuild)
+    if args.command == "fk":
+        return run_fk_check(args.db)
+    if args.command == "orphans":
+        return run_orphans(args.db, sweep=args.sweep)
+    if args.command == "analyze":
+        return run_analyze(args.db, full=args.full)
+    if args.command == "vacuum":
+        return run_vacuum(args.db, enable=args.enable, pages=args.pages)
+    if args.command == "size":
+        return run_size(args.db)
+    if args.command == "all":
+        return run_all(args.db)
+    if args.command == "snapshot":
+        return run_snapshot(args.db, args.output)
+    if args.command == "dupes":
+        return run_dupes(args.db, args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from utils.chart_parser import Pillars, parse_chart
+from utils.relations import BRANCHES, STEMS
+from utils.rule_compiler import Facts, Predicate, chart_facts, compile_condition
+
+try:
+    import numpy as np
+except ImportError:  # numpy 가 없으면 파이썬 정수 비트열로 같은 연산을 한다
+    np = None  # type: ignore[assignment]
+
+DEFAULT_CHUNK_SIZE = 65536
+# rules_master.json 항목에서 조건 문장을 찾는 필드 (앞에서부터 처음 컴파일되는 것)
+MASTER_CONDITION_FIELDS = ("condition", "조건", "title", "example")
+
+# 문자열 명조, parse_chart 결과, 또는 match_rules 의 {"day_stem", "branches", "relations"} 형식
+Chart = Union[str, Pillars, Mapping[str, Any]]
+
+
+def master_rule_predicates(rules: Mapping[Any, Any]) -> List[Tuple[Any, Optional[Predicate]]]:
+    """``(rule_id, predicate)`` for every ``rules_master.json`` entry (``None`` when nothing compiles)."""
+    predicates = []
+    for rule_id, rule in rules.items():
+        predicate = None
+        if isinstance(rule, str):
+            predicate = compile_condition(rule)
+        elif isinstance(rule, Mapping):
+            for field in MASTER_CONDITION_FIELDS:
+                value = rule.get(field)
+                predicate = compile_condition(value) if isinstance(value, str) else None
+                if predicate is not None:
+                    break
+        predicates.append((rule_id, predicate))
+    return predicates
+
+
+def _legacy_facts(chart: Mapping[str, Any]) -> Facts:
+    facts = set()
+    day_stem = chart.get("day_stem")
+    if day_stem:
+        facts.update({("pillar", "day", day_stem), ("stem", day_stem)})
+    facts.update(("branch", branch) for branch in chart.get("branches") or ())
+    for label in chart.get("relations") or ():
+        if len(label) == 3 and label[0] in STEMS + BRANCHES:
+            facts.add(("relation", label[2]))
+            facts.add(("pair", "".join(sorted(label[:2])), label[2]))
+    return frozenset(facts)
+
+
+def chart_to_facts(chart: Chart) -> Facts:
+    if isinstance(chart, str):
+        return chart_facts(parse_chart(chart) or {})
+    if "day_stem" in chart or "branches" in chart or "relations" in chart:
+        return _legacy_facts(chart)
+    return chart_facts(chart)
+
+
+def _leaves(predicate: Predicate) -> Iterator[Tuple[str, ...]]:
+    if predicate[0] in ("and", "or"):
+        for child in predicate[1]:
+            yield from _leaves(child)
+    else:
+        yield predicate
+
+
+class _IntColumns:
+    """Chunk feature matrix stored column-wise as Python ints (bit ``i`` = chart ``i``)."""
+
+    def __init__(self, rows: List[List[int]], size: int, width: int) -> None:
+        columns = [bytearray((size + 7) // 8) for _ in range(width)]
+        for index, features in enumerate(rows):
+            byte, bit = index >> 3, 1 << (index & 7)
+            for column in features:
+                columns[column][byte] |= bit
+        self.columns = [int.from_bytes(column, "little") for column in columns]
+
+    def leaf(self, column: int) -> int:
+        return self.columns[column]
+
+    @staticmethod
+    def conjoin(left: int, right: int) -> int:
+        return left & right
+
+    @staticmethod
+    def disjoin(left: int, right: int) -> int:
+        return left | right
+
+    @staticmethod
+    def indices(bits: int) -> List[int]:
+        text = bin(bits)[:1:-1]
+        found, position = [], text.find("1")
+        while position != -1:
+            found.append(position)
+            position = text.find("1", position + 1)
+        return found
+
+
+class _NumpyColumns:
+    """Same matrix as bit-packed numpy rows, so AND/OR and bit extraction run vectorised."""
+
+    def __init__(self, rows: List[List[int]], size: int, width: int) -> None:
+        matrix = np.zeros((width, size), dtype=bool)
+        chart_index = [index for index, features in enumerate(rows) for _ in features]
+        feature_index = [column for features in rows for column in features]
+        matrix[feature_index, chart_index] = True
+        self.columns = np.packbits(matrix, axis=1, bitorder="little")
+
+    def leaf(self, column: int) -> "np.ndarray":
+        return self.columns[column]
+
+    @staticmethod
+    def conjoin(left: "np.ndarray", right: "np.ndarray") -> "np.ndarray":
+        return np.bitwise_and(left, right)
+
+    @staticmethod
+    def disjoin(left: "np.ndarray", right: "np.ndarray") -> "np.ndarray":
+        return np.bitwise_or(left, right)
+
+    @staticmethod
+    def indices(bits: "np.ndarray") -> "np.ndarray":
+        # 0 이 아닌 바이트만 풀어 쓰므로 희소한 결과는 청크 전체를 훑지 않는다
+        nonzero = np.flatnonzero(bits)
+        rows, offsets = np.nonzero(np.unpackbits(bits[nonzero, np.newaxis], axis=1, bitorder="little"))
+        return nonzero[rows] * 8 + offsets
+
+
+def _shift(indices: Sequence[int], offset: int) -> Sequence[int]:
+    if not offset:
+        return indices
+    if isinstance(indices, list):
+        return [offset + index for index in indices]
+    return indices + offset
+
+
+def iter_bulk_matches(
+    charts: Iterable[Chart],
+    predicates: Iterable[Tuple[Any, Optional[Predicate]]],
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[Any, Sequence[int]]]:
+    """Yield ``(rule_id, chart_indices)`` for every rule matching at least one chart of a chunk.
+
+    Each chunk of charts becomes a binary feature matrix stored column-wise
+    (one bit row per predicate leaf, bit ``i`` = chart ``i``). A rule's
+    requirement mask is evaluated for the whole chunk at once as AND/OR over
+    those rows, shared sub-predicates once per chunk, and only the set bits
+    are turned into chart indices. Rows are bit-packed numpy arrays when
+    numpy is installed and Python ints otherwise; memory is bounded by
+    ``leaves × chunk_size`` bits. A rule may appear once per chunk; its
+    indices are ascending (an int64 array with numpy, a list without).
+    """
+    compiled = [(rule_id, predicate) for rule_id, predicate in predicates if predicate is not None]
+    vocabulary: Dict[Tuple[str, ...], int] = {}
+    for _, predicate in compiled:
+        for leaf in _leaves(predicate):
+            vocabulary.setdefault(leaf, len(vocabulary))
+
+    store = _IntColumns if np is None else _NumpyColumns
+    iterator = iter(charts)
+    offset = 0
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        rows = [
+            [vocabulary[fact] for fact in chart_to_facts(chart) if fact in vocabulary] for chart in chunk
+        ]
+        columns = store(rows, len(chunk), len(vocabulary))
+        memo: Dict[Predicate, Any] = {}
+
+        def evaluate(predicate: Predicate) -> Any:
+            bits = memo.get(predicate)
+            if bits is None:
+                if predicate[0] in ("and", "or"):
+                    combine = columns.conjoin if predicate[0] == "and" else columns.disjoin
+                    children = iter(predicate[1])
+                    bits = evaluate(next(children))
+                    for child in children:
+                        bits = combine(bits, evaluate(child))
+                else:
+                    bits = columns.leaf(vocabulary[predicate])
+                memo[predicate] = bits
+            return bits
+
+        for rule_id, predicate in compiled:
+            indices = columns.indices(evaluate(predicate))
+            if len(indices):
+                yield rule_id, _shift(indices, offset)
+        offset += len(chunk)
+
+
+def bulk_match(
+    charts: Iterable[Chart],
+    predicates: Iterable[Tuple[Any, Optional[Predicate]]],
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[Any, Sequence[int]]:
+    """Sparse match list: ``rule_id`` → ascending indices of the charts it matches."""
+    parts: Dict[Any, List[Sequence[int]]] = {}
+    for rule_id, indices in iter_bulk_matches(charts, predicates, chunk_size=chunk_size):
+        parts.setdefault(rule_id, []).append(indices)
+    if np is None:
+        return {rule_id: [index for part in chunks for index in part] for rule_id, chunks in parts.items()}
+    return {rule_id: np.concatenate(chunks) for rule_id, chunks in parts.items()}
+
+
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "master_rule_predicates",
+    "chart_to_facts",
+    "iter_bulk_matches",
+    "bulk_match",
+]
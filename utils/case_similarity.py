@@ -0,0 +1,181 @@
+import heapq
+import sqlite3
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from utils.chart_parser import PILLAR_POSITIONS, Pillars, chart_strings, parse_chart
+from utils.db_manager_v2 import read_connection
+from utils.relations import BRANCH_PAIR_RELATIONS, BRANCHES, STEM_PAIR_RELATIONS, STEMS, detect_relations
+
+try:
+    import numpy as np
+except ImportError:  # numpy 가 없으면 파이썬 정수 비트셋으로 순차 채점한다
+    np = None  # type: ignore[assignment]
+
+DEFAULT_TOP_K = 10
+
+# 특징 그룹별 가중치 — 가중치만큼 비트를 복제하므로 단순 Jaccard 가 곧 가중 Jaccard 가 된다
+FEATURE_WEIGHTS = {
+    "position": 2,  # 기둥 위치별 천간/지지 (일간 甲 ≠ 년간 甲)
+    "stem": 1,  # 위치 무관 천간 존재
+    "branch": 1,  # 위치 무관 지지 존재
+    "relation": 2,  # 구체적 관계 (午卯破)
+    "relation_type": 1,  # 관계 유형 (지지 破 존재)
+}
+
+Feature = Tuple[Hashable, ...]
+
+
+def _relation_key(first: str, second: str, relation_type: str) -> Feature:
+    low, high = sorted((first, second))
+    return ("relation", low, high, relation_type)
+
+
+def _feature_keys() -> List[Feature]:
+    keys: List[Feature] = []
+    for position in PILLAR_POSITIONS:
+        keys.extend(("position", position, char) for char in STEMS + BRANCHES)
+    keys.extend(("stem", char) for char in STEMS)
+    keys.extend(("branch", char) for char in BRANCHES)
+    for kind, definitions in (("stem", STEM_PAIR_RELATIONS), ("branch", BRANCH_PAIR_RELATIONS)):
+        for relation_type, pairs in definitions.items():
+            keys.extend(_relation_key(pair[0], pair[1], relation_type) for pair in pairs)
+            keys.append(("relation_type", kind, relation_type))
+    return list(dict.fromkeys(keys))
+
+
+def _feature_masks() -> Tuple[Dict[Feature, int], int]:
+    masks: Dict[Feature, int] = {}
+    bit = 0
+    for key in _feature_keys():
+        width = FEATURE_WEIGHTS[key[0]]
+        masks[key] = ((1 << width) - 1) << bit
+        bit += width
+    return masks, bit
+
+
+FEATURE_MASKS, FEATURE_BITS = _feature_masks()
+FEATURE_WORDS = (FEATURE_BITS + 63) // 64
+
+
+def encode_chart(pillars: Pillars) -> int:
+    """Feature bitset of a parsed chart (see :data:`FEATURE_WEIGHTS`)."""
+    mask = 0
+    for position, pillar in pillars.items():
+        mask |= FEATURE_MASKS[("position", position, pillar[0])]
+        mask |= FEATURE_MASKS[("position", position, pillar[1])]
+        mask |= FEATURE_MASKS[("stem", pillar[0])] | FEATURE_MASKS[("branch", pillar[1])]
+
+    gan, zhi = chart_strings(pillars)
+    for kind, chars in (("stem", gan.split()), ("branch", zhi.split())):
+        for first, second, relation_type in detect_relations(chars):
+            mask |= FEATURE_MASKS[_relation_key(first, second, relation_type)]
+            mask |= FEATURE_MASKS[("relation_type", kind, relation_type)]
+    return mask
+
+
+def _popcount_rows(matrix: "np.ndarray") -> "np.ndarray":
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(matrix).sum(axis=1, dtype=np.int64)
+    table = np.array([bin(value).count("1") for value in range(256)], dtype=np.int64)
+    return table[matrix.view(np.uint8)].reshape(len(matrix), -1).sum(axis=1)
+
+
+class CaseSimilarityIndex:
+    """Top-k structurally similar cases by weighted Jaccard over chart feature bitsets.
+
+    Each chart is one integer bitset (positional stems/branches, stems,
+    branches, relations, relation types). With numpy the bitsets are packed
+    into a ``(cases, words)`` uint64 matrix and a query is scored against
+    every case in a few vectorised AND/OR/popcount passes; without it the
+    same scoring runs over Python ints.
+    """
+
+    def __init__(self) -> None:
+        self._ids: List[Any] = []
+        self._titles: List[str] = []
+        self._charts: List[str] = []
+        self._masks: List[int] = []
+        self._matrix = None
+        self._counts = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, case_id: Any, chart: Optional[str], title: str = "") -> bool:
+        """Index one case; returns ``False`` when its chart cannot be parsed."""
+        pillars = parse_chart(chart)
+        if not pillars:
+            return False
+        self._ids.append(case_id)
+        self._titles.append(title or "")
+        self._charts.append(chart or "")
+        self._masks.append(encode_chart(pillars))
+        self._matrix = None
+        return True
+
+    def _packed(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        if self._matrix is None:
+            size = FEATURE_WORDS * 8
+            buffer = b"".join(mask.to_bytes(size, "little") for mask in self._masks)
+            self._matrix = np.frombuffer(buffer, dtype="<u8").reshape(len(self._masks), FEATURE_WORDS)
+            self._counts = _popcount_rows(self._matrix)
+        return self._matrix, self._counts
+
+    def _scores(self, query: int, k: int) -> List[Tuple[float, int]]:
+        if np is None:
+            query_count = query.bit_count()
+            scored = []
+            for row, mask in enumerate(self._masks):
+                intersection = (query & mask).bit_count()
+                scored.append((intersection / (query_count + mask.bit_count() - intersection), row))
+            return heapq.nlargest(k, scored, key=lambda item: item[0])
+
+        matrix, counts = self._packed()
+        words = np.frombuffer(query.to_bytes(FEATURE_WORDS * 8, "little"), dtype="<u8")
+        intersection = _popcount_rows(matrix & words)
+        union = counts + _popcount_rows(words[np.newaxis, :]) - intersection
+        scores = intersection / np.maximum(union, 1)
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(float(scores[row]), int(row)) for row in top]
+
+    def similar(self, pillars: Pillars, k: int = DEFAULT_TOP_K) -> List[Dict[str, Any]]:
+        """Up to ``k`` cases most similar to ``pillars``, best first (zero scores dropped)."""
+        if not self._ids or not pillars or k <= 0:
+            return []
+        return [
+            {
+                "id": self._ids[row],
+                "title": self._titles[row],
+                "chart": self._charts[row],
+                "score": round(score, 3),
+            }
+            for score, row in self._scores(encode_chart(pillars), k)
+            if score > 0
+        ]
+
+
+def build_case_index(db_path: str) -> CaseSimilarityIndex:
+    """Index every case in ``db_path`` whose chart can be parsed."""
+    index = CaseSimilarityIndex()
+    with read_connection(db_path) as conn:
+        try:
+            rows = conn.execute("SELECT id, title, chart FROM cases WHERE chart IS NOT NULL AND chart != ''")
+            for case_id, title, chart in rows:
+                index.add(case_id, chart, title)
+        except sqlite3.OperationalError:
+            # cases 테이블이 없는 DB
+            pass
+    return index
+
+
+__all__ = [
+    "DEFAULT_TOP_K",
+    "FEATURE_WEIGHTS",
+    "encode_chart",
+    "CaseSimilarityIndex",
+    "build_case_index",
+]
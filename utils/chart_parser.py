@@ -0,0 +1,128 @@
+import re
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.relations import BRANCHES, STEMS
+
+# 앱 입력과 같은 시·일·월·년 순서
+PILLAR_POSITIONS = ("hour", "day", "month", "year")
+
+PILLAR_LABELS = {
+    "時": "hour", "时": "hour", "시": "hour",
+    "日": "day", "일": "day",
+    "月": "month", "월": "month",
+    "年": "year", "년": "year",
+}
+
+# "戊戌日", "丙午 時" 처럼 라벨이 붙은 기둥 (순서 무관)
+LABELED_PILLAR_PATTERN = re.compile(
+    f"([{STEMS}])([{BRANCHES}])\\s*([{''.join(PILLAR_LABELS)}])"
+)
+PILLAR_PATTERN = re.compile(f"([{STEMS}])([{BRANCHES}])")
+# "甲癸癸乙 (坤) / 子亥未丑" — 천간 줄 / 지지 줄
+SPLIT_CHART_PATTERN = re.compile(r"[/|｜]")
+
+# cases 테이블의 구조화 컬럼 — 천간 0..9, 지지 0..11 (STEMS/BRANCHES 순번), 모르면 NULL
+CHART_CODE_COLUMNS = tuple(
+    f"{position}_{part}" for position in PILLAR_POSITIONS for part in ("stem", "branch")
+) + ("branch_mask",)
+# 한 명조에 들어갈 수 있는 서로 다른 지지 수
+MAX_CHART_BRANCHES = len(PILLAR_POSITIONS)
+
+Pillars = Dict[str, str]
+
+
+def _positional(pillars: list) -> Optional[Pillars]:
+    """Unlabeled pillars: four are 시·일·월·년, three are 일·월·년 (시 미상)."""
+    if len(pillars) == 4:
+        return dict(zip(PILLAR_POSITIONS, pillars))
+    if len(pillars) == 3:
+        return dict(zip(PILLAR_POSITIONS[1:], pillars))
+    return None
+
+
+def parse_chart(text: Optional[str]) -> Optional[Pillars]:
+    """Parse a free-text chart into ``{position: pillar}`` (e.g. ``{"day": "戊戌", ...}``).
+
+    Accepted forms:
+
+    - labeled pillars in any order: ``戊戌日 丙午時 乙酉月 庚寅年``
+    - a stem row and a branch row: ``甲癸癸乙 (坤) / 子亥未丑``
+    - bare pillars in 시·일·월·년 order: ``甲子 乙丑 丙寅 丁卯`` → ``甲子`` is the hour pillar
+
+    Positions that cannot be read are left out; ``None`` means nothing was parsed.
+    """
+    if not text:
+        return None
+
+    labeled = LABELED_PILLAR_PATTERN.findall(text)
+    if labeled:
+        pillars: Pillars = {}
+        for stem, branch, label in labeled:
+            pillars.setdefault(PILLAR_LABELS[label], stem + branch)
+        return {position: pillars[position] for position in PILLAR_POSITIONS if position in pillars}
+
+    parts = SPLIT_CHART_PATTERN.split(text)
+    if len(parts) == 2:
+        stems = [char for char in parts[0] if char in STEMS]
+        branches = [char for char in parts[1] if char in BRANCHES]
+        if stems and len(stems) == len(branches):
+            return _positional([stem + branch for stem, branch in zip(stems, branches)])
+
+    return _positional([stem + branch for stem, branch in PILLAR_PATTERN.findall(text)])
+
+
+def chart_strings(pillars: Pillars) -> Tuple[str, str]:
+    """``{position: pillar}`` → space-separated stems and branches in 시·일·월·년 order."""
+    ordered = [pillars[position] for position in PILLAR_POSITIONS if position in pillars]
+    return " ".join(pillar[0] for pillar in ordered), " ".join(pillar[1] for pillar in ordered)
+
+
+def branch_mask(branches: Iterable[str]) -> int:
+    """Bit ``i`` set for every ``BRANCHES[i]`` in ``branches``."""
+    mask = 0
+    for branch in branches:
+        mask |= 1 << BRANCHES.index(branch)
+    return mask
+
+
+def chart_codes(text: Optional[str]) -> Tuple[Optional[int], ...]:
+    """Values for :data:`CHART_CODE_COLUMNS` (all ``None`` when the chart cannot be parsed)."""
+    pillars = parse_chart(text)
+    if not pillars:
+        return (None,) * len(CHART_CODE_COLUMNS)
+    codes: List[Optional[int]] = []
+    for position in PILLAR_POSITIONS:
+        pillar = pillars.get(position)
+        codes.append(STEMS.index(pillar[0]) if pillar else None)
+        codes.append(BRANCHES.index(pillar[1]) if pillar else None)
+    codes.append(branch_mask(pillar[1] for pillar in pillars.values()))
+    return tuple(codes)
+
+
+def branch_mask_supersets(required: int) -> List[int]:
+    """Every storable ``branch_mask`` containing all bits of ``required``.
+
+    A chart has at most four distinct branches, so "contains 午 and 卯"
+    expands to a short ``IN (...)`` list the branch_mask index can seek.
+    """
+    missing = [bit for bit in range(len(BRANCHES)) if not required >> bit & 1]
+    free = MAX_CHART_BRANCHES - bin(required).count("1")
+    if free < 0:
+        return []
+    return [
+        required | sum(1 << bit for bit in extra)
+        for size in range(free + 1)
+        for extra in combinations(missing, size)
+    ]
+
+
+__all__ = [
+    "PILLAR_POSITIONS",
+    "CHART_CODE_COLUMNS",
+    "parse_chart",
+    "chart_strings",
+    "branch_mask",
+    "chart_codes",
+    "branch_mask_supersets",
+]
@@ -0,0 +1,180 @@
+import os
+import sqlite3
+from typing import Dict, List, Optional
+
+from utils.db_manager_v2 import bump_data_version, connect
+
+
+# (자식 테이블, 자식 컬럼, 부모 테이블) — 부모 행이 사라진 링크/라벨 행을 찾는 기준
+ORPHAN_TARGETS = (
+    ("case_rule_link", "case_id", "cases"),
+    ("case_rule_link", "rule_id", "rules"),
+    ("case_term_link", "case_id", "cases"),
+    ("case_term_link", "term_id", "terms"),
+    ("case_tag", "case_id", "cases"),
+    ("rule_keyword", "rule_id", "rules"),
+)
+
+AUTO_VACUUM_MODES = {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}
+
+
+def _existing_tables(conn: sqlite3.Connection) -> set:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def foreign_key_violations(path: str) -> List[Dict[str, object]]:
+    """Return the rows reported by ``PRAGMA foreign_key_check``."""
+    conn = connect(path)
+    try:
+        return [
+            {"table": table, "rowid": rowid, "parent": parent, "fk_index": fk_index}
+            for table, rowid, parent, fk_index in conn.execute("PRAGMA foreign_key_check")
+        ]
+    finally:
+        conn.close()
+
+
+def count_orphans(path: str) -> Dict[str, int]:
+    """Count link/label rows whose parent case, rule or term no longer exists."""
+    conn = connect(path)
+    try:
+        return _scan_orphans(conn, delete=False)
+    finally:
+        conn.close()
+
+
+def sweep_orphans(path: str) -> Dict[str, int]:
+    """Delete orphaned link/label rows and return how many were removed per target."""
+    conn = connect(path)
+    try:
+        removed = _scan_orphans(conn, delete=True)
+        if any(removed.values()):
+            bump_data_version(conn, "rules", "cases", "links")
+        conn.commit()
+        return removed
+    finally:
+        conn.close()
+
+
+def _scan_orphans(conn: sqlite3.Connection, *, delete: bool) -> Dict[str, int]:
+    tables = _existing_tables(conn)
+    results: Dict[str, int] = {}
+    for child, column, parent in ORPHAN_TARGETS:
+        if child not in tables or parent not in tables:
+            continue
+        condition = (
+            f"{column} IS NOT NULL AND NOT EXISTS "
+            f"(SELECT 1 FROM {parent} p WHERE p.id = {child}.{column})"
+        )
+        if delete:
+            cursor = conn.execute(f"DELETE FROM {child} WHERE {condition}")
+            results[f"{child}.{column}"] = cursor.rowcount
+        else:
+            results[f"{child}.{column}"] = conn.execute(
+                f"SELECT COUNT(*) FROM {child} WHERE {condition}"
+            ).fetchone()[0]
+    return results
+
+
+def optimize(path: str, *, full_analyze: bool = False) -> None:
+    """Refresh planner statistics.
+
+    ``PRAGMA optimize`` only re-analyzes tables whose statistics look stale;
+    ``full_analyze`` runs a complete ``ANALYZE`` first (useful after bulk loads).
+    """
+    conn = connect(path)
+    try:
+        if full_analyze:
+            conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def enable_incremental_vacuum(path: str) -> bool:
+    """Switch an existing database to ``auto_vacuum = INCREMENTAL``.
+
+    Changing the mode of a populated database requires one full ``VACUUM``.
+    Returns ``True`` when the conversion was performed.
+    """
+    conn = connect(path)
+    try:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return True
+    finally:
+        conn.close()
+
+
+def incremental_vacuum(path: str, pages: Optional[int] = None) -> int:
+    """Return up to ``pages`` free pages to the OS (all of them when ``None``).
+
+    Only effective when the database uses incremental auto-vacuum. Returns the
+    number of pages released.
+    """
+    conn = connect(path)
+    try:
+        before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if pages is None:
+            conn.execute("PRAGMA incremental_vacuum").fetchall()
+        else:
+            conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+        conn.commit()
+        after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return before - after
+    finally:
+        conn.close()
+
+
+def size_report(path: str) -> Dict[str, object]:
+    """Summarise page usage for the whole file and, if ``dbstat`` is available, per table/index."""
+    conn = connect(path)
+    try:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+
+        objects: List[Dict[str, object]] = []
+        try:
+            rows = conn.execute(
+                """
+                SELECT name, COUNT(*) AS pages, SUM(pgsize) AS bytes, SUM(unused) AS unused_bytes
+                FROM dbstat
+                GROUP BY name
+                ORDER BY bytes DESC
+                """
+            ).fetchall()
+        except sqlite3.OperationalError:
+            # dbstat 가상 테이블 없이 빌드된 SQLite
+            rows = []
+        for name, pages, size_bytes, unused_bytes in rows:
+            objects.append(
+                {"name": name, "pages": pages, "bytes": size_bytes, "unused_bytes": unused_bytes}
+            )
+
+        return {
+            "file_bytes": os.path.getsize(path) if os.path.exists(path) else 0,
+            "page_size": page_size,
+            "page_count": page_count,
+            "freelist_count": freelist_count,
+            "free_bytes": freelist_count * page_size,
+            "auto_vacuum": AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum)),
+            "objects": objects,
+        }
+    finally:
+        conn.close()
+
+
+__all__ = [
+    "foreign_key_violations",
+    "count_orphans",
+    "sweep_orphans",
+    "optimize",
+    "enable_incremental_vacuum",
+    "incremental_vacuum",
+    "size_report",
+]
@@ -1,7 +1,86 @@
+import hashlib
 import json
 import os
 import sqlite3
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from utils.logic_engine import inference_table
+from utils.profile_manager import chart_key
+
+# 어떤 규칙 집합으로 만든 결과인지 모르는 행(예전 inferences 테이블에서 옮긴 행)의 버전
+DEFAULT_RULE_SET_VERSION = "default"
+
+INFERENCE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inference_payloads (
+    hash TEXT PRIMARY KEY,
+    result_json TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS inference_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chart_name TEXT,
+    chart_key TEXT NOT NULL DEFAULT '',
+    rule_set_version TEXT NOT NULL DEFAULT 'default',
+    payload_hash TEXT NOT NULL REFERENCES inference_payloads(hash),
+    created_at TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_inference_runs_name ON inference_runs(chart_name, created_at);
+CREATE INDEX IF NOT EXISTS idx_inference_runs_chart ON inference_runs(chart_key, rule_set_version, created_at);
+"""
+
+# 예전 inferences 테이블 이름으로 읽던 코드를 위한 호환 뷰
+INFERENCE_VIEW = """
+CREATE VIEW IF NOT EXISTS inferences AS
+SELECT r.id AS id, r.chart_name AS chart_name, p.result_json AS result_json
+FROM inference_runs r
+JOIN inference_payloads p ON p.hash = r.payload_hash;
+"""
+
+
+def payload_hash(result: Any) -> str:
+    """SHA-256 of the canonical JSON form, so equal results hash equally regardless of key order."""
+    canonical = json.dumps(result, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _store_payload(conn: sqlite3.Connection, result: Any) -> str:
+    digest = payload_hash(result)
+    conn.execute(
+        "INSERT OR IGNORE INTO inference_payloads (hash, result_json) VALUES (?, ?)",
+        (digest, json.dumps(result, ensure_ascii=False)),
+    )
+    return digest
+
+
+def _migrate_legacy_inferences(conn: sqlite3.Connection) -> None:
+    """Move rows of the old append-only ``inferences`` table into the deduplicated store."""
+    legacy = conn.execute(
+        "SELECT type FROM sqlite_master WHERE name = 'inferences'"
+    ).fetchone()
+    if not legacy or legacy[0] != "table":
+        return
+
+    has_charts = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'charts'").fetchone()
+    for chart_name, result_json in conn.execute(
+        "SELECT chart_name, result_json FROM inferences ORDER BY id"
+    ).fetchall():
+        try:
+            result = json.loads(result_json) if result_json else []
+        except json.JSONDecodeError:
+            result = result_json
+        # 같은 이름으로 저장된 명조가 있으면 그 명조 키를 붙인다
+        chart = has_charts and conn.execute(
+            "SELECT gan, zhi FROM charts WHERE name = ? ORDER BY id DESC LIMIT 1", (chart_name,)
+        ).fetchone()
+        conn.execute(
+            "INSERT INTO inference_runs (chart_name, chart_key, rule_set_version, payload_hash) VALUES (?, ?, ?, ?)",
+            (
+                chart_name,
+                chart_key(*chart) if chart else "",
+                DEFAULT_RULE_SET_VERSION,
+                _store_payload(conn, result),
+            ),
+        )
+    conn.execute("DROP TABLE inferences")
 
 
 def init_db(path: str) -> None:
@@ -33,13 +112,11 @@ def init_db(path: str) -> None:
             zhi TEXT,
             structure TEXT
         );
-        CREATE TABLE IF NOT EXISTS inferences (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            chart_name TEXT,
-            result_json TEXT
-        );
         """
     )
+    cur.executescript(INFERENCE_SCHEMA)
+    _migrate_legacy_inferences(conn)
+    cur.executescript(INFERENCE_VIEW)
     conn.commit()
     conn.close()
 
@@ -134,29 +211,98 @@ def insert_chart(
     conn.close()
 
 
-def insert_inference(path: str, name: str, result: List[Dict[str, Any]]) -> None:
+def insert_inference(
+    path: str,
+    name: str,
+    result: List[Dict[str, Any]],
+    *,
+    gan: str = "",
+    zhi: str = "",
+    rule_set_version: Optional[str] = None,
+) -> int:
+    """Record one inference run.
+
+    The result JSON is stored once per distinct content hash; each run only
+    adds a small row pointing at it, keyed by chart name, canonical chart key
+    (from ``gan``/``zhi``; empty when they are not given) and the rule-set
+    version that produced it — by default the digest of the current
+    inference rules.
+    """
+    if rule_set_version is None:
+        rule_set_version = inference_table().digest
     conn = sqlite3.connect(path)
-    conn.execute(
-        """
-        INSERT INTO inferences (chart_name, result_json)
-        VALUES (?, ?)
-        """,
-        (name, json.dumps(result, ensure_ascii=False)),
-    )
-    conn.commit()
-    conn.close()
+    try:
+        digest = _store_payload(conn, result)
+        cursor = conn.execute(
+            """
+            INSERT INTO inference_runs (chart_name, chart_key, rule_set_version, payload_hash, created_at)
+            VALUES (?, ?, ?, ?, strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'))
+            """,
+            (name, chart_key(gan, zhi) if gan or zhi else "", rule_set_version, digest),
+        )
+        conn.commit()
+        return int(cursor.lastrowid)
+    finally:
+        conn.close()
 
 
-def fetch_inferences(path: str, name: str) -> List[Dict[str, Any]]:
+def fetch_inference_history(
+    path: str,
+    *,
+    name: Optional[str] = None,
+    gan: str = "",
+    zhi: str = "",
+    rule_set_version: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Inference runs, newest first, filtered by name or chart and a ``[since, until)`` time range.
+
+    Times are ``YYYY-MM-DD HH:MM:SS`` strings (a date prefix such as
+    ``2024-05`` also works). Lookups by name or by chart key (+ rule-set
+    version) are served from the matching index.
+    """
+    clauses, params = [], []
+    if name is not None:
+        clauses.append("r.chart_name = ?")
+        params.append(name)
+    if gan or zhi:
+        clauses.append("r.chart_key = ?")
+        params.append(chart_key(gan, zhi))
+        if rule_set_version is not None:
+            clauses.append("r.rule_set_version = ?")
+            params.append(rule_set_version)
+    elif rule_set_version is not None:
+        clauses.append("r.rule_set_version = ?")
+        params.append(rule_set_version)
+    if since:
+        clauses.append("r.created_at >= ?")
+        params.append(since)
+    if until:
+        clauses.append("r.created_at < ?")
+        params.append(until)
+
+    where = " WHERE " + " AND ".join(clauses) if clauses else ""
     conn = sqlite3.connect(path)
     conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT * FROM inferences WHERE chart_name = ? ORDER BY id DESC
-        """,
-        (name,),
-    )
-    rows = [dict(row) for row in cur.fetchall()]
-    conn.close()
-    return rows
+    try:
+        rows = conn.execute(
+            f"""
+            SELECT r.id, r.chart_name, r.chart_key, r.rule_set_version, r.payload_hash, r.created_at,
+                   p.result_json
+            FROM inference_runs r
+            JOIN inference_payloads p ON p.hash = r.payload_hash
+            {where}
+            ORDER BY r.created_at DESC, r.id DESC
+            LIMIT ?
+            """,
+            params + [-1 if limit is None else limit],
+        ).fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        conn.close()
+
+
+def fetch_inferences(path: str, name: str) -> List[Dict[str, Any]]:
+    return fetch_inference_history(path, name=name)
@@ -1,9 +1,20 @@
 import json
 import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Union
-
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from utils.chart_parser import (
+    CHART_CODE_COLUMNS,
+    PILLAR_POSITIONS,
+    branch_mask,
+    branch_mask_supersets,
+    chart_codes,
+)
+from utils.relations import BRANCHES, STEMS
+from utils.rule_compiler import COMPILER_VERSION, Predicate, compile_rule, predicate_from_json, predicate_to_json
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 SCHEMA_PATH = BASE_DIR / "suri_db_system" / "schema" / "suri_db_schema.sql"
@@ -23,14 +34,18 @@ def _load_schema_sql() -> str:
         content TEXT,
         keywords TEXT,
         example TEXT,
-        source TEXT
+        source TEXT,
+        related_case_count INTEGER NOT NULL DEFAULT 0,
+        predicate TEXT,
+        predicate_version INTEGER NOT NULL DEFAULT 0
     );
     CREATE TABLE IF NOT EXISTS terms (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         term TEXT,
         definition TEXT,
         category TEXT,
-        source TEXT
+        source TEXT,
+        related_case_count INTEGER NOT NULL DEFAULT 0
     );
     CREATE TABLE IF NOT EXISTS cases (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -39,19 +54,159 @@ def _load_schema_sql() -> str:
         summary TEXT,
         content TEXT,
         tags TEXT,
-        source TEXT
+        source TEXT,
+        hour_stem INTEGER,
+        hour_branch INTEGER,
+        day_stem INTEGER,
+        day_branch INTEGER,
+        month_stem INTEGER,
+        month_branch INTEGER,
+        year_stem INTEGER,
+        year_branch INTEGER,
+        branch_mask INTEGER
     );
     CREATE TABLE IF NOT EXISTS case_rule_link (
-        case_id INTEGER,
-        rule_id INTEGER
+        case_id INTEGER REFERENCES cases(id) ON DELETE CASCADE,
+        rule_id INTEGER REFERENCES rules(id) ON DELETE CASCADE
     );
     CREATE TABLE IF NOT EXISTS case_term_link (
-        case_id INTEGER,
-        term_id INTEGER
+        case_id INTEGER REFERENCES cases(id) ON DELETE CASCADE,
+        term_id INTEGER REFERENCES terms(id) ON DELETE CASCADE
+    );
+    CREATE TABLE IF NOT EXISTS case_tag (
+        case_id INTEGER NOT NULL REFERENCES cases(id) ON DELETE CASCADE,
+        tag TEXT NOT NULL,
+        PRIMARY KEY (case_id, tag)
+    );
+    CREATE TABLE IF NOT EXISTS rule_keyword (
+        rule_id INTEGER NOT NULL REFERENCES rules(id) ON DELETE CASCADE,
+        keyword TEXT NOT NULL,
+        PRIMARY KEY (rule_id, keyword)
     );
+    CREATE TABLE IF NOT EXISTS data_version (
+        scope TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_case_tag_tag ON case_tag(tag, case_id);
+    CREATE INDEX IF NOT EXISTS idx_rule_keyword_keyword ON rule_keyword(keyword, rule_id);
+    CREATE TRIGGER IF NOT EXISTS trg_case_rule_link_insert AFTER INSERT ON case_rule_link
+    WHEN NEW.case_id IS NOT NULL
+    BEGIN
+        UPDATE rules SET related_case_count = related_case_count + 1 WHERE id = NEW.rule_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_case_rule_link_delete AFTER DELETE ON case_rule_link
+    WHEN OLD.case_id IS NOT NULL
+    BEGIN
+        UPDATE rules SET related_case_count = related_case_count - 1 WHERE id = OLD.rule_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_case_term_link_insert AFTER INSERT ON case_term_link
+    WHEN NEW.case_id IS NOT NULL
+    BEGIN
+        UPDATE terms SET related_case_count = related_case_count + 1 WHERE id = NEW.term_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_case_term_link_delete AFTER DELETE ON case_term_link
+    WHEN OLD.case_id IS NOT NULL
+    BEGIN
+        UPDATE terms SET related_case_count = related_case_count - 1 WHERE id = OLD.term_id;
+    END;
     """
 
 
+def connect(path: str) -> sqlite3.Connection:
+    """Open a connection with foreign keys enforced so ON DELETE CASCADE fires."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
+# 읽기 전용 연결에서 사용할 메모리 맵 크기 (파일보다 크게 잡아도 실제 파일 크기만큼만 매핑된다)
+READ_MMAP_SIZE = 256 * 1024 * 1024
+
+
+def connect_readonly(
+    path: Union[str, Path],
+    *,
+    immutable: bool = False,
+    check_same_thread: bool = True,
+) -> sqlite3.Connection:
+    """Open ``path`` read-only with memory-mapped I/O.
+
+    ``immutable`` additionally disables locking; use it only for files that
+    are never modified in place (e.g. knowledge-base snapshots).
+    """
+    uri = Path(path).resolve().as_uri() + "?mode=ro" + ("&immutable=1" if immutable else "")
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=check_same_thread)
+    conn.execute(f"PRAGMA mmap_size = {READ_MMAP_SIZE}")
+    return conn
+
+
+# 공유 읽기 연결: 경로 → ((inode, mtime), 연결, 잠금). 스냅샷처럼 이름 바꾸기로만 교체되는 파일용
+_shared_readers: Dict[str, Tuple[Tuple[int, int], sqlite3.Connection, threading.Lock]] = {}
+_shared_readers_lock = threading.Lock()
+
+
+def share_immutable(path: Union[str, Path]) -> None:
+    """Serve every later read of ``path`` from one long-lived immutable, memory-mapped connection.
+
+    Only for files that are replaced by rename, never modified in place. When
+    the file at ``path`` has been replaced, a new connection is opened; the
+    old one is closed once no read is using it.
+    """
+    key = os.fspath(path)
+    stat = os.stat(key)
+    stamp = (stat.st_ino, stat.st_mtime_ns)
+    with _shared_readers_lock:
+        current = _shared_readers.get(key)
+        if current is None or current[0] != stamp:
+            conn = connect_readonly(key, immutable=True, check_same_thread=False)
+            _shared_readers[key] = (stamp, conn, threading.Lock())
+
+
+@contextmanager
+def read_connection(path: Union[str, Path]) -> Iterator[sqlite3.Connection]:
+    """Read-only connection for ``path``: the shared one if registered, else a short-lived one."""
+    shared = _shared_readers.get(os.fspath(path))
+    if shared is not None:
+        _, conn, lock = shared
+        with lock:
+            conn.row_factory = None
+            yield conn
+        return
+
+    conn = connect_readonly(path)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+# 읽기 캐시 무효화 단위 — 쓰기 경로는 자신이 건드린 범위의 버전만 올린다
+VERSION_SCOPES = ("rules", "terms", "cases", "links")
+
+
+def bump_data_version(conn: sqlite3.Connection, *scopes: str) -> None:
+    """Increment the ``data_version`` counters of ``scopes`` inside the caller's transaction."""
+    conn.executemany(
+        """
+        INSERT INTO data_version (scope, version) VALUES (?, 1)
+        ON CONFLICT(scope) DO UPDATE SET version = version + 1
+        """,
+        [(scope,) for scope in scopes],
+    )
+
+
+def fetch_data_versions(path: str) -> Dict[str, int]:
+    """Current counter of every scope (0 for scopes never written)."""
+    with read_connection(path) as conn:
+        versions = dict.fromkeys(VERSION_SCOPES, 0)
+        try:
+            versions.update(conn.execute("SELECT scope, version FROM data_version"))
+        except sqlite3.OperationalError:
+            # data_version 테이블이 없는 오래된 DB/스냅샷
+            pass
+        return versions
+
+
 def _normalize_keywords(value: Optional[Union[Sequence[str], str]]) -> str:
     if isinstance(value, (list, tuple, set)):
         return ",".join(str(item) for item in value)
@@ -64,6 +219,33 @@ def _normalize_tags(value: Optional[Union[Sequence[str], str]]) -> str:
     return str(value) if value else ""
 
 
+def _split_labels(value: Optional[Union[Sequence[str], str]]) -> List[str]:
+    """Split a comma-joined (or list) tag/keyword value into unique, trimmed labels."""
+    if isinstance(value, (list, tuple, set)):
+        items = [str(item) for item in value]
+    elif value:
+        items = str(value).split(",")
+    else:
+        items = []
+    return list(dict.fromkeys(item.strip() for item in items if item.strip()))
+
+
+def _replace_rule_keywords(conn: sqlite3.Connection, rule_id: int, keywords: Iterable[str]) -> None:
+    conn.execute("DELETE FROM rule_keyword WHERE rule_id = ?", (rule_id,))
+    conn.executemany(
+        "INSERT OR IGNORE INTO rule_keyword (rule_id, keyword) VALUES (?, ?)",
+        [(rule_id, keyword) for keyword in keywords],
+    )
+
+
+def _replace_case_tags(conn: sqlite3.Connection, case_id: int, tags: Iterable[str]) -> None:
+    conn.execute("DELETE FROM case_tag WHERE case_id = ?", (case_id,))
+    conn.executemany(
+        "INSERT OR IGNORE INTO case_tag (case_id, tag) VALUES (?, ?)",
+        [(case_id, tag) for tag in tags],
+    )
+
+
 def _extract_link_ids(values: Optional[Iterable]) -> List[int]:
     link_ids: List[int] = []
     if not values:
@@ -87,13 +269,148 @@ def _extract_link_ids(values: Optional[Iterable]) -> List[int]:
     return list(dict.fromkeys(link_ids))
 
 
+def _migrate_label_tables(conn: sqlite3.Connection) -> None:
+    """Backfill case_tag/rule_keyword from the legacy comma-joined columns."""
+    case_rows = conn.execute("SELECT id, tags FROM cases WHERE tags IS NOT NULL AND tags != ''").fetchall()
+    conn.executemany(
+        "INSERT OR IGNORE INTO case_tag (case_id, tag) VALUES (?, ?)",
+        [(case_id, tag) for case_id, tags in case_rows for tag in _split_labels(tags)],
+    )
+
+    rule_rows = conn.execute(
+        "SELECT id, keywords FROM rules WHERE keywords IS NOT NULL AND keywords != ''"
+    ).fetchall()
+    conn.executemany(
+        "INSERT OR IGNORE INTO rule_keyword (rule_id, keyword) VALUES (?, ?)",
+        [(rule_id, keyword) for rule_id, keywords in rule_rows for keyword in _split_labels(keywords)],
+    )
+
+
+# (테이블, 링크 테이블, 링크 컬럼) — related_case_count 를 트리거로 유지하는 대상
+RELATED_COUNT_TARGETS = (
+    ("rules", "case_rule_link", "rule_id"),
+    ("terms", "case_term_link", "term_id"),
+)
+
+
+def _rebuild_related_case_counts(conn: sqlite3.Connection) -> None:
+    for table, link_table, link_column in RELATED_COUNT_TARGETS:
+        conn.execute(
+            f"""
+            UPDATE {table} SET related_case_count = (
+                SELECT COUNT(link.case_id) FROM {link_table} link WHERE link.{link_column} = {table}.id
+            )
+            """
+        )
+
+
+def _migrate_related_case_counts(conn: sqlite3.Connection) -> None:
+    """Add the stored related_case_count columns to older databases and fill them."""
+    for table, _, _ in RELATED_COUNT_TARGETS:
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if "related_case_count" not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN related_case_count INTEGER NOT NULL DEFAULT 0")
+    _rebuild_related_case_counts(conn)
+
+
+# 기둥별 (천간, 지지) 복합 인덱스와 지지 비트마스크 인덱스 — 컬럼이 생긴 뒤에 만들어야 하므로 마이그레이션에서 생성한다
+CASE_CHART_INDEXES = tuple(
+    f"CREATE INDEX IF NOT EXISTS idx_cases_{position}_pillar ON cases({position}_stem, {position}_branch)"
+    for position in PILLAR_POSITIONS
+) + ("CREATE INDEX IF NOT EXISTS idx_cases_branch_mask ON cases(branch_mask)",)
+
+
+def _migrate_case_chart_columns(conn: sqlite3.Connection) -> None:
+    """Add the parsed chart columns to older databases, backfill them and index them."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(cases)")}
+    for column in CHART_CODE_COLUMNS:
+        if column not in columns:
+            conn.execute(f"ALTER TABLE cases ADD COLUMN {column} INTEGER")
+
+    assignments = ", ".join(f"{column} = ?" for column in CHART_CODE_COLUMNS)
+    rows = conn.execute("SELECT id, chart FROM cases WHERE chart IS NOT NULL AND chart != ''").fetchall()
+    conn.executemany(
+        f"UPDATE cases SET {assignments} WHERE id = ?",
+        [chart_codes(chart) + (case_id,) for case_id, chart in rows],
+    )
+    for sql in CASE_CHART_INDEXES:
+        conn.execute(sql)
+
+
+# 지지만 주어진 조건 (day="亥") 은 (stem, branch) 인덱스의 선두 열이 아니므로 따로 인덱스를 둔다
+CASE_BRANCH_INDEXES = tuple(
+    f"CREATE INDEX IF NOT EXISTS idx_cases_{position}_branch ON cases({position}_branch)"
+    for position in PILLAR_POSITIONS
+)
+
+
+def _migrate_case_branch_indexes(conn: sqlite3.Connection) -> None:
+    """Index each pillar's branch on its own so lone-branch lookups are seeks."""
+    for sql in CASE_BRANCH_INDEXES:
+        conn.execute(sql)
+
+
+def _refresh_rule_predicates(conn: sqlite3.Connection) -> int:
+    """Compile the conditions of rules stored without a current-version predicate."""
+    rows = conn.execute(
+        "SELECT id, title, example FROM rules WHERE predicate_version != ?", (COMPILER_VERSION,)
+    ).fetchall()
+    conn.executemany(
+        "UPDATE rules SET predicate = ?, predicate_version = ? WHERE id = ?",
+        [
+            (predicate_to_json(compile_rule(title, example)), COMPILER_VERSION, rule_id)
+            for rule_id, title, example in rows
+        ],
+    )
+    return len(rows)
+
+
+def _migrate_rule_predicates(conn: sqlite3.Connection) -> None:
+    """Add the compiled condition columns to older databases and fill them."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(rules)")}
+    if "predicate" not in columns:
+        conn.execute("ALTER TABLE rules ADD COLUMN predicate TEXT")
+    if "predicate_version" not in columns:
+        conn.execute("ALTER TABLE rules ADD COLUMN predicate_version INTEGER NOT NULL DEFAULT 0")
+    _refresh_rule_predicates(conn)
+
+
+# PRAGMA user_version 으로 적용 여부를 기록하는 순차 마이그레이션 (인덱스 + 1 = 버전)
+MIGRATIONS = [
+    _migrate_label_tables,
+    _migrate_related_case_counts,
+    _migrate_case_chart_columns,
+    _migrate_rule_predicates,
+    _migrate_case_branch_indexes,
+]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> None:
+    """Bring a DB whose schema script has already run up to the current ``MIGRATIONS`` version."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for target_version, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        migration(conn)
+        conn.execute(f"PRAGMA user_version = {target_version}")
+    if version < len(MIGRATIONS):
+        bump_data_version(conn, *VERSION_SCOPES)
+    elif _refresh_rule_predicates(conn):
+        # COMPILER_VERSION 이 올라가 저장된 술어를 다시 컴파일한 경우
+        bump_data_version(conn, "rules")
+    conn.commit()
+
+
 def init_db(path: str) -> None:
     os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
     schema_sql = _load_schema_sql()
 
-    with sqlite3.connect(path) as conn:
+    with connect(path) as conn:
+        # 빈 새 DB 에만 설정한다 (기존 DB 는 db_maintenance.enable_incremental_vacuum 으로 전환).
+        # 매번 설정하면 헤더가 다시 쓰여 mtime 이 바뀌고, 스냅샷·data_versions 캐시가 무효가 된다
+        if conn.execute("PRAGMA page_count").fetchone()[0] == 0:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
         conn.executescript(schema_sql)
         conn.commit()
+        apply_migrations(conn)
         _bootstrap_sample_data(conn)
 
 
@@ -114,20 +431,26 @@ def insert_rule(
         rule.get("example"),
         rule.get("source"),
     )
+    # 조건 문장은 저장할 때 한 번만 술어 트리로 컴파일한다
+    payload += (predicate_to_json(compile_rule(payload[1], payload[4])), COMPILER_VERSION)
 
     rule_id = rule.get("id")
     if rule_id is not None:
         conn.execute(
             """
-            INSERT INTO rules (id, category, title, content, keywords, example, source)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO rules (
+                id, category, title, content, keywords, example, source, predicate, predicate_version
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(id) DO UPDATE SET
                 category=excluded.category,
                 title=excluded.title,
                 content=excluded.content,
                 keywords=excluded.keywords,
                 example=excluded.example,
-                source=excluded.source
+                source=excluded.source,
+                predicate=excluded.predicate,
+                predicate_version=excluded.predicate_version
             """,
             (rule_id,) + payload,
         )
@@ -135,13 +458,16 @@ def insert_rule(
     else:
         cursor = conn.execute(
             """
-            INSERT INTO rules (category, title, content, keywords, example, source)
-            VALUES (?, ?, ?, ?, ?, ?)
+            INSERT INTO rules (category, title, content, keywords, example, source, predicate, predicate_version)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """,
             payload,
         )
         inserted_id = int(cursor.lastrowid)
 
+    _replace_rule_keywords(conn, inserted_id, _split_labels(rule.get("keywords")))
+    bump_data_version(conn, "rules")
+
     if auto_commit:
         conn.commit()
     return inserted_id
@@ -185,11 +511,19 @@ def insert_term(
         )
         inserted_id = int(cursor.lastrowid)
 
+    bump_data_version(conn, "terms")
+
     if auto_commit:
         conn.commit()
     return inserted_id
 
 
+# insert_case 가 쓰는 사례 컬럼 (chart 파싱 결과 포함)
+CASE_COLUMNS = ("title", "chart", "summary", "content", "tags", "source") + CHART_CODE_COLUMNS
+CASE_INSERT_COLUMNS = ", ".join(CASE_COLUMNS)
+CASE_INSERT_PLACEHOLDERS = ", ".join("?" for _ in CASE_COLUMNS)
+
+
 def insert_case(
     conn: sqlite3.Connection,
     case: Dict[str, object],
@@ -204,31 +538,23 @@ def insert_case(
         case.get("content"),
         tags_value,
         case.get("source"),
-    )
+    ) + chart_codes(case.get("chart"))
 
     case_id = case.get("id")
     if case_id is not None:
         conn.execute(
-            """
-            INSERT INTO cases (id, title, chart, summary, content, tags, source)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            f"""
+            INSERT INTO cases (id, {CASE_INSERT_COLUMNS})
+            VALUES (?, {CASE_INSERT_PLACEHOLDERS})
             ON CONFLICT(id) DO UPDATE SET
-                title=excluded.title,
-                chart=excluded.chart,
-                summary=excluded.summary,
-                content=excluded.content,
-                tags=excluded.tags,
-                source=excluded.source
+                {", ".join(f"{column}=excluded.{column}" for column in CASE_COLUMNS)}
             """,
             (case_id,) + payload,
         )
         inserted_id = int(case_id)
     else:
         cursor = conn.execute(
-            """
-            INSERT INTO cases (title, chart, summary, content, tags, source)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
+            f"INSERT INTO cases ({CASE_INSERT_COLUMNS}) VALUES ({CASE_INSERT_PLACEHOLDERS})",
             payload,
         )
         inserted_id = int(cursor.lastrowid)
@@ -236,62 +562,92 @@ def insert_case(
     # 관계 테이블 갱신
     conn.execute("DELETE FROM case_rule_link WHERE case_id = ?", (inserted_id,))
     conn.execute("DELETE FROM case_term_link WHERE case_id = ?", (inserted_id,))
+    _replace_case_tags(conn, inserted_id, _split_labels(case.get("tags")))
 
+    # 존재하지 않는 규칙/용어 ID 는 외래 키 오류 대신 조용히 건너뛴다
     for rule_id in _extract_link_ids(case.get("linked_rules")):
         conn.execute(
-            "INSERT INTO case_rule_link (case_id, rule_id) VALUES (?, ?)",
+            "INSERT INTO case_rule_link (case_id, rule_id) SELECT ?, id FROM rules WHERE id = ?",
             (inserted_id, rule_id),
         )
 
     for term_id in _extract_link_ids(case.get("linked_terms")):
         conn.execute(
-            "INSERT INTO case_term_link (case_id, term_id) VALUES (?, ?)",
+            "INSERT INTO case_term_link (case_id, term_id) SELECT ?, id FROM terms WHERE id = ?",
             (inserted_id, term_id),
         )
+    bump_data_version(conn, "cases", "links")
 
     if auto_commit:
         conn.commit()
     return inserted_id
 
 
-def fetch_rules(path: str) -> List[Dict[str, object]]:
-    conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row
-    try:
+def fetch_rules(path: str, keyword_filter: str = "") -> List[Dict[str, object]]:
+    with read_connection(path) as conn:
+        conn.row_factory = sqlite3.Row
+        where_clause = ""
+        params: List[str] = []
+        if keyword_filter:
+            where_clause = "WHERE r.id IN (SELECT rule_id FROM rule_keyword WHERE keyword = ?)"
+            params.append(keyword_filter)
+
         cur = conn.cursor()
         cur.execute(
-            """
-            SELECT r.*, COUNT(cr.case_id) AS related_case_count
+            f"""
+            SELECT r.*
             FROM rules r
-            LEFT JOIN case_rule_link cr ON r.id = cr.rule_id
-            GROUP BY r.id
+            {where_clause}
             ORDER BY r.id DESC
-            """
+            """,
+            params,
         )
         rows = [dict(row) for row in cur.fetchall()]
         return rows
-    finally:
-        conn.close()
+
+
+def fetch_rule_predicates(path: str) -> List[Tuple[int, Optional[Predicate]]]:
+    """``(rule_id, predicate)`` for every rule; stale stored forms are recompiled in memory."""
+    with read_connection(path) as conn:
+        rows = conn.execute(
+            "SELECT id, title, example, predicate, predicate_version FROM rules ORDER BY id"
+        ).fetchall()
+    return [
+        (
+            rule_id,
+            predicate_from_json(predicate) if version == COMPILER_VERSION else compile_rule(title, example),
+        )
+        for rule_id, title, example, predicate, version in rows
+    ]
 
 
 def fetch_terms(path: str) -> List[Dict[str, object]]:
-    conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row
-    try:
+    with read_connection(path) as conn:
+        conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         cur.execute(
             """
-            SELECT t.*, COUNT(ct.case_id) AS related_case_count
+            SELECT t.*
             FROM terms t
-            LEFT JOIN case_term_link ct ON t.id = ct.term_id
-            GROUP BY t.id
             ORDER BY t.id DESC
             """
         )
         rows = [dict(row) for row in cur.fetchall()]
         return rows
-    finally:
-        conn.close()
+
+
+def _fetch_case_links(
+    conn: sqlite3.Connection,
+    sql: str,
+    case_filter: str,
+    params: Sequence[str],
+) -> Dict[int, List[str]]:
+    """Group ``(case_id, label)`` rows from one link table by case, keeping the first occurrence order."""
+    grouped: Dict[int, Dict[str, None]] = {}
+    for case_id, label in conn.execute(sql.format(case_filter=case_filter), params):
+        if label:
+            grouped.setdefault(case_id, {})[label] = None
+    return {case_id: list(labels) for case_id, labels in grouped.items()}
 
 
 def fetch_cases(
@@ -299,64 +655,191 @@ def fetch_cases(
     keyword: str = "",
     tag_filter: str = "전체",
 ) -> List[Dict[str, object]]:
-    conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row
-    try:
-        base_query = [
-            "SELECT",
-            "    c.*,",
-            "    GROUP_CONCAT(r.title, '||') AS related_rule_titles,",
-            "    GROUP_CONCAT(t.term, '||') AS related_terms",
-            "FROM cases c",
-            "LEFT JOIN case_rule_link cr ON c.id = cr.case_id",
-            "LEFT JOIN rules r ON cr.rule_id = r.id",
-            "LEFT JOIN case_term_link ct ON c.id = ct.case_id",
-            "LEFT JOIN terms t ON ct.term_id = t.id",
-            "WHERE 1=1",
-        ]
-
+    with read_connection(path) as conn:
+        conn.row_factory = sqlite3.Row
+        conditions: List[str] = []
         params: List[str] = []
 
         if keyword:
-            base_query.append(
-                "AND (c.title LIKE ? OR c.summary LIKE ? OR c.tags LIKE ? OR r.title LIKE ? OR t.term LIKE ?)"
+            conditions.append(
+                "(c.title LIKE ? OR c.summary LIKE ? OR c.tags LIKE ?"
+                " OR EXISTS (SELECT 1 FROM case_rule_link cr JOIN rules r ON cr.rule_id = r.id"
+                " WHERE cr.case_id = c.id AND r.title LIKE ?)"
+                " OR EXISTS (SELECT 1 FROM case_term_link ct JOIN terms t ON ct.term_id = t.id"
+                " WHERE ct.case_id = c.id AND t.term LIKE ?))"
             )
             keyword_like = f"%{keyword}%"
             params.extend([keyword_like, keyword_like, keyword_like, keyword_like, keyword_like])
 
         if tag_filter != "전체":
-            base_query.append("AND c.tags LIKE ?")
-            params.append(f"%{tag_filter}%")
+            conditions.append("c.id IN (SELECT case_id FROM case_tag WHERE tag = ?)")
+            params.append(tag_filter)
 
-        base_query.extend(["GROUP BY c.id", "ORDER BY c.id DESC"])
+        case_filter = " AND ".join(conditions) or "1=1"
 
-        sql = "\n".join(base_query)
-        cur = conn.cursor()
-        cur.execute(sql, params)
+        # 규칙·용어 목록은 링크 테이블별로 따로 모아 R×T 조인 팬아웃을 피한다
+        rows = conn.execute(
+            f"SELECT c.* FROM cases c WHERE {case_filter} ORDER BY c.id DESC",
+            params,
+        ).fetchall()
+        if not rows:
+            return []
+
+        related_rules = _fetch_case_links(
+            conn,
+            """
+            SELECT cr.case_id, r.title
+            FROM case_rule_link cr
+            JOIN rules r ON cr.rule_id = r.id
+            WHERE cr.case_id IN (SELECT c.id FROM cases c WHERE {case_filter})
+            ORDER BY cr.case_id, cr.rule_id
+            """,
+            case_filter,
+            params,
+        )
+        related_terms = _fetch_case_links(
+            conn,
+            """
+            SELECT ct.case_id, t.term
+            FROM case_term_link ct
+            JOIN terms t ON ct.term_id = t.id
+            WHERE ct.case_id IN (SELECT c.id FROM cases c WHERE {case_filter})
+            ORDER BY ct.case_id, ct.term_id
+            """,
+            case_filter,
+            params,
+        )
 
         results: List[Dict[str, object]] = []
-        for row in cur.fetchall():
+        for row in rows:
             record = dict(row)
-            related_rules = record.pop("related_rule_titles", "") or ""
-            related_terms = record.pop("related_terms", "") or ""
-
-            record["related_rules"] = list(
-                dict.fromkeys(value for value in related_rules.split("||") if value)
-            )
-            record["related_terms"] = list(
-                dict.fromkeys(value for value in related_terms.split("||") if value)
-            )
+            record["related_rules"] = related_rules.get(record["id"], [])
+            record["related_terms"] = related_terms.get(record["id"], [])
             results.append(record)
 
         return results
+
+
+def fetch_cases_by_chart(
+    path: str,
+    *,
+    hour: str = "",
+    day: str = "",
+    month: str = "",
+    year: str = "",
+    branches: str = "",
+) -> List[Dict[str, object]]:
+    """Cases matching structured chart conditions, answered from the pillar indexes.
+
+    Each position takes a full pillar (``day="戊戌"``) or a lone stem or
+    branch (``day="戊"``, ``day="亥"``), served from the ``(stem, branch)``
+    and ``branch`` indexes of that pillar; ``branches`` lists branches the
+    chart must all contain (``branches="午卯"``).
+    """
+    conditions: List[str] = []
+    params: List[int] = []
+    for position, value in zip(PILLAR_POSITIONS, (hour, day, month, year)):
+        for char in "".join(value.split()):
+            if char in STEMS:
+                conditions.append(f"{position}_stem = ?")
+                params.append(STEMS.index(char))
+            elif char in BRANCHES:
+                conditions.append(f"{position}_branch = ?")
+                params.append(BRANCHES.index(char))
+            else:
+                raise ValueError(f"간지 형식 오류: {value!r}")
+
+    required = branch_mask("".join(branches.split()))
+    if required:
+        masks = branch_mask_supersets(required)
+        if not masks:
+            return []
+        conditions.append(f"branch_mask IN ({', '.join('?' for _ in masks)})")
+        params.extend(masks)
+
+    with read_connection(path) as conn:
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(
+            f"""
+            SELECT id, title, chart, summary, tags
+            FROM cases
+            WHERE {" AND ".join(conditions) or "1=1"}
+            ORDER BY id DESC
+            """,
+            params,
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def _fetch_label_counts(path: str, sql: str) -> List[Dict[str, object]]:
+    with read_connection(path) as conn:
+        conn.row_factory = sqlite3.Row
+        return [dict(row) for row in conn.execute(sql).fetchall()]
+
+
+def fetch_tag_counts(path: str) -> List[Dict[str, object]]:
+    """Return ``[{"tag", "case_count"}]`` for the case tag facet, most used first."""
+    return _fetch_label_counts(
+        path,
+        """
+        SELECT tag, COUNT(*) AS case_count
+        FROM case_tag
+        GROUP BY tag
+        ORDER BY case_count DESC, tag
+        """,
+    )
+
+
+def fetch_keyword_counts(path: str) -> List[Dict[str, object]]:
+    """Return ``[{"keyword", "rule_count"}]`` for the rule keyword facet, most used first."""
+    return _fetch_label_counts(
+        path,
+        """
+        SELECT keyword, COUNT(*) AS rule_count
+        FROM rule_keyword
+        GROUP BY keyword
+        ORDER BY rule_count DESC, keyword
+        """,
+    )
+
+
+def check_related_case_counts(path: str) -> List[Dict[str, object]]:
+    """Return rows whose stored related_case_count disagrees with the link tables."""
+    with read_connection(path) as conn:
+        conn.row_factory = sqlite3.Row
+        mismatches: List[Dict[str, object]] = []
+        for table, link_table, link_column in RELATED_COUNT_TARGETS:
+            rows = conn.execute(
+                f"""
+                SELECT '{table}' AS table_name, x.id, x.related_case_count AS stored_count,
+                       COUNT(link.case_id) AS actual_count
+                FROM {table} x
+                LEFT JOIN {link_table} link ON link.{link_column} = x.id
+                GROUP BY x.id
+                HAVING stored_count != actual_count
+                """
+            ).fetchall()
+            mismatches.extend(dict(row) for row in rows)
+        return mismatches
+
+
+def rebuild_related_case_counts(path: str) -> None:
+    """Recompute every stored related_case_count from the link tables."""
+    conn = connect(path)
+    try:
+        _rebuild_related_case_counts(conn)
+        bump_data_version(conn, "links")
+        conn.commit()
     finally:
         conn.close()
 
 
 def delete_case(path: str, case_id: int) -> None:
-    conn = sqlite3.connect(path)
+    conn = connect(path)
     try:
+        # 링크·태그 행은 ON DELETE CASCADE 로 함께 삭제된다
         conn.execute("DELETE FROM cases WHERE id = ?", (case_id,))
+        bump_data_version(conn, "cases", "links")
         conn.commit()
     finally:
         conn.close()
@@ -400,12 +883,26 @@ def _bootstrap_sample_data(conn: sqlite3.Connection) -> None:
 
 
 __all__ = [
+    "connect",
+    "connect_readonly",
+    "share_immutable",
+    "read_connection",
+    "VERSION_SCOPES",
+    "bump_data_version",
+    "fetch_data_versions",
     "init_db",
+    "apply_migrations",
     "insert_rule",
     "insert_term",
     "insert_case",
     "fetch_rules",
+    "fetch_rule_predicates",
     "fetch_terms",
     "fetch_cases",
+    "fetch_cases_by_chart",
+    "fetch_tag_counts",
+    "fetch_keyword_counts",
+    "check_related_case_counts",
+    "rebuild_related_case_counts",
     "delete_case",
 ]
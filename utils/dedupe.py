@@ -0,0 +1,290 @@
+import random
+import re
+import sqlite3
+import zlib
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+from utils.db_manager_v2 import connect_readonly, read_connection
+
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+BANDS = 16  # 16 밴드 × 4 행 → 유사도 약 0.5 부터 후보로 잡힌다
+DEFAULT_THRESHOLD = 0.8
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+_NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+# 종류별로 비교할 필드 — 추출 결과(condition/result)와 DB 행(title/content)을 모두 받는다
+TEXT_FIELDS: Dict[str, Tuple[Tuple[str, ...], ...]] = {
+    "rules": (("title", "condition"), ("content", "result")),
+    "terms": (("term", "name"), ("definition",)),
+    "cases": (("title",), ("chart",), ("content", "summary")),
+}
+
+_rng = random.Random(20240611)
+PERMUTATIONS: Tuple[Tuple[int, int], ...] = tuple(
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME)) for _ in range(NUM_PERM)
+)
+
+Signature = Tuple[int, ...]
+
+
+def normalize_text(text: str) -> str:
+    """Case-fold and drop whitespace/punctuation so rephrasings differ only in wording."""
+    return _NON_WORD_PATTERN.sub("", text).casefold()
+
+
+def record_text(kind: str, record: Dict[str, Any]) -> str:
+    parts = []
+    for candidates in TEXT_FIELDS[kind]:
+        for field in candidates:
+            value = record.get(field)
+            if value:
+                parts.append(str(value))
+                break
+    return normalize_text(" ".join(parts))
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Character ``size``-grams hashed to 32 bits (the whole text if it is shorter)."""
+    if len(text) <= size:
+        return {zlib.crc32(text.encode("utf-8"))} if text else set()
+    return {zlib.crc32(text[i: i + size].encode("utf-8")) for i in range(len(text) - size + 1)}
+
+
+def minhash(text: str) -> Optional[Signature]:
+    """MinHash signature of ``text``'s shingle set, or ``None`` for empty text."""
+    hashed = shingles(text)
+    if not hashed:
+        return None
+    return tuple(
+        min((a * value + b) % MERSENNE_PRIME for value in hashed) & MAX_HASH for a, b in PERMUTATIONS
+    )
+
+
+def estimate_similarity(left: Signature, right: Signature) -> float:
+    """Estimated Jaccard similarity: fraction of agreeing signature slots."""
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+class MinHashLSH:
+    """Banded LSH over MinHash signatures.
+
+    Each signature is split into ``bands`` slices; two records become
+    candidates when any slice matches exactly, so a query only touches the
+    buckets it hashes into instead of every stored record. Candidates are
+    then confirmed against ``threshold`` with the full signature.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, bands: int = BANDS) -> None:
+        if NUM_PERM % bands:
+            raise ValueError(f"bands({bands}) 는 NUM_PERM({NUM_PERM}) 의 약수여야 합니다")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self._buckets: List[Dict[Signature, List[Hashable]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[Hashable, Signature] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _slices(self, signature: Signature) -> Iterator[Tuple[int, Signature]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows: (band + 1) * self.rows]
+
+    def copy(self) -> "MinHashLSH":
+        clone = MinHashLSH(self.threshold, self.bands)
+        clone._buckets = [{band_slice: list(keys) for band_slice, keys in bucket.items()} for bucket in self._buckets]
+        clone._signatures = dict(self._signatures)
+        return clone
+
+    def add(self, key: Hashable, signature: Signature) -> None:
+        self._signatures[key] = signature
+        for band, band_slice in self._slices(signature):
+            self._buckets[band].setdefault(band_slice, []).append(key)
+
+    def query(self, signature: Signature) -> List[Tuple[Hashable, float]]:
+        """Stored keys whose estimated similarity reaches the threshold, best first."""
+        candidates = set()
+        for band, band_slice in self._slices(signature):
+            candidates.update(self._buckets[band].get(band_slice, ()))
+
+        matches = []
+        for key in candidates:
+            similarity = estimate_similarity(signature, self._signatures[key])
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda match: -match[1])
+        return matches
+
+
+class NearDuplicateIndex:
+    """One LSH index per record kind (rules / terms / cases)."""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD) -> None:
+        self.threshold = threshold
+        self._indexes = {kind: MinHashLSH(threshold) for kind in TEXT_FIELDS}
+        # 종류별로 마지막에 읽은 DB 행 (행 수, 최대 id) — update_index_from_db 가 이어서 읽는다
+        self.synced: Dict[str, Tuple[int, int]] = {}
+
+    def copy(self) -> "NearDuplicateIndex":
+        clone = NearDuplicateIndex(self.threshold)
+        clone._indexes = {kind: lsh.copy() for kind, lsh in self._indexes.items()}
+        clone.synced = dict(self.synced)
+        return clone
+
+    def add(self, kind: str, key: Hashable, record: Dict[str, Any]) -> None:
+        signature = minhash(record_text(kind, record))
+        if signature is not None:
+            self._indexes[kind].add(key, signature)
+
+    def add_signature(self, kind: str, key: Hashable, signature: Signature) -> None:
+        self._indexes[kind].add(key, signature)
+
+    def best_match(self, kind: str, signature: Signature) -> Optional[Tuple[Hashable, float]]:
+        """Best indexed near-duplicate of ``signature`` without modifying the index."""
+        matches = self._indexes[kind].query(signature)
+        return matches[0] if matches else None
+
+    def check(self, kind: str, key: Hashable, record: Dict[str, Any]) -> Optional[Tuple[Hashable, float]]:
+        """Return the best existing near-duplicate of ``record``; otherwise index it and return ``None``."""
+        signature = minhash(record_text(kind, record))
+        if signature is None:
+            return None
+        matches = self._indexes[kind].query(signature)
+        if matches:
+            return matches[0]
+        self._indexes[kind].add(key, signature)
+        return None
+
+
+def _iter_db_records(conn: sqlite3.Connection, kind: str, after_id: int = 0) -> Iterator[Dict[str, Any]]:
+    columns = ["id"] + [field for candidates in TEXT_FIELDS[kind] for field in candidates]
+    available = {row[1] for row in conn.execute(f"PRAGMA table_info({kind})")}
+    selected = [column for column in columns if column in available]
+    for row in conn.execute(f"SELECT {', '.join(selected)} FROM {kind} WHERE id > ? ORDER BY id", (after_id,)):
+        yield dict(zip(selected, row))
+
+
+def update_index_from_db(index: NearDuplicateIndex, path: str) -> NearDuplicateIndex:
+    """Copy of ``index`` brought up to date with the stored rules, terms and cases.
+
+    Only rows added since the last update (``id`` above the last one seen)
+    are hashed; a kind whose row count shows deletions is re-read in full.
+    Rows edited in place keep their old signature until that happens. The
+    given index is left unchanged, so readers holding it are never disturbed.
+    """
+    updated = index.copy()
+    with read_connection(path) as conn:
+        for kind in TEXT_FIELDS:
+            count, max_id = conn.execute(f"SELECT COUNT(*), COALESCE(MAX(id), 0) FROM {kind}").fetchone()
+            seen_count, seen_max = updated.synced.get(kind, (0, 0))
+            if (count, max_id) == (seen_count, seen_max):
+                continue
+            new_rows = conn.execute(f"SELECT COUNT(*) FROM {kind} WHERE id > ?", (seen_max,)).fetchone()[0]
+            if seen_count + new_rows != count:
+                # 행이 지워졌으면 이 종류만 처음부터 다시 읽는다
+                updated._indexes[kind] = MinHashLSH(updated.threshold)
+                seen_max = 0
+            for record in _iter_db_records(conn, kind, seen_max):
+                updated.add(kind, (kind, record["id"]), record)
+            updated.synced[kind] = (count, max_id)
+    return updated
+
+
+def index_from_db(path: str, threshold: float = DEFAULT_THRESHOLD) -> NearDuplicateIndex:
+    """Seed an index with every stored rule, term and case, keyed ``(kind, id)``."""
+    return update_index_from_db(NearDuplicateIndex(threshold), path)
+
+
+def filter_near_duplicates(
+    payload: Dict[str, List[Dict[str, Any]]],
+    index: Optional[NearDuplicateIndex] = None,
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> Tuple[Dict[str, List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """Drop extracted records that nearly duplicate an indexed or earlier record.
+
+    Returns the filtered payload and one report row per dropped record. Pass an
+    index from :func:`index_from_db` to also compare against the stored DB;
+    it is only read (new records go into a per-call index), so one cached
+    index can serve every ingest until the DB changes.
+    """
+    batch = NearDuplicateIndex(index.threshold if index is not None else threshold)
+    kept: Dict[str, List[Dict[str, Any]]] = {}
+    duplicates: List[Dict[str, Any]] = []
+    for kind, records in payload.items():
+        if kind not in TEXT_FIELDS:
+            kept[kind] = records
+            continue
+        kept[kind] = []
+        for position, record in enumerate(records):
+            signature = minhash(record_text(kind, record))
+            match = None
+            if signature is not None:
+                if index is not None:
+                    match = index.best_match(kind, signature)
+                if match is None:
+                    match = batch.best_match(kind, signature)
+            if match is None:
+                if signature is not None:
+                    batch.add_signature(kind, ("new", kind, position), signature)
+                kept[kind].append(record)
+                continue
+            (origin, *key), similarity = match
+            duplicates.append(
+                {
+                    "kind": kind,
+                    "record": record,
+                    "duplicate_of": ("신규 " if origin == "new" else "DB ") + f"#{key[-1]}",
+                    "similarity": round(similarity, 3),
+                }
+            )
+    return kept, duplicates
+
+
+def near_duplicate_report(
+    path: str,
+    threshold: float = DEFAULT_THRESHOLD,
+    kinds: Sequence[str] = tuple(TEXT_FIELDS),
+) -> List[Dict[str, Any]]:
+    """List stored rows that nearly duplicate an earlier row (by id) of the same kind."""
+    report: List[Dict[str, Any]] = []
+    conn = connect_readonly(path)
+    try:
+        for kind in kinds:
+            lsh = MinHashLSH(threshold)
+            for record in _iter_db_records(conn, kind):
+                signature = minhash(record_text(kind, record))
+                if signature is None:
+                    continue
+                matches = lsh.query(signature)
+                if matches:
+                    original_id, similarity = matches[0]
+                    report.append(
+                        {
+                            "kind": kind,
+                            "id": record["id"],
+                            "duplicate_of": original_id,
+                            "similarity": round(similarity, 3),
+                        }
+                    )
+                else:
+                    lsh.add(record["id"], signature)
+    finally:
+        conn.close()
+    return report
+
+
+__all__ = [
+    "normalize_text",
+    "minhash",
+    "estimate_similarity",
+    "MinHashLSH",
+    "NearDuplicateIndex",
+    "index_from_db",
+    "update_index_from_db",
+    "filter_near_duplicates",
+    "near_duplicate_report",
+]
@@ -1,7 +1,10 @@
+import io
 import os
 import re
 import zipfile
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Dict, List, Optional, Tuple
 
 import pdfplumber
 from docx import Document
@@ -10,40 +13,69 @@ from docx import Document
 RULE_PATTERN = re.compile(r"(.*?)→(.*?)\n")
 TERM_PATTERN = re.compile(r"([甲乙丙丁戊己庚辛壬癸子丑寅卯辰巳午未申酉戌亥\w]{1,5})[:：]\s*(.+)")
 
+ZIP_MEMBER_SUFFIXES = {".txt", ".md", ".docx", ".pdf"}
+ZIP_MAX_WORKERS = 8
 
-def _read_text_from_file(path: str) -> str:
-    if path.endswith(".txt"):
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read()
-    if path.endswith(".docx"):
-        document = Document(path)
+
+def _read_text_from_stream(stream: IO[bytes], suffix: str) -> str:
+    if suffix in {".txt", ".md"}:
+        return io.TextIOWrapper(stream, encoding="utf-8").read()
+    if suffix == ".docx":
+        document = Document(stream)
         return "\n".join(paragraph.text for paragraph in document.paragraphs)
-    if path.endswith(".pdf"):
+    if suffix == ".pdf":
         text_chunks: List[str] = []
-        with pdfplumber.open(path) as pdf:
+        with pdfplumber.open(stream) as pdf:
             for page in pdf.pages:
                 text_chunks.append(page.extract_text() or "")
         return "\n".join(text_chunks)
-    if path.endswith(".zip"):
-        text_chunks = []
-        with zipfile.ZipFile(path) as zipped:
-            for name in zipped.namelist():
-                if name.endswith(".txt"):
-                    text_chunks.append(zipped.read(name).decode("utf-8"))
-        return "\n".join(text_chunks)
     return ""
 
 
-def extract_rules_and_terms(path: str) -> Dict[str, List[Dict[str, str]]]:
-    text = _read_text_from_file(path)
+def _read_zip_member(path: str, name: str) -> Optional[str]:
+    # 멤버마다 별도 핸들을 열어 스레드에서 병렬로 읽고, 실패한 멤버는 건너뛴다
+    try:
+        with zipfile.ZipFile(path) as zipped, zipped.open(name) as stream:
+            return _read_text_from_stream(stream, Path(name).suffix.lower())
+    except Exception:
+        return None
 
+
+def _read_zip_members(path: str) -> List[Tuple[str, str]]:
+    with zipfile.ZipFile(path) as zipped:
+        names = [
+            info.filename
+            for info in zipped.infolist()
+            if not info.is_dir()
+            and not info.filename.startswith("__MACOSX/")
+            and Path(info.filename).suffix.lower() in ZIP_MEMBER_SUFFIXES
+        ]
+    if not names:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(ZIP_MAX_WORKERS, len(names))) as executor:
+        texts = executor.map(lambda name: _read_zip_member(path, name), names)
+        return [(name, text) for name, text in zip(names, texts) if text]
+
+
+def _read_text_from_file(path: str) -> str:
+    if path.endswith(".zip"):
+        return "\n".join(text for _, text in _read_zip_members(path))
+    suffix = Path(path).suffix.lower()
+    if suffix in ZIP_MEMBER_SUFFIXES:
+        with open(path, "rb") as f:
+            return _read_text_from_stream(f, suffix)
+    return ""
+
+
+def _extract_from_text(text: str, source: str) -> Dict[str, List[Dict[str, str]]]:
     rules = [
         {
             "condition": match[0].strip(),
             "result": match[1].strip(),
             "category": "일반",
             "description": "",
-            "source": os.path.basename(path),
+            "source": source,
         }
         for match in RULE_PATTERN.findall(text)
     ]
@@ -58,3 +90,15 @@ def extract_rules_and_terms(path: str) -> Dict[str, List[Dict[str, str]]]:
     ]
 
     return {"rules": rules, "terms": terms}
+
+
+def extract_rules_and_terms(path: str) -> Dict[str, List[Dict[str, str]]]:
+    if path.endswith(".zip"):
+        payload: Dict[str, List[Dict[str, str]]] = {"rules": [], "terms": []}
+        for name, text in _read_zip_members(path):
+            member_payload = _extract_from_text(text, source=name)
+            payload["rules"].extend(member_payload["rules"])
+            payload["terms"].extend(member_payload["terms"])
+        return payload
+
+    return _extract_from_text(_read_text_from_file(path), source=os.path.basename(path))
@@ -1,37 +1,64 @@
-import json
+import io
+import multiprocessing
 import re
+import shutil
+import tempfile
+import time
 import zipfile
+from collections import deque
 from collections.abc import Iterable as IterableABC
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Sequence
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 import pandas as pd
 import pdfplumber
 from docx import Document
 
+from utils.json_stream import JsonStreamReader
+from utils.records import CaseRecord, RuleRecord, TermRecord
 
-def _read_text(path: str) -> str:
-    """Load textual content from a variety of supported document formats."""
 
-    suffix = Path(path).suffix.lower()
+T = TypeVar("T")
 
-    if suffix in {".txt", ".md"}:
-        with open(path, "r", encoding="utf-8") as file:
-            return file.read()
+TEXT_SUFFIXES = {".txt", ".md"}
+DOCUMENT_SUFFIXES = TEXT_SUFFIXES | {".docx", ".pdf", ".xlsx", ".xls"}
+ZIP_MAX_WORKERS = 8
+FILE_MAX_WORKERS = 4
+# 압축 멤버를 임시 파일로 옮길 때 이 크기까지는 메모리에 둔다
+ZIP_SPOOL_MAX_BYTES = 8 << 20
+
+RULE_ARROW_PATTERN = re.compile(r"([^\n]+?)→([^\n]+)")
+RULE_PHRASE_PATTERN = re.compile("이다|의 작용|작용은|작용을")
+TERM_HEAD_PATTERN = re.compile(r"([比劫財官印傷食祿原神墓庫帶象合沖破刑穿\w]{1,6})[:：]")
+TERM_PHRASE_PATTERN = re.compile("이라 한다|의 의미는")
+CASE_TRIGGER_PATTERN = re.compile(r"^(예|사례|명조)[\s\d#-]*[:：]")
+CASE_HEADER_PATTERN = re.compile(r"(예|사례|명조)[\s\d#-]*[:：]\s*(.*)")
+
+# "rules" / "terms" / "cases" → 슬롯 레코드 목록 (utils.records)
+Payload = Dict[str, List[Any]]
+
+
+def _read_stream(stream: IO[bytes], suffix: str) -> str:
+    """Decode a binary stream according to the document format given by ``suffix``."""
+
+    if suffix in TEXT_SUFFIXES:
+        return io.TextIOWrapper(stream, encoding="utf-8").read()
 
     if suffix == ".docx":
-        document = Document(path)
+        document = Document(stream)
         return "\n".join(paragraph.text for paragraph in document.paragraphs)
 
     if suffix == ".pdf":
-        with pdfplumber.open(path) as pdf:
+        with pdfplumber.open(stream) as pdf:
             return "\n".join(page.extract_text() or "" for page in pdf.pages)
 
     if suffix in {".xlsx", ".xls"}:
         try:
-            sheets = pd.read_excel(path, sheet_name=None, dtype=str)
+            sheets = pd.read_excel(stream, sheet_name=None, dtype=str)
         except ValueError:
-            sheets = pd.read_excel(path, sheet_name=None)
+            stream.seek(0)
+            sheets = pd.read_excel(stream, sheet_name=None)
         content: List[str] = []
         for sheet_name, frame in sheets.items():
             content.append(f"[시트: {sheet_name}]")
@@ -39,236 +66,331 @@ def _read_text(path: str) -> str:
             content.append("\n".join(value for value in text_values if value.strip()))
         return "\n".join(content)
 
+    return ""
+
+
+def _list_zip_members(path: str) -> List[str]:
+    with zipfile.ZipFile(path) as archive:
+        return [
+            info.filename
+            for info in archive.infolist()
+            if not info.is_dir()
+            and not info.filename.startswith("__MACOSX/")
+            and Path(info.filename).suffix.lower() in DOCUMENT_SUFFIXES
+        ]
+
+
+def _read_zip_member(path: str, name: str) -> Optional[str]:
+    """Decode a single archive member with the matching reader.
+
+    Each call opens its own ``ZipFile`` handle so members can be decoded from
+    worker threads. Binary formats (PDF, DOCX, Excel) seek backwards, which a
+    compressed ``ZipExtFile`` can only do by re-inflating from the start, so
+    those members are first copied into a ``SpooledTemporaryFile`` (memory up
+    to ``ZIP_SPOOL_MAX_BYTES``, then disk). A member that cannot be decoded
+    is skipped (``None``).
+    """
+
+    suffix = Path(name).suffix.lower()
+    try:
+        with zipfile.ZipFile(path) as archive, archive.open(name) as stream:
+            if suffix in TEXT_SUFFIXES:
+                return _read_stream(stream, suffix)
+            with tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_BYTES) as spool:
+                shutil.copyfileobj(stream, spool)
+                spool.seek(0)
+                return _read_stream(spool, suffix)
+    except Exception:
+        # 손상된 멤버 하나 때문에 전체 압축 파일 처리를 중단하지 않는다
+        return None
+
+
+def _map_zip_members(
+    path: str,
+    func: Callable[[str, str], Optional[T]],
+    *,
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[str, T]]:
+    """Apply ``func(name, text)`` to every readable member in parallel.
+
+    Results are yielded in archive order. At most ``2 * max_workers`` members
+    are in flight at once, so memory stays bounded for large archives.
+    Members that fail to decode or for which ``func`` returns ``None`` are skipped.
+    """
+
+    names = _list_zip_members(path)
+    if not names:
+        return
+
+    def _process(name: str) -> Optional[T]:
+        text = _read_zip_member(path, name)
+        if not text:
+            return None
+        try:
+            return func(name, text)
+        except Exception:
+            return None
+
+    workers = max(1, min(max_workers or ZIP_MAX_WORKERS, len(names)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: deque = deque()
+        for name in names:
+            pending.append((name, executor.submit(_process, name)))
+            if len(pending) >= workers * 2:
+                done_name, future = pending.popleft()
+                result = future.result()
+                if result is not None:
+                    yield done_name, result
+        while pending:
+            done_name, future = pending.popleft()
+            result = future.result()
+            if result is not None:
+                yield done_name, result
+
+
+def _read_text(path: str) -> str:
+    """Load textual content from a variety of supported document formats."""
+
+    suffix = Path(path).suffix.lower()
+
     if suffix == ".zip":
-        content = []
-        with zipfile.ZipFile(path) as archive:
-            for name in archive.namelist():
-                inner_suffix = Path(name).suffix.lower()
-                if inner_suffix in {".txt", ".md"}:
-                    content.append(archive.read(name).decode("utf-8"))
-        return "\n".join(content)
+        return "\n".join(text for _, text in _map_zip_members(path, lambda _name, text: text))
+
+    if suffix in DOCUMENT_SUFFIXES:
+        with open(path, "rb") as file:
+            return _read_stream(file, suffix)
 
     return ""
 
 
-def _load_structured_json(path: str) -> Dict[str, Iterable]:
+def _iter_section_records(reader: JsonStreamReader, kind: str) -> Iterator[Any]:
+    """Coerce the items of the ``rules``/``terms``/``cases`` array the reader is positioned on."""
+
+    coerce = STRUCTURED_COERCERS[kind]
+    if reader.peek() != "[":
+        reader.value()
+        return
+    for item in reader.iter_array():
+        yield coerce(item)
+
+
+def iter_structured_json(path: str) -> Iterator[Tuple[str, Any]]:
+    """Stream ``(kind, record)`` pairs from a structured ``{"rules", "terms", "cases"}`` export.
+
+    Array items are decoded and coerced one at a time in file order, so memory
+    stays flat however large the file is. Other top-level members are skipped.
+    """
+
     with open(path, "r", encoding="utf-8") as file:
-        data = json.load(file)
-
-    if isinstance(data, dict) and {"rules", "terms", "cases"} & data.keys():
-        rules = list(data.get("rules", []))
-        terms = list(data.get("terms", []))
-        cases = list(data.get("cases", []))
-        return {
-            "rules": rules if isinstance(rules, list) else [],
-            "terms": terms if isinstance(terms, list) else [],
-            "cases": cases if isinstance(cases, list) else [],
-        }
+        reader = JsonStreamReader(file)
+        if reader.peek() != "{":
+            return
+        for key in reader.iter_object():
+            if key in STRUCTURED_COERCERS:
+                for record in _iter_section_records(reader, key):
+                    yield key, record
+            else:
+                reader.value()
+
+
+def _load_structured_json(path: str) -> Dict[str, Any]:
+    """Records of a structured export, or ``{"text": ...}`` for any other JSON document.
+
+    The file is parsed incrementally; only the coerced records (or the text of
+    a non-structured document) are kept.
+    """
 
+    payload: Payload = {"rules": [], "terms": [], "cases": []}
     text_parts: List[str] = []
-    if isinstance(data, dict):
-        for key, value in data.items():
-            text_parts.append(f"{key}: {value}")
-    elif isinstance(data, list):
-        text_parts.extend(str(item) for item in data)
+    structured = False
+    with open(path, "r", encoding="utf-8") as file:
+        reader = JsonStreamReader(file)
+        head = reader.peek()
+        if head == "{":
+            for key in reader.iter_object():
+                if key in STRUCTURED_COERCERS:
+                    structured = True
+                    text_parts = []
+                    payload[key].extend(_iter_section_records(reader, key))
+                    continue
+                value = reader.value()
+                if not structured:
+                    text_parts.append(f"{key}: {value}")
+        elif head == "[":
+            text_parts.extend(str(item) for item in reader.iter_array())
+        else:
+            reader.value()
 
+    if structured:
+        return payload
     return {"text": "\n".join(text_parts)}
 
 
-def _extract_rules_from_text(text: str) -> List[Dict[str, Any]]:
-    rules: List[Dict[str, Any]] = []
+def _phrase_rule(stripped: str) -> RuleRecord:
+    subject = stripped
+    if "의 작용" in stripped:
+        subject = stripped.split("의 작용", 1)[0].strip()
+    elif "작용은" in stripped:
+        subject = stripped.split("작용은", 1)[0].strip()
+    elif "이다" in stripped:
+        subject = stripped.split("이다", 1)[0].strip()
 
-    for condition, result in re.findall(r"([^\n]+?)→([^\n]+)", text):
-        rules.append(
-            {
-                "condition": condition.strip(),
-                "result": result.strip(),
-                "category": "자동추출",
-            }
-        )
+    return RuleRecord(condition=subject, result=stripped, category="자연어")
 
-    for line in text.splitlines():
-        stripped = line.strip()
-        if not stripped or "→" in stripped:
-            continue
-
-        if any(keyword in stripped for keyword in ["이다", "의 작용", "작용은", "작용을"]):
-            subject = stripped
-            if "의 작용" in stripped:
-                subject = stripped.split("의 작용", 1)[0].strip()
-            elif "작용은" in stripped:
-                subject = stripped.split("작용은", 1)[0].strip()
-            elif "이다" in stripped:
-                subject = stripped.split("이다", 1)[0].strip()
-
-            rules.append(
-                {
-                    "condition": subject,
-                    "result": stripped,
-                    "category": "자연어",
-                }
-            )
-
-    return rules
-
-
-def _extract_terms_from_text(text: str) -> List[Dict[str, Any]]:
-    terms: List[Dict[str, Any]] = []
-
-    for term, definition in re.findall(
-        r"([比劫財官印傷食祿原神墓庫帶象合沖破刑穿\w]{1,6})[:：]\s*([^\n]+)",
-        text,
-    ):
-        terms.append(
-            {
-                "term": term.strip(),
-                "definition": definition.strip(),
-                "category": "용어",
-            }
-        )
 
-    for line in text.splitlines():
-        stripped = line.strip()
-        if not stripped or any(marker in stripped for marker in [":", "："]):
-            continue
+def _phrase_term(stripped: str) -> Optional[TermRecord]:
+    if "이라 한다" in stripped:
+        term_part, definition_part = stripped.split("이라 한다", 1)
+    else:
+        term_part, definition_part = stripped.split("의 의미는", 1)
 
-        if "이라 한다" in stripped or "의 의미는" in stripped:
-            if "이라 한다" in stripped:
-                term_part, definition_part = stripped.split("이라 한다", 1)
-            else:
-                term_part, definition_part = stripped.split("의 의미는", 1)
-
-            term = term_part.strip().rstrip("는은이")
-            definition = definition_part.strip().lstrip("는은이").strip()
-
-            if term:
-                terms.append(
-                    {
-                        "term": term,
-                        "definition": definition or stripped,
-                        "category": "자연어",
-                    }
-                )
+    term = term_part.strip().rstrip("는은이")
+    definition = definition_part.strip().lstrip("는은이").strip()
+    if not term:
+        return None
 
-    return terms
+    return TermRecord(term=term, definition=definition or stripped, category="자연어")
 
 
-def _collect_case_block(lines: Sequence[str], start_index: int) -> Dict[str, Any]:
-    header = lines[start_index].strip()
-    match = re.match(r"(예|사례|명조)[\s\d#-]*[:：]\s*(.*)", header)
+def _build_case(header: str, content_lines: List[str], counter: int) -> CaseRecord:
+    match = CASE_HEADER_PATTERN.match(header)
     title = match.group(2).strip() if match and match.group(2).strip() else header
+    title = title or f"사례 {counter}"
 
-    content_lines: List[str] = []
-    index = start_index + 1
-    while index < len(lines) and lines[index].strip():
-        content_lines.append(lines[index])
-        index += 1
+    content = "\n".join(content_lines).strip()
+    summary = content.split("\n", 1)[0][:120] if content else ""
 
-    return {
-        "title": title,
-        "content_lines": content_lines,
-        "next_index": index,
-    }
+    return CaseRecord(title=title, chart="", summary=summary or title, content=content or title)
+
+
+def _scan_lines(lines: Iterable[str]) -> Payload:
+    """Extract rules, terms and cases from ``lines`` in a single pass.
+
+    ``lines`` is any iterable of ``"\\n"``-terminated chunks, such as an open
+    text file or ``io.StringIO(text, newline="\\n")``, so documents can be
+    scanned without materialising the whole text. The output matches running
+    the rule, term and case extractors separately over the joined text.
+    """
+
+    arrow_rules: List[RuleRecord] = []
+    phrase_rules: List[RuleRecord] = []
+    colon_terms: List[TermRecord] = []
+    phrase_terms: List[TermRecord] = []
+    cases: List[CaseRecord] = []
 
+    # "용어:" 뒤가 비어 있으면 정의는 다음 비어 있지 않은 줄에서 이어진다
+    pending_term: Optional[str] = None
+    pending_has_text = False
+    case_header: Optional[str] = None
+    case_lines: List[str] = []
 
-def _extract_cases_from_text(text: str) -> List[Dict[str, Any]]:
-    lines = text.splitlines()
-    cases: List[Dict[str, Any]] = []
-    index = 0
-    counter = 1
-
-    trigger_pattern = re.compile(r"^(예|사례|명조)[\s\d#-]*[:：]")
-
-    while index < len(lines):
-        line = lines[index].strip()
-        if not line:
-            index += 1
-            continue
-
-        if trigger_pattern.match(line):
-            block = _collect_case_block(lines, index)
-            content = "\n".join(block["content_lines"]).strip()
-            title = block["title"] or f"사례 {counter}"
-            summary = content.split("\n", 1)[0][:120] if content else ""
-
-            cases.append(
-                {
-                    "title": title,
-                    "chart": "",
-                    "summary": summary or title,
-                    "content": content or title,
-                    "tags": [],
-                }
-            )
-
-            index = block["next_index"] + 1
-            counter += 1
+    for chunk in lines:
+        segment = chunk[:-1] if chunk.endswith("\n") else chunk
+
+        if "→" in segment:
+            arrow = RULE_ARROW_PATTERN.search(segment)
+            if arrow:
+                arrow_rules.append(
+                    RuleRecord(condition=arrow.group(1).strip(), result=arrow.group(2).strip(), category="자동추출")
+                )
+
+        if pending_term is not None:
+            definition = segment.strip()
+            if definition:
+                colon_terms.append(TermRecord(term=pending_term, definition=definition, category="용어"))
+                pending_term = None
+            elif segment:
+                pending_has_text = True
         else:
-            index += 1
+            head = TERM_HEAD_PATTERN.search(segment)
+            if head:
+                remainder = segment[head.end():]
+                definition = remainder.strip()
+                if definition:
+                    colon_terms.append(TermRecord(term=head.group(1).strip(), definition=definition, category="용어"))
+                else:
+                    pending_term = head.group(1).strip()
+                    pending_has_text = bool(remainder)
+
+        for line in chunk.splitlines():
+            stripped = line.strip()
+
+            if case_header is not None:
+                if stripped:
+                    case_lines.append(line)
+                else:
+                    cases.append(_build_case(case_header, case_lines, len(cases) + 1))
+                    case_header = None
+            elif stripped and CASE_TRIGGER_PATTERN.match(stripped):
+                case_header = stripped
+                case_lines = []
+
+            if not stripped:
+                continue
+
+            if "→" not in stripped and RULE_PHRASE_PATTERN.search(stripped):
+                phrase_rules.append(_phrase_rule(stripped))
+
+            if ":" not in stripped and "：" not in stripped and TERM_PHRASE_PATTERN.search(stripped):
+                term = _phrase_term(stripped)
+                if term:
+                    phrase_terms.append(term)
+
+    if pending_term is not None and pending_has_text:
+        colon_terms.append(TermRecord(term=pending_term, definition="", category="용어"))
+    if case_header is not None:
+        cases.append(_build_case(case_header, case_lines, len(cases) + 1))
 
-    return cases
+    return {
+        "rules": arrow_rules + phrase_rules,
+        "terms": colon_terms + phrase_terms,
+        "cases": cases,
+    }
 
 
-def _annotate_links(
-    rules: List[Dict[str, Any]],
-    terms: List[Dict[str, Any]],
-    cases: List[Dict[str, Any]],
-) -> None:
-    term_names = [term.get("term", "") for term in terms]
+def _iter_text_lines(text: str) -> Iterator[str]:
+    return iter(io.StringIO(text, newline="\n"))
+
+
+def _annotate_links(rules: List[RuleRecord], terms: List[TermRecord], cases: List[CaseRecord]) -> None:
+    term_names = [term.term for term in terms]
 
     for rule in rules:
-        text = " ".join(filter(None, [rule.get("condition"), rule.get("result")]))
+        text = " ".join(filter(None, [rule.condition, rule.result]))
         linked_terms = [name for name in term_names if name and name in text]
         if linked_terms:
-            rule["linked_terms"] = linked_terms
+            rule.linked_terms = linked_terms
 
-    rule_titles = [rule.get("condition", "") for rule in rules]
+    rule_titles = [rule.condition for rule in rules]
 
     for term in terms:
-        definition_text = term.get("definition", "")
-        linked_rules = [title for title in rule_titles if title and title in definition_text]
+        linked_rules = [title for title in rule_titles if title and title in term.definition]
         if linked_rules:
-            term["linked_rules"] = linked_rules
+            term.linked_rules = linked_rules
 
     for case in cases:
-        content_text = case.get("content", "")
-        linked_terms = [name for name in term_names if name and name in content_text]
+        linked_terms = [name for name in term_names if name and name in case.content]
         if linked_terms:
-            case["linked_terms"] = linked_terms
+            case.linked_terms = linked_terms
 
-        linked_rules = [title for title in rule_titles if title and title in content_text]
+        linked_rules = [title for title in rule_titles if title and title in case.content]
         if linked_rules:
-            case["linked_rules"] = linked_rules
-
-
-def _ensure_defaults(payload: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
-    for key in ("rules", "terms", "cases"):
-        if not payload.get(key):
-            payload[key] = [
-                {
-                    "condition": "unknown",
-                    "result": "unknown",
-                    "category": "unknown",
-                }
-            ] if key == "rules" else [
-                {
-                    "term": "unknown",
-                    "definition": "unknown",
-                    "category": "unknown",
-                }
-            ] if key == "terms" else [
-                {
-                    "title": "unknown",
-                    "chart": "unknown",
-                    "summary": "unknown",
-                    "content": "unknown",
-                    "tags": ["unknown"],
-                }
-            ]
+            case.linked_rules = linked_rules
+
+
+def _ensure_defaults(payload: Payload) -> Payload:
+    if not payload.get("rules"):
+        payload["rules"] = [RuleRecord(condition="unknown", result="unknown", category="unknown")]
+    if not payload.get("terms"):
+        payload["terms"] = [TermRecord(term="unknown", definition="unknown", category="unknown")]
+    if not payload.get("cases"):
+        payload["cases"] = [
+            CaseRecord(title="unknown", chart="unknown", summary="unknown", content="unknown", tags=("unknown",))
+        ]
     return payload
 
 
-def _coerce_rule(item) -> Dict[str, str]:
+def _coerce_rule(item) -> RuleRecord:
     if isinstance(item, dict):
         condition = str(item.get("condition", item.get("if", item.get("when", "")))).strip()
         result = str(item.get("result", item.get("then", item.get("outcome", "")))).strip()
@@ -276,17 +398,13 @@ def _coerce_rule(item) -> Dict[str, str]:
             condition = str(item["text"]).strip()
         if not result and item.get("text"):
             result = str(item["text"]).strip()
-        return {
-            "condition": condition,
-            "result": result,
-            "category": str(item.get("category", "json")),
-        }
+        return RuleRecord(condition=condition, result=result, category=str(item.get("category", "json")))
 
     text = str(item).strip()
-    return {"condition": text, "result": text, "category": "json"}
+    return RuleRecord(condition=text, result=text, category="json")
 
 
-def _coerce_term(item) -> Dict[str, str]:
+def _coerce_term(item) -> TermRecord:
     if isinstance(item, dict):
         term = str(item.get("term", item.get("name", ""))).strip()
         definition = str(item.get("definition", item.get("meaning", item.get("description", "")))).strip()
@@ -294,71 +412,139 @@ def _coerce_term(item) -> Dict[str, str]:
             term = str(item["text"]).strip()
         if not definition and item.get("text"):
             definition = str(item["text"]).strip()
-        return {
-            "term": term,
-            "definition": definition,
-            "category": str(item.get("category", "json")),
-        }
+        return TermRecord(term=term, definition=definition, category=str(item.get("category", "json")))
 
     text = str(item).strip()
-    return {"term": text, "definition": text, "category": "json"}
+    return TermRecord(term=text, definition=text, category="json")
 
 
-def _coerce_case(item) -> Dict[str, Any]:
+def _coerce_case(item) -> CaseRecord:
     if isinstance(item, dict):
         tags = item.get("tags", [])
         if isinstance(tags, str):
-            tags_list = [tag.strip() for tag in tags.split(",") if tag.strip()]
+            tags_list = tuple(tag.strip() for tag in tags.split(",") if tag.strip())
         elif isinstance(tags, IterableABC):
-            tags_list = [str(tag).strip() for tag in tags if str(tag).strip()]
+            tags_list = tuple(str(tag).strip() for tag in tags if str(tag).strip())
         else:
-            tags_list = []
-
-        return {
-            "title": str(item.get("title", "")).strip(),
-            "chart": str(item.get("chart", "")).strip(),
-            "summary": str(item.get("summary", "")).strip(),
-            "content": str(item.get("content", "")).strip(),
-            "tags": tags_list,
-        }
+            tags_list = ()
+
+        return CaseRecord(
+            title=str(item.get("title", "")).strip(),
+            chart=str(item.get("chart", "")).strip(),
+            summary=str(item.get("summary", "")).strip(),
+            content=str(item.get("content", "")).strip(),
+            tags=tags_list,
+        )
 
     text = str(item).strip()
-    return {
-        "title": text,
-        "chart": "",
-        "summary": text[:120],
-        "content": text,
-        "tags": [],
-    }
+    return CaseRecord(title=text, chart="", summary=text[:120], content=text)
+
+
+STRUCTURED_COERCERS: Dict[str, Callable[[Any], Any]] = {
+    "rules": _coerce_rule,
+    "terms": _coerce_term,
+    "cases": _coerce_case,
+}
+
+
+def _extract_from_lines(lines: Iterable[str], source: Optional[str] = None) -> Payload:
+    payload = _scan_lines(lines)
+    if source is not None:
+        for items in payload.values():
+            for item in items:
+                item.source = source
+    return payload
+
+
+def _extract_from_text(text: str, source: Optional[str] = None) -> Payload:
+    return _extract_from_lines(_iter_text_lines(text), source=source)
+
+
+def _extract_from_zip(path: str, *, max_workers: Optional[int] = None) -> Payload:
+    """Extract every archive member separately, tagging items with the member name."""
+
+    payload: Payload = {"rules": [], "terms": [], "cases": []}
+    members = _map_zip_members(
+        path,
+        lambda name, text: _extract_from_text(text, source=name),
+        max_workers=max_workers,
+    )
+    for _, member_payload in members:
+        for key in payload:
+            payload[key].extend(member_payload[key])
+    return payload
 
 
 def extract_rules_terms_cases(path: str) -> dict:
     suffix = Path(path).suffix.lower()
 
+    if suffix == ".zip":
+        payload = _extract_from_zip(path)
+        _annotate_links(payload["rules"], payload["terms"], payload["cases"])
+        return _ensure_defaults(payload)
+
     if suffix == ".json":
         structured = _load_structured_json(path)
-        if set(structured.keys()) >= {"rules", "terms", "cases"}:
-            raw_rules = structured.get("rules", [])
-            raw_terms = structured.get("terms", [])
-            raw_cases = structured.get("cases", [])
-            rules = [_coerce_rule(item) for item in raw_rules] if isinstance(raw_rules, list) else []
-            terms = [_coerce_term(item) for item in raw_terms] if isinstance(raw_terms, list) else []
-            cases = [_coerce_case(item) for item in raw_cases] if isinstance(raw_cases, list) else []
-            payload = {"rules": rules, "terms": terms, "cases": cases}
-            if all(isinstance(value, list) for value in payload.values()):
-                _annotate_links(payload["rules"], payload["terms"], payload["cases"])
-                return _ensure_defaults(payload)
-        text = structured.get("text", "")
+        if "text" not in structured:
+            _annotate_links(structured["rules"], structured["terms"], structured["cases"])
+            return _ensure_defaults(structured)
+        payload = _extract_from_text(structured["text"])
+    elif suffix in TEXT_SUFFIXES:
+        with open(path, "r", encoding="utf-8") as file:
+            payload = _extract_from_lines(file)
     else:
-        text = _read_text(path)
-
-    rules = _extract_rules_from_text(text)
-    terms = _extract_terms_from_text(text)
-    cases = _extract_cases_from_text(text)
+        payload = _extract_from_text(_read_text(path))
 
-    payload = {"rules": rules, "terms": terms, "cases": cases}
-    _annotate_links(rules, terms, cases)
+    _annotate_links(payload["rules"], payload["terms"], payload["cases"])
     return _ensure_defaults(payload)
 
 
-__all__ = ["extract_rules_terms_cases"]
+def _timed_extract(path: str) -> Tuple[Optional[dict], Optional[str], float]:
+    started = time.perf_counter()
+    try:
+        payload, error = extract_rules_terms_cases(path), None
+    except Exception as exc:  # 파일 하나의 실패가 배치 전체를 멈추지 않게 한다
+        payload, error = None, f"{type(exc).__name__}: {exc}"
+    return payload, error, time.perf_counter() - started
+
+
+def extract_many(
+    paths: Iterable[str],
+    *,
+    max_workers: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Run :func:`extract_rules_terms_cases` over several files in worker processes.
+
+    Parsing and rule extraction are CPU-bound, so each file is handled in its
+    own process; only the path goes in and the picklable payload (records and
+    plain dicts) comes back. One ``{"path", "payload", "error", "seconds"}``
+    record is yielded per file as soon as it finishes (completion order). A
+    file that raises is reported with ``payload=None`` and the error message
+    instead of aborting the batch.
+    """
+
+    paths = list(paths)
+    if not paths:
+        return
+
+    workers = max(1, min(max_workers or FILE_MAX_WORKERS, len(paths)))
+    if workers == 1:
+        # 파일이 하나뿐이면 프로세스를 띄우지 않는다
+        for path in paths:
+            payload, error, seconds = _timed_extract(path)
+            yield {"path": path, "payload": payload, "error": error, "seconds": seconds}
+        return
+
+    # 스레드가 도는 앱 프로세스를 fork 하지 않도록 spawn 으로 띄운다
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = {executor.submit(_timed_extract, path): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                payload, error, seconds = future.result()
+            except Exception as exc:  # 작업 프로세스가 죽은 경우 (BrokenProcessPool 등)
+                payload, error, seconds = None, f"{type(exc).__name__}: {exc}", 0.0
+            yield {"path": futures[future], "payload": payload, "error": error, "seconds": seconds}
+
+
+__all__ = ["extract_rules_terms_cases", "extract_many", "iter_structured_json"]
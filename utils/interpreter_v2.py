@@ -1,21 +1,137 @@
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
 
+from utils.logic_engine import inference_table
+from utils.relations import BRANCHES, STEMS, Relation
 
-def analyze_chart(gan_str: str, zhi_str: str) -> Dict[str, List[str]]:
-    gans = gan_str.split()
-    zhis = zhi_str.split()
-    pairs = [f"{g}{z}" for g, z in zip(gans, zhis)]
+NATAL_CACHE_SIZE = 256
 
-    relations: List[Tuple[str, str, str]] = []
-    if "午" in zhis and "卯" in zhis:
-        relations.append(("午", "卯", "破"))
-    if "卯" in zhis and "亥" in zhis:
-        relations.append(("卯", "亥", "合"))
+# 원국·운에서 감지하는 지지 관계 (방향은 규칙 문구 "午卯破" 와 같다)
+DETECTED_RELATIONS: Tuple[Relation, ...] = (
+    ("午", "卯", "破"),
+    ("卯", "亥", "合"),
+)
 
-    structure = {
-        "천간": gans,
-        "지지": zhis,
-        "조합": pairs,
-        "감지관계": relations,
+
+def detect_branch_relations(branches: Iterable[str]) -> List[Relation]:
+    """Relations of :data:`DETECTED_RELATIONS` whose two branches are both present."""
+    present = set(branches)
+    return [relation for relation in DETECTED_RELATIONS if relation[0] in present and relation[1] in present]
+
+
+class NatalChart:
+    """Natal pillars with their internal relations computed once.
+
+    ``transit(pillar)`` returns the relations a luck-period pillar adds to
+    the natal chart and is memoised per pillar (at most 60 entries), so
+    changing only 대운/세운 never re-evaluates the natal branches.
+    """
+
+    def __init__(self, gan: Sequence[str], zhi: Sequence[str]) -> None:
+        self.gan = list(gan)
+        self.zhi = list(zhi)
+        self.relations: List[Relation] = detect_branch_relations(self.zhi)
+        self._transit_cache: Dict[str, List[Relation]] = {}
+
+    @classmethod
+    def from_strings(cls, gan: str, zhi: str) -> "NatalChart":
+        """``"丁 戊 辛 辛"``, ``"午 卯 亥 子"`` (시·일·월·년 순)."""
+        return cls(gan.split(), zhi.split())
+
+    def pillar(self, position: int) -> str:
+        return self.gan[position] + self.zhi[position]
+
+    @property
+    def year_pillar(self) -> str:
+        return self.pillar(-1)
+
+    @property
+    def month_pillar(self) -> str:
+        return self.pillar(-2)
+
+    def transit(self, pillar: str) -> List[Relation]:
+        cached = self._transit_cache.get(pillar)
+        if cached is None:
+            cached = [
+                relation
+                for relation in detect_branch_relations([*self.zhi, pillar[1]])
+                if relation not in self.relations
+            ]
+            self._transit_cache[pillar] = cached
+        return cached
+
+    def transit_relations(self, daewoon: str = "", sewoon: str = "") -> List[Relation]:
+        """Relations added by the 대운/세운 pillars: each against the natal chart, then 대운 × 세운.
+
+        ``self.relations + transit_relations(...)`` equals the relations
+        detected over the natal and transit branches together.
+        """
+        relations: List[Relation] = []
+        if daewoon:
+            relations.extend(self.transit(daewoon))
+        if sewoon:
+            relations.extend(relation for relation in self.transit(sewoon) if relation not in relations)
+        if daewoon and sewoon:
+            known = set(self.relations) | set(relations)
+            relations.extend(
+                relation
+                for relation in detect_branch_relations([daewoon[1], sewoon[1]])
+                if relation not in known
+            )
+        return relations
+
+
+@lru_cache(maxsize=NATAL_CACHE_SIZE)
+def natal_chart(gan_str: str, zhi_str: str) -> NatalChart:
+    """Cached :class:`NatalChart` per natal input (whitespace-insensitive)."""
+    return NatalChart.from_strings(gan_str, zhi_str)
+
+
+def _normalize_pillar(pillar: str, label: str) -> str:
+    pillar = "".join((pillar or "").split())
+    if not pillar:
+        return ""
+    if len(pillar) != 2 or pillar[0] not in STEMS or pillar[1] not in BRANCHES:
+        raise ValueError(f"{label} 간지 형식 오류: {pillar!r} (예: 甲午)")
+    return pillar
+
+
+def analyze_chart(gan_str: str, zhi_str: str, daewoon: str = "", sewoon: str = "") -> Dict[str, Any]:
+    """Structure of a natal chart, optionally with 대운/세운 pillars.
+
+    ``감지관계`` holds every detected relation: the natal relations
+    (cached per chart, same set as the original analyzer) followed by the transit delta (``운관계``), so only
+    the pillars that changed are evaluated on each call.
+    """
+    natal = natal_chart(" ".join(gan_str.split()), " ".join(zhi_str.split()))
+    daewoon = _normalize_pillar(daewoon, "대운")
+    sewoon = _normalize_pillar(sewoon, "세운")
+    transit = natal.transit_relations(daewoon, sewoon)
+
+    structure: Dict[str, Any] = {
+        "천간": list(natal.gan),
+        "지지": list(natal.zhi),
+        "조합": [f"{g}{z}" for g, z in zip(natal.gan, natal.zhi)],
+        "감지관계": natal.relations + transit,
     }
+    if daewoon or sewoon:
+        structure["운"] = {"대운": daewoon, "세운": sewoon}
+        structure["원국관계"] = list(natal.relations)
+        structure["운관계"] = transit
     return structure
+
+
+@lru_cache(maxsize=1024)
+def _infer_cached(relations: Tuple[Relation, ...], table_version: Any) -> Tuple[Dict[str, Any], ...]:
+    return tuple(inference_table().infer(relations))
+
+
+def interpret(gan_str: str, zhi_str: str, daewoon: str = "", sewoon: str = "") -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """``analyze_chart`` followed by inference, memoised per relation set and rule-table version."""
+    structure = analyze_chart(gan_str, zhi_str, daewoon, sewoon)
+    version = inference_table().version
+    results = [dict(result) for result in _infer_cached(tuple(structure["감지관계"]), version)]
+    return structure, results
+
+
+__all__ = ["DETECTED_RELATIONS", "detect_branch_relations", "NatalChart", "natal_chart", "analyze_chart", "interpret"]
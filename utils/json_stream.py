@@ -0,0 +1,127 @@
+import json
+from typing import Any, Iterator, TextIO
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = " \t\n\r"
+NUMBER_START = "-0123456789"
+NUMBER_CHARS = "0123456789.eE+-"
+
+_decoder = json.JSONDecoder()
+
+
+class JsonStreamReader:
+    """Sliding text buffer over a file that decodes one JSON value at a time.
+
+    ``iter_array`` and ``iter_object`` walk containers without decoding them
+    as a whole; every yielded array item is fully decoded, while an object
+    member's value must be consumed by the caller (``value()``, ``iter_array()``
+    or ``iter_object()``) before advancing to the next key.
+    """
+
+    def __init__(self, file: TextIO, chunk_size: int = CHUNK_SIZE) -> None:
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int) -> bool:
+        if self.eof:
+            return False
+        chunk = self.file.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        # 소비한 앞부분은 버려서 버퍼가 파일 크기만큼 커지지 않게 한다
+        if self.pos > self.chunk_size:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at end of input)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(self.chunk_size):
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON 형식 오류: {char!r} 이(가) 필요하지만 {found or 'EOF'!r} 발견")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed."""
+        self.peek()
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill(read_size):
+                    raise
+                # 큰 값 하나를 반복 재해석하는 비용을 줄이기 위해 읽기 크기를 늘린다
+                read_size *= 2
+                continue
+            # 버퍼 경계에서 잘린 숫자("-2." + "5")는 뒷부분을 더 읽은 뒤 다시 해석한다
+            truncated = end >= len(self.buffer) or (
+                self.buffer[self.pos] in NUMBER_START and self.buffer[end] in NUMBER_CHARS
+            )
+            if truncated and self._fill(read_size):
+                continue
+            self.pos = end
+            return value
+
+    def iter_array(self) -> Iterator[Any]:
+        """Yield the decoded items of the array starting at the current position."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            self._separator("]", "배열")
+            if self.buffer[self.pos - 1] == "]":
+                return
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield the keys of the object starting at the current position.
+
+        After each key the reader is positioned on that member's value.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise ValueError("JSON 형식 오류: 객체 키는 문자열이어야 합니다")
+            key = self.value()
+            self.expect(":")
+            yield key
+            self._separator("}", "객체")
+            if self.buffer[self.pos - 1] == "}":
+                return
+
+    def _separator(self, closing: str, label: str) -> None:
+        separator = self.peek()
+        if separator not in ("," + closing) or not separator:
+            raise ValueError(f"JSON 형식 오류: {label} 구분자 {separator or 'EOF'!r}")
+        self.pos += 1
+
+
+def iter_json_array(file: TextIO, *, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array one at a time.
+
+    Only the element currently being decoded (plus one read chunk) is held in
+    memory, so arbitrarily large array files can be streamed.
+    """
+    yield from JsonStreamReader(file, chunk_size).iter_array()
+
+
+__all__ = ["JsonStreamReader", "iter_json_array"]
@@ -0,0 +1,144 @@
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from utils.db_manager_v2 import MIGRATIONS, connect_readonly, init_db, share_immutable
+from utils.rule_compiler import COMPILER_VERSION
+
+PathLike = Union[str, Path]
+
+SNAPSHOT_SUFFIX = ".snapshot.db"
+
+
+def default_snapshot_path(db_path: PathLike) -> Path:
+    """``suri_manual.db`` → ``suri_manual.snapshot.db`` (same directory)."""
+    path = Path(db_path)
+    return path.with_name(path.stem + SNAPSHOT_SUFFIX)
+
+
+def build_snapshot(db_path: PathLike, snapshot_path: Optional[PathLike] = None) -> Path:
+    """Compile the live DB into a compact, read-optimised snapshot file.
+
+    The copy is taken with the SQLite backup API, planner statistics are
+    gathered with ``ANALYZE`` and the file is rewritten with ``VACUUM`` so
+    tables and indexes are stored contiguously. The source file's size and
+    mtime, its migration version and the rule compiler version are recorded
+    so readers can tell whether the snapshot is stale.
+    The snapshot is written to a temporary file and renamed into place, so
+    processes that already have the old snapshot open keep a consistent view.
+    """
+    db_path = Path(db_path)
+    target_path = Path(snapshot_path) if snapshot_path else default_snapshot_path(db_path)
+    temp_path = target_path.with_name(target_path.name + ".tmp")
+    if temp_path.exists():
+        temp_path.unlink()
+
+    source_stat = db_path.stat()
+    source = connect_readonly(db_path)
+    target = sqlite3.connect(temp_path)
+    try:
+        schema_version = source.execute("PRAGMA user_version").fetchone()[0]
+        source.backup(target)
+        target.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS snapshot_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            DELETE FROM snapshot_meta;
+            """
+        )
+        target.executemany(
+            "INSERT INTO snapshot_meta (key, value) VALUES (?, ?)",
+            [
+                ("source_path", str(db_path.resolve())),
+                ("source_size", str(source_stat.st_size)),
+                ("source_mtime_ns", str(source_stat.st_mtime_ns)),
+                ("schema_version", str(schema_version)),
+                ("compiler_version", str(COMPILER_VERSION)),
+                ("built_at", time.strftime("%Y-%m-%d %H:%M:%S")),
+            ],
+        )
+        target.commit()
+        target.execute("ANALYZE")
+        target.commit()
+        # 읽기 전용 파일이므로 ptrmap 페이지가 필요 없고, VACUUM 으로 페이지를 연속 배치한다
+        target.execute("PRAGMA auto_vacuum = NONE")
+        target.execute("PRAGMA journal_mode = DELETE")
+        target.execute("VACUUM")
+    finally:
+        target.close()
+        source.close()
+
+    os.replace(temp_path, target_path)
+    return target_path
+
+
+def open_snapshot(snapshot_path: PathLike) -> sqlite3.Connection:
+    """Open a snapshot read-only and memory-mapped.
+
+    ``immutable=1`` skips file locking and change detection entirely; this is
+    safe because snapshots are only ever replaced by rename, never modified.
+    """
+    conn = connect_readonly(snapshot_path, immutable=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def snapshot_metadata(snapshot_path: PathLike) -> Dict[str, str]:
+    conn = open_snapshot(snapshot_path)
+    try:
+        return {row["key"]: row["value"] for row in conn.execute("SELECT key, value FROM snapshot_meta")}
+    except sqlite3.DatabaseError:
+        return {}
+    finally:
+        conn.close()
+
+
+def snapshot_is_fresh(db_path: PathLike, snapshot_path: Optional[PathLike] = None) -> bool:
+    """True when the snapshot exists and was built from the current state of ``db_path``.
+
+    A snapshot built before a code upgrade that added a migration or changed
+    the rule compiler is stale even if the source file is unchanged.
+    """
+    target_path = Path(snapshot_path) if snapshot_path else default_snapshot_path(db_path)
+    if not target_path.exists() or not Path(db_path).exists():
+        return False
+
+    meta = snapshot_metadata(target_path)
+    source_stat = Path(db_path).stat()
+    return (
+        meta.get("source_size") == str(source_stat.st_size)
+        and meta.get("source_mtime_ns") == str(source_stat.st_mtime_ns)
+        and meta.get("schema_version") == str(len(MIGRATIONS))
+        and meta.get("compiler_version") == str(COMPILER_VERSION)
+    )
+
+
+def resolve_read_path(db_path: PathLike, snapshot_path: Optional[PathLike] = None) -> str:
+    """Return the path pages should read from.
+
+    A fresh snapshot is used as-is, skipping ``init_db`` (schema script,
+    migrations, sample bootstrap), and all reads of it share one immutable,
+    memory-mapped connection. Otherwise the live DB is initialised and
+    returned, so writes made since the last build are never hidden.
+    """
+    target_path = Path(snapshot_path) if snapshot_path else default_snapshot_path(db_path)
+    if snapshot_is_fresh(db_path, target_path):
+        share_immutable(target_path)
+        return str(target_path)
+
+    init_db(str(db_path))
+    return str(db_path)
+
+
+__all__ = [
+    "default_snapshot_path",
+    "build_snapshot",
+    "open_snapshot",
+    "snapshot_metadata",
+    "snapshot_is_fresh",
+    "resolve_read_path",
+]
@@ -1,15 +1,167 @@
-def infer_logic(structure):
-    relations = [relation[2] for relation in structure.get("감지관계", [])]
-    result = []
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
-    if "破" in relations:
-        result.append({"카테고리": "혼인", "조건": "破", "결과": "이혼"})
-    if "合" in relations:
-        result.append({"카테고리": "인연", "조건": "合", "결과": "연애·재결합"})
-    if not result:
-        result.append({"카테고리": "일반", "조건": "-", "결과": "평온"})
+from utils.relations import relation_label
 
-    return result
+BASE_DIR = Path(__file__).resolve().parents[1]
+INFERENCE_RULES_PATH = BASE_DIR / "data" / "inference_rules.json"
 
+# 규칙 파일이 없을 때 쓰는 기본 표 (data/inference_rules.json 과 같은 내용)
+DEFAULT_INFERENCE_RULES = [
+    {"카테고리": "혼인", "트리거": "破", "결과": "이혼", "우선순위": 20},
+    {"카테고리": "인연", "트리거": "合", "결과": "연애·재결합", "우선순위": 10},
+    {"카테고리": "일반", "결과": "평온"},
+]
 
-__all__ = ["infer_logic"]
+PathLike = Union[str, Path]
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceRule:
+    def __init__(self, order: int, record: Dict[str, Any]) -> None:
+        def labels(value: Any) -> Tuple[str, ...]:
+            if value is None:
+                return ()
+            return (value,) if isinstance(value, str) else tuple(str(item) for item in value)
+
+        if not record.get("결과"):
+            raise ValueError(f"추론 규칙 #{order + 1}: '결과' 가 없습니다")
+        self.order = order
+        self.category = str(record.get("카테고리") or "일반")
+        self.triggers = labels(record.get("트리거"))
+        self.requires = frozenset(labels(record.get("필요")))
+        self.result = str(record["결과"])
+        self.priority = int(record.get("우선순위") or 0)
+
+    def output(self, trigger: str) -> Dict[str, Any]:
+        return {"카테고리": self.category, "조건": trigger, "결과": self.result}
+
+
+def relation_keys(relations: Iterable[Sequence[str]]) -> Dict[str, None]:
+    """Trigger keys of detected relations: each type (``破``) and each label (``午卯破``), in order."""
+    keys: Dict[str, None] = {}
+    for relation in relations:
+        keys.setdefault(relation[2], None)
+        keys.setdefault(relation_label(relation), None)
+    return keys
+
+
+def rule_set_digest(records: Sequence[Dict[str, Any]]) -> str:
+    """Short SHA-256 of the canonical rule list — identifies the rule set that produced a result."""
+    canonical = json.dumps(list(records), ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class InferenceTable:
+    """Inference rules compiled into a dispatch table keyed by trigger.
+
+    A rule fires when one of its ``트리거`` keys (a relation type such as
+    ``破`` or a label such as ``午卯破``) is present and every ``필요`` key
+    is present too; rules without a trigger are defaults used only when
+    nothing else fires. Evaluation looks up the chart's own keys, so its
+    cost follows the relations found rather than the number of rules.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]], version: Any = None) -> None:
+        records = list(records)
+        self.version = version
+        self.digest = rule_set_digest(records)
+        self.dispatch: Dict[str, List[InferenceRule]] = {}
+        self.defaults: List[InferenceRule] = []
+        for order, record in enumerate(records):
+            rule = InferenceRule(order, record)
+            if not rule.triggers:
+                self.defaults.append(rule)
+            for trigger in rule.triggers:
+                self.dispatch.setdefault(trigger, []).append(rule)
+
+    def infer(self, relations: Iterable[Sequence[str]]) -> List[Dict[str, Any]]:
+        keys = relation_keys(relations)
+        fired: Dict[int, Tuple[InferenceRule, str]] = {}
+        for key in keys:
+            for rule in self.dispatch.get(key, ()):
+                if rule.order not in fired and rule.requires.issubset(keys):
+                    fired[rule.order] = (rule, key)
+        if not fired:
+            return [rule.output("-") for rule in sorted(self.defaults, key=_rank)]
+        ranked = sorted(fired.values(), key=lambda item: _rank(item[0]))
+        return [rule.output(trigger) for rule, trigger in ranked]
+
+
+def _rank(rule: InferenceRule) -> Tuple[int, int]:
+    return (-rule.priority, rule.order)
+
+
+def load_inference_table(path: PathLike = INFERENCE_RULES_PATH) -> InferenceTable:
+    """Compile the JSON rule list at ``path`` (the built-in table when the file is missing)."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return InferenceTable(DEFAULT_INFERENCE_RULES, version=None)
+    with open(path, "r", encoding="utf-8") as rules_file:
+        records = json.load(rules_file)
+    if not isinstance(records, list):
+        raise ValueError(f"{path}: 추론 규칙은 JSON 배열이어야 합니다")
+    return InferenceTable(records, version=(stat.st_size, stat.st_mtime_ns))
+
+
+_lock = threading.Lock()
+_tables: Dict[str, InferenceTable] = {}
+# 읽기에 실패한 파일 상태 — 같은 상태에 대해 경고를 한 번만 남긴다 (표 버전으로는 저장하지 않는다)
+_failed_stamps: Dict[str, Optional[Tuple[int, int]]] = {}
+
+
+def inference_table(path: PathLike = INFERENCE_RULES_PATH) -> InferenceTable:
+    """Current table for ``path``, recompiled whenever the file's size or mtime changes (hot reload).
+
+    If the changed file cannot be loaded, the last good table keeps serving
+    (with a warning) and the load is retried on the next call.
+    """
+    key = os.path.abspath(str(path))
+    try:
+        stat = os.stat(key)
+        stamp: Optional[Tuple[int, int]] = (stat.st_size, stat.st_mtime_ns)
+    except FileNotFoundError:
+        stamp = None
+    with _lock:
+        table = _tables.get(key)
+    if table is None or table.version != stamp:
+        try:
+            loaded = load_inference_table(key)
+        except (OSError, ValueError) as exc:
+            # 저장 도중이거나 잘못 고친 파일이면 직전 표를 계속 쓰고, 다음 호출에서 다시 읽는다
+            if table is None:
+                raise
+            with _lock:
+                warn = _failed_stamps.get(key) != stamp
+                _failed_stamps[key] = stamp
+            if warn:
+                logger.warning("추론 규칙 %s 를 읽지 못해 이전 규칙을 계속 사용합니다: %s", key, exc)
+            return table
+        with _lock:
+            _tables[key] = loaded
+            _failed_stamps.pop(key, None)
+        table = loaded
+    return table
+
+
+def infer_logic(structure, path: PathLike = INFERENCE_RULES_PATH):
+    return inference_table(path).infer(structure.get("감지관계", []))
+
+
+__all__ = [
+    "INFERENCE_RULES_PATH",
+    "DEFAULT_INFERENCE_RULES",
+    "InferenceTable",
+    "relation_keys",
+    "rule_set_digest",
+    "load_inference_table",
+    "inference_table",
+    "infer_logic",
+]
@@ -0,0 +1,256 @@
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from utils.json_stream import JsonStreamReader
+
+PathLike = Union[str, Path]
+
+COMPILED_SUFFIX = ".idx"
+FORMAT_VERSION = 1
+MAGIC = b"SUAMIDX1"
+FOOTER = struct.Struct("<QQ")  # (인덱스 오프셋, 인덱스 길이)
+
+# 섹션 종류: 최상위 배열("list"), {"title": ..., "items": [...]} 형태("object"), 그 외 단일 값("value")
+SECTION_LIST = "list"
+SECTION_OBJECT = "object"
+SECTION_VALUE = "value"
+
+
+def default_compiled_path(source_path: PathLike) -> Path:
+    """``suam_master_data.json`` → ``suam_master_data.json.idx`` (same directory)."""
+    path = Path(source_path)
+    return path.with_name(path.name + COMPILED_SUFFIX)
+
+
+def _item_label(item: Any, key: str) -> Optional[str]:
+    if isinstance(item, dict):
+        value = item.get(key)
+        if value is not None:
+            return str(value)
+    return None
+
+
+class _Writer:
+    """Appends one UTF-8 JSON blob per item and records its (offset, length)."""
+
+    def __init__(self, handle) -> None:
+        self.handle = handle
+        self.offset = len(MAGIC)
+
+    def write(self, value: Any) -> Tuple[int, int]:
+        blob = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.handle.write(blob)
+        start = self.offset
+        self.offset += len(blob)
+        return start, len(blob)
+
+    def entry(self, item: Any) -> List[Any]:
+        offset, length = self.write(item)
+        # 사례(case)는 name 대신 id 를 표시 이름으로 쓴다
+        name = _item_label(item, "name") or _item_label(item, "id")
+        return [offset, length, name, _item_label(item, "category")]
+
+
+def compile_master_data(source_path: PathLike, compiled_path: Optional[PathLike] = None) -> Path:
+    """Compile the master JSON into an offset-indexed file.
+
+    The source is streamed section by section, so even very large files are
+    never held in memory as a whole. Every term/item is stored as its own
+    JSON blob; a trailing index records each section's kind, attributes
+    (``title`` …) and per-item ``[offset, length, name, category]``. The
+    source's size and mtime are stored so readers can detect a stale build.
+    """
+    source_path = Path(source_path)
+    target_path = Path(compiled_path) if compiled_path else default_compiled_path(source_path)
+    temp_path = target_path.with_name(target_path.name + ".tmp")
+    source_stat = source_path.stat()
+
+    sections: Dict[str, Dict[str, Any]] = {}
+    with source_path.open("r", encoding="utf-8") as source, temp_path.open("wb") as handle:
+        handle.write(MAGIC)
+        writer = _Writer(handle)
+        reader = JsonStreamReader(source)
+        for key in reader.iter_object():
+            head = reader.peek()
+            if head == "[":
+                sections[key] = {
+                    "kind": SECTION_LIST,
+                    "attrs": {},
+                    "items": [writer.entry(item) for item in reader.iter_array()],
+                }
+            elif head == "{":
+                section = {"kind": SECTION_OBJECT, "attrs": {}, "items": []}
+                for member in reader.iter_object():
+                    if member == "items" and reader.peek() == "[":
+                        section["items"] = [writer.entry(item) for item in reader.iter_array()]
+                    else:
+                        section["attrs"][member] = reader.value()
+                sections[key] = section
+            else:
+                sections[key] = {"kind": SECTION_VALUE, "attrs": {}, "items": [writer.entry(reader.value())]}
+
+        index = json.dumps(
+            {
+                "version": FORMAT_VERSION,
+                "source_size": source_stat.st_size,
+                "source_mtime_ns": source_stat.st_mtime_ns,
+                "sections": sections,
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+        handle.write(index)
+        handle.write(FOOTER.pack(writer.offset, len(index)))
+        handle.write(MAGIC)
+
+    os.replace(temp_path, target_path)
+    return target_path
+
+
+class MasterData:
+    """Read-only view over a compiled master data file.
+
+    The file is memory-mapped and only the index is decoded up front; items
+    are decoded on access, so a page that shows one section never pays for
+    the others.
+    """
+
+    def __init__(self, compiled_path: PathLike) -> None:
+        self.path = Path(compiled_path)
+        self._file = self.path.open("rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"빈 마스터 데이터 인덱스 파일: {self.path}")
+        self.index = self._read_index()
+        self._sections: Dict[str, Dict[str, Any]] = self.index["sections"]
+        self._names: Optional[Dict[str, List[Tuple[str, int]]]] = None
+
+    def _read_index(self) -> Dict[str, Any]:
+        size = len(self._map)
+        footer_start = size - FOOTER.size - len(MAGIC)
+        if (
+            footer_start < len(MAGIC)
+            or self._map[: len(MAGIC)] != MAGIC
+            or self._map[size - len(MAGIC):] != MAGIC
+        ):
+            raise ValueError(f"마스터 데이터 인덱스 형식 오류: {self.path}")
+        offset, length = FOOTER.unpack(self._map[footer_start: footer_start + FOOTER.size])
+        return json.loads(self._map[offset: offset + length].decode("utf-8"))
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "MasterData":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def is_fresh(self, source_path: PathLike) -> bool:
+        """True when this build matches the current size and mtime of ``source_path``."""
+        try:
+            source_stat = Path(source_path).stat()
+        except OSError:
+            return False
+        return (
+            self.index.get("version") == FORMAT_VERSION
+            and self.index.get("source_size") == source_stat.st_size
+            and self.index.get("source_mtime_ns") == source_stat.st_mtime_ns
+        )
+
+    def sections(self) -> List[str]:
+        return list(self._sections)
+
+    def section_title(self, section: str, default: Optional[str] = None) -> Optional[str]:
+        return self._sections[section]["attrs"].get("title", default)
+
+    def section_attrs(self, section: str) -> Dict[str, Any]:
+        return dict(self._sections[section]["attrs"])
+
+    def count(self, section: str) -> int:
+        return len(self._sections[section]["items"])
+
+    def names(self, section: str) -> List[Optional[str]]:
+        """Item names of a section, read from the index without decoding any item."""
+        return [entry[2] for entry in self._sections[section]["items"]]
+
+    def categories(self, section: str) -> List[Optional[str]]:
+        return [entry[3] for entry in self._sections[section]["items"]]
+
+    def _decode(self, entry: List[Any]) -> Any:
+        offset, length = entry[0], entry[1]
+        return json.loads(self._map[offset: offset + length].decode("utf-8"))
+
+    def item(self, section: str, position: int) -> Any:
+        return self._decode(self._sections[section]["items"][position])
+
+    def iter_items(
+        self,
+        section: str,
+        start: int = 0,
+        stop: Optional[int] = None,
+        *,
+        category: Optional[str] = None,
+    ) -> Iterator[Any]:
+        """Decode items ``start:stop`` of a section, optionally only one category."""
+        for entry in self._sections[section]["items"][start:stop]:
+            if category is None or entry[3] == category:
+                yield self._decode(entry)
+
+    def items(self, section: str, **kwargs: Any) -> List[Any]:
+        return list(self.iter_items(section, **kwargs))
+
+    def value(self, section: str) -> Any:
+        """Rebuild a whole section in its original JSON shape."""
+        meta = self._sections[section]
+        if meta["kind"] == SECTION_VALUE:
+            return self._decode(meta["items"][0])
+        items = self.items(section)
+        if meta["kind"] == SECTION_LIST:
+            return items
+        return {**meta["attrs"], "items": items}
+
+    def find(self, name: str, section: Optional[str] = None) -> Optional[Any]:
+        """Look up an item by exact name (or case id) via the index."""
+        if self._names is None:
+            names: Dict[str, List[Tuple[str, int]]] = {}
+            for section_name, meta in self._sections.items():
+                for position, entry in enumerate(meta["items"]):
+                    if entry[2] is not None:
+                        names.setdefault(entry[2], []).append((section_name, position))
+            self._names = names
+        for section_name, position in self._names.get(name, []):
+            if section is None or section_name == section:
+                return self.item(section_name, position)
+        return None
+
+
+def load_master_data(source_path: PathLike, compiled_path: Optional[PathLike] = None) -> MasterData:
+    """Open the compiled form of ``source_path``, (re)compiling it when missing or stale."""
+    target_path = Path(compiled_path) if compiled_path else default_compiled_path(source_path)
+    if target_path.exists():
+        try:
+            data = MasterData(target_path)
+        except (OSError, ValueError):
+            data = None
+        if data is not None:
+            if data.is_fresh(source_path):
+                return data
+            data.close()
+
+    compile_master_data(source_path, target_path)
+    return MasterData(target_path)
+
+
+__all__ = [
+    "default_compiled_path",
+    "compile_master_data",
+    "MasterData",
+    "load_master_data",
+]
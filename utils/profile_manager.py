@@ -0,0 +1,250 @@
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from utils.db_manager_v2 import connect, connect_readonly
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+PROFILE_DB_PATH = BASE_DIR / "data" / "profiles.db"
+PROFILE_PAGE_SIZE = 50
+
+PathLike = Union[str, Path]
+
+# 목록 화면에서 읽는 요약 컬럼 — structure_json/result_json 은 프로필을 열 때만 디코딩한다
+SUMMARY_COLUMNS = (
+    "id",
+    "name",
+    "gender",
+    "gan",
+    "zhi",
+    "daewoon",
+    "sewoon",
+    "chart_key",
+    "top_result",
+    "result_count",
+    "created_at",
+)
+
+PROFILE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    gender TEXT,
+    gan TEXT,
+    zhi TEXT,
+    daewoon TEXT,
+    sewoon TEXT,
+    structure_json TEXT,
+    result_json TEXT
+);
+"""
+
+# 오래된 profiles 테이블에 없을 수 있는 요약 컬럼
+SUMMARY_COLUMN_DEFINITIONS = (
+    ("chart_key", "TEXT NOT NULL DEFAULT ''"),
+    ("top_result", "TEXT NOT NULL DEFAULT ''"),
+    ("result_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("created_at", "TEXT NOT NULL DEFAULT ''"),
+)
+
+PROFILE_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_profiles_name ON profiles(name, id);
+CREATE INDEX IF NOT EXISTS idx_profiles_chart_key ON profiles(chart_key, id);
+CREATE INDEX IF NOT EXISTS idx_profiles_created_at ON profiles(created_at, id);
+"""
+
+_initialized = set()
+
+
+def chart_key(gan: str, zhi: str) -> str:
+    """Canonical chart key: ``"丁 戊 辛 辛", "午 卯 亥 子"`` → ``"丁戊辛辛/午卯亥子"``."""
+    return "".join((gan or "").split()) + "/" + "".join((zhi or "").split())
+
+
+def _top_result(results: Sequence[Dict[str, Any]]) -> str:
+    for result in results or []:
+        if isinstance(result, dict) and result.get("결과"):
+            field = result.get("분야")
+            return f"{field}: {result['결과']}" if field else str(result["결과"])
+    return ""
+
+
+def _migrate_summary_columns(conn: sqlite3.Connection) -> None:
+    """Add the summary columns to older profile tables and backfill them once."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(profiles)")}
+    for column, definition in SUMMARY_COLUMN_DEFINITIONS:
+        if column not in columns:
+            conn.execute(f"ALTER TABLE profiles ADD COLUMN {column} {definition}")
+
+    rows = conn.execute("SELECT id, gan, zhi, result_json FROM profiles WHERE chart_key = ''").fetchall()
+    updates = []
+    for profile_id, gan, zhi, result_json in rows:
+        try:
+            results = json.loads(result_json) if result_json else []
+        except json.JSONDecodeError:
+            results = []
+        updates.append((chart_key(gan, zhi), _top_result(results), len(results), profile_id))
+    conn.executemany(
+        "UPDATE profiles SET chart_key = ?, top_result = ?, result_count = ? WHERE id = ?",
+        updates,
+    )
+
+
+# PRAGMA user_version 으로 적용 여부를 기록하는 순차 마이그레이션 (인덱스 + 1 = 버전)
+MIGRATIONS = [
+    _migrate_summary_columns,
+]
+
+
+def init_profile_db(path: PathLike = PROFILE_DB_PATH) -> None:
+    os.makedirs(os.path.dirname(str(path)) or ".", exist_ok=True)
+    with connect(str(path)) as conn:
+        conn.executescript(PROFILE_SCHEMA)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for target_version, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {target_version}")
+        conn.executescript(PROFILE_INDEXES)
+        conn.commit()
+
+
+def _ensure_db(path: PathLike) -> str:
+    key = os.path.abspath(str(path))
+    if key not in _initialized:
+        init_profile_db(path)
+        _initialized.add(key)
+    return str(path)
+
+
+def save_profile(
+    name: str,
+    gender: str,
+    gan: str,
+    zhi: str,
+    daewoon: str,
+    sewoon: str,
+    structure: Dict[str, Any],
+    results: List[Dict[str, Any]],
+    *,
+    path: PathLike = PROFILE_DB_PATH,
+) -> int:
+    conn = connect(_ensure_db(path))
+    try:
+        cursor = conn.execute(
+            """
+            INSERT INTO profiles (
+                name, gender, gan, zhi, daewoon, sewoon, chart_key, top_result, result_count,
+                created_at, structure_json, result_json
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'), ?, ?)
+            """,
+            (
+                name,
+                gender,
+                gan,
+                zhi,
+                daewoon,
+                sewoon,
+                chart_key(gan, zhi),
+                _top_result(results),
+                len(results or []),
+                json.dumps(structure, ensure_ascii=False),
+                json.dumps(results, ensure_ascii=False),
+            ),
+        )
+        conn.commit()
+        return int(cursor.lastrowid)
+    finally:
+        conn.close()
+
+
+def _filter_clause(name_filter: str, chart: str) -> tuple:
+    clauses, params = [], []
+    if name_filter:
+        # 접두사 검색은 idx_profiles_name 범위 탐색으로 처리된다
+        clauses.append("name >= ? AND name < ?")
+        params.extend([name_filter, name_filter + "\U0010ffff"])
+    if chart:
+        clauses.append("chart_key = ?")
+        params.append(chart)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def count_profiles(name_filter: str = "", chart: str = "", *, path: PathLike = PROFILE_DB_PATH) -> int:
+    conn = connect_readonly(_ensure_db(path))
+    try:
+        where, params = _filter_clause(name_filter, chart)
+        return conn.execute(f"SELECT COUNT(*) FROM profiles{where}", params).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def list_profiles(
+    limit: Optional[int] = PROFILE_PAGE_SIZE,
+    offset: int = 0,
+    name_filter: str = "",
+    chart: str = "",
+    *,
+    path: PathLike = PROFILE_DB_PATH,
+) -> List[Dict[str, Any]]:
+    """One page of profile summaries, newest first (no JSON columns are read).
+
+    ``name_filter`` is a name prefix and ``chart`` an exact :func:`chart_key`.
+    """
+    conn = connect_readonly(_ensure_db(path))
+    conn.row_factory = sqlite3.Row
+    try:
+        where, params = _filter_clause(name_filter, chart)
+        rows = conn.execute(
+            f"""
+            SELECT {", ".join(SUMMARY_COLUMNS)}
+            FROM profiles{where}
+            ORDER BY id DESC
+            LIMIT ? OFFSET ?
+            """,
+            params + [-1 if limit is None else limit, offset],
+        ).fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        conn.close()
+
+
+def load_profile(profile_id: int, *, path: PathLike = PROFILE_DB_PATH) -> Optional[Dict[str, Any]]:
+    """Full profile with ``structure`` and ``results`` decoded, or ``None``."""
+    conn = connect_readonly(_ensure_db(path))
+    conn.row_factory = sqlite3.Row
+    try:
+        row = conn.execute("SELECT * FROM profiles WHERE id = ?", (profile_id,)).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return None
+
+    profile = dict(row)
+    profile["structure"] = json.loads(profile.pop("structure_json") or "{}")
+    profile["results"] = json.loads(profile.pop("result_json") or "[]")
+    return profile
+
+
+def delete_profile(profile_id: int, *, path: PathLike = PROFILE_DB_PATH) -> None:
+    conn = connect(_ensure_db(path))
+    try:
+        conn.execute("DELETE FROM profiles WHERE id = ?", (profile_id,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+__all__ = [
+    "PROFILE_DB_PATH",
+    "PROFILE_PAGE_SIZE",
+    "chart_key",
+    "init_profile_db",
+    "save_profile",
+    "count_profiles",
+    "list_profiles",
+    "load_profile",
+    "delete_profile",
+]
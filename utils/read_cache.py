@@ -0,0 +1,160 @@
+import functools
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from utils.db_manager_v2 import (
+    fetch_cases,
+    fetch_cases_by_chart,
+    fetch_data_versions,
+    fetch_keyword_counts,
+    fetch_rule_predicates,
+    fetch_rules,
+    fetch_tag_counts,
+    fetch_terms,
+)
+from utils.case_similarity import CaseSimilarityIndex, build_case_index
+from utils.dedupe import NearDuplicateIndex, update_index_from_db
+from utils.rule_compiler import RuleNetwork
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+READ_CACHE_SIZE = 64
+
+_lock = threading.Lock()
+# 경로별 (파일 크기, mtime_ns) → 마지막으로 읽은 data_version. 파일이 그대로면 SQL 없이 재사용한다
+_versions: Dict[str, Tuple[Tuple[int, int], Dict[str, int]]] = {}
+_caches = []
+
+
+def data_versions(path: str) -> Dict[str, int]:
+    """Scope versions of ``path``; only re-queried when the file's size or mtime changed."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    with _lock:
+        cached = _versions.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+    versions = fetch_data_versions(path)
+    with _lock:
+        _versions[path] = (stamp, versions)
+    return versions
+
+
+def versioned_cache(*scopes: str, maxsize: int = READ_CACHE_SIZE) -> Callable[[F], F]:
+    """Cache ``func(path, ...)`` results keyed on the arguments and the versions of ``scopes``.
+
+    A write that bumps any of ``scopes`` changes the key, so the next call
+    re-queries; writes to other scopes leave the entry valid. Cached values
+    are shared between callers and must be treated as read-only.
+    """
+
+    def decorator(func: F) -> F:
+        entries: "OrderedDict[Any, Any]" = OrderedDict()
+        _caches.append(entries)
+
+        @functools.wraps(func)
+        def wrapper(path: str, *args: Any, **kwargs: Any) -> Any:
+            versions = data_versions(path)
+            key = (
+                os.path.abspath(path),
+                args,
+                tuple(sorted(kwargs.items())),
+                tuple(versions.get(scope, 0) for scope in scopes),
+            )
+            with _lock:
+                if key in entries:
+                    entries.move_to_end(key)
+                    return entries[key]
+            result = func(path, *args, **kwargs)
+            with _lock:
+                entries[key] = result
+                entries.move_to_end(key)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def clear_read_cache(path: Optional[str] = None) -> None:
+    """Drop cached results (all of them, or only those read from ``path``)."""
+    with _lock:
+        if path is None:
+            _versions.clear()
+            _near_duplicate_indexes.clear()
+            for entries in _caches:
+                entries.clear()
+            return
+        path = os.path.abspath(path)
+        _versions.pop(path, None)
+        _near_duplicate_indexes.pop(path, None)
+        for entries in _caches:
+            for key in [key for key in entries if key[0] == path]:
+                del entries[key]
+
+
+# related_case_count 는 링크 쓰기로 바뀌므로 규칙/용어 목록은 links 범위에도 의존한다
+cached_fetch_rules = versioned_cache("rules", "links")(fetch_rules)
+cached_fetch_terms = versioned_cache("terms", "links")(fetch_terms)
+# 사례의 연결 목록은 규칙 제목/용어 이름을 함께 읽는다
+cached_fetch_cases = versioned_cache("cases", "links", "rules", "terms")(fetch_cases)
+cached_fetch_cases_by_chart = versioned_cache("cases")(fetch_cases_by_chart)
+cached_fetch_tag_counts = versioned_cache("cases")(fetch_tag_counts)
+cached_fetch_keyword_counts = versioned_cache("rules")(fetch_keyword_counts)
+
+
+@versioned_cache("rules", maxsize=4)
+def cached_rule_network(path: str) -> RuleNetwork:
+    """Rule matching network over the compiled conditions of ``path`` (rebuilt when rules change)."""
+    return RuleNetwork.from_predicates(fetch_rule_predicates(path))
+
+
+@versioned_cache("cases", maxsize=4)
+def cached_case_index(path: str) -> CaseSimilarityIndex:
+    """Case similarity index of ``path``, shared per process and rebuilt only when cases change."""
+    return build_case_index(path)
+
+
+# 경로별 (rules/terms/cases 버전, 중복 검사 인덱스) — 버전이 바뀌면 새로 들어온 행만 더한다
+_near_duplicate_indexes: Dict[str, Tuple[Tuple[int, ...], NearDuplicateIndex]] = {}
+NEAR_DUPLICATE_SCOPES = ("rules", "terms", "cases")
+
+
+def cached_near_duplicate_index(path: str) -> NearDuplicateIndex:
+    """MinHash index over the stored rules/terms/cases of ``path``.
+
+    When those scopes change (every ingest bumps them), the previous index is
+    extended with the rows added since, instead of re-hashing the whole DB.
+    """
+    path = os.path.abspath(path)
+    versions = data_versions(path)
+    key = tuple(versions.get(scope, 0) for scope in NEAR_DUPLICATE_SCOPES)
+    with _lock:
+        cached = _near_duplicate_indexes.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+    index = update_index_from_db(cached[1] if cached else NearDuplicateIndex(), path)
+    with _lock:
+        _near_duplicate_indexes[path] = (key, index)
+    return index
+
+
+__all__ = [
+    "data_versions",
+    "versioned_cache",
+    "clear_read_cache",
+    "cached_fetch_rules",
+    "cached_fetch_terms",
+    "cached_fetch_cases",
+    "cached_fetch_cases_by_chart",
+    "cached_fetch_tag_counts",
+    "cached_fetch_keyword_counts",
+    "cached_rule_network",
+    "cached_case_index",
+    "cached_near_duplicate_index",
+]
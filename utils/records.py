@@ -0,0 +1,110 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+try:
+    import pandas as pd
+except ImportError:  # 판다스가 없으면 DataFrame 어댑터만 쓸 수 없다
+    pd = None  # type: ignore[assignment]
+
+
+class _Record(Mapping):
+    """Read-only mapping view over a slotted record.
+
+    Fields left at ``None`` behave like absent keys, so ``record.get("source")``,
+    ``record["title"]`` and ``dict(record)`` give what the equivalent dict
+    would. Code that fills records (extraction, ingest) sets attributes directly.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        value = getattr(self, key, None) if key in self.__dataclass_fields__ else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name in self.__dataclass_fields__ if getattr(self, name) is not None)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self}
+
+
+@dataclass(slots=True)
+class RuleRecord(_Record):
+    condition: str
+    result: str
+    category: str
+    source: Optional[str] = None
+    linked_terms: Optional[List[str]] = None
+
+
+@dataclass(slots=True)
+class TermRecord(_Record):
+    term: str
+    definition: str
+    category: str
+    source: Optional[str] = None
+    linked_rules: Optional[List[str]] = None
+
+
+@dataclass(slots=True)
+class CaseRecord(_Record):
+    title: str
+    chart: str
+    summary: str
+    content: str
+    tags: Tuple[str, ...] = ()
+    source: Optional[str] = None
+    linked_terms: Optional[List[str]] = None
+    linked_rules: Optional[List[str]] = None
+
+
+RECORD_TYPES: Dict[str, Type[_Record]] = {"rules": RuleRecord, "terms": TermRecord, "cases": CaseRecord}
+
+
+def record_columns(records: Sequence[Any], record_type: Type[_Record]) -> Dict[str, List[Any]]:
+    """Column lists of ``records`` (records or plain dicts) in ``record_type`` field order.
+
+    Columns reference the records' own values, so no per-row dict is built.
+    Optional fields that no record sets (``source``, ``linked_*``) are left out.
+    """
+    if all(isinstance(record, record_type) for record in records):
+        def value(record: Any, name: str) -> Any:
+            return getattr(record, name)
+    else:
+        def value(record: Any, name: str) -> Any:
+            return record.get(name)
+
+    columns: Dict[str, List[Any]] = {}
+    for name, spec in record_type.__dataclass_fields__.items():
+        values = [value(record, name) for record in records]
+        if spec.default is not None or any(item is not None for item in values):
+            columns[name] = values
+    return columns
+
+
+def records_frame(records: Sequence[Any], record_type: Type[_Record]) -> "pd.DataFrame":
+    """DataFrame with one column per field of ``record_type`` (empty input keeps the required columns)."""
+    if pd is None:
+        raise ImportError("records_frame 에는 pandas 가 필요합니다")
+    return pd.DataFrame(record_columns(records, record_type))
+
+
+def records_to_dicts(records: Iterable[Any]) -> List[Dict[str, Any]]:
+    return [record.to_dict() if isinstance(record, _Record) else dict(record) for record in records]
+
+
+__all__ = [
+    "RuleRecord",
+    "TermRecord",
+    "CaseRecord",
+    "RECORD_TYPES",
+    "record_columns",
+    "records_frame",
+    "records_to_dicts",
+]
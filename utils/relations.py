@@ -0,0 +1,84 @@
+from itertools import combinations
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+STEMS = "甲乙丙丁戊己庚辛壬癸"
+BRANCHES = "子丑寅卯辰巳午未申酉戌亥"
+YANG_STEMS = "甲丙戊庚壬"
+
+Relation = Tuple[str, str, str]
+
+# 지지 쌍 관계 — 合(육합·반합), 沖, 破, 刑, 穿(害)
+BRANCH_PAIR_RELATIONS: Dict[str, Tuple[str, ...]] = {
+    "合": (
+        "子丑", "寅亥", "卯戌", "辰酉", "巳申", "午未",
+        "申子", "子辰", "申辰", "亥卯", "卯未", "亥未",
+        "寅午", "午戌", "寅戌", "巳酉", "酉丑", "巳丑",
+    ),
+    "沖": ("子午", "丑未", "寅申", "卯酉", "辰戌", "巳亥"),
+    "破": ("子酉", "丑辰", "寅亥", "卯午", "巳申", "未戌"),
+    "刑": ("寅巳", "巳申", "申寅", "丑戌", "戌未", "未丑", "子卯", "辰辰", "午午", "酉酉", "亥亥"),
+    "穿": ("子未", "丑午", "寅巳", "卯辰", "申亥", "酉戌"),
+}
+
+# 천간 쌍 관계 — 合(천간합), 沖(천간충)
+STEM_PAIR_RELATIONS: Dict[str, Tuple[str, ...]] = {
+    "合": ("甲己", "乙庚", "丙辛", "丁壬", "戊癸"),
+    "沖": ("甲庚", "乙辛", "丙壬", "丁癸"),
+}
+
+
+def _pair_table(definitions: Dict[str, Tuple[str, ...]]) -> Dict[Tuple[str, str], Tuple[str, ...]]:
+    table: Dict[Tuple[str, str], List[str]] = {}
+    for relation_type, pairs in definitions.items():
+        for first, second in pairs:
+            table.setdefault((first, second), []).append(relation_type)
+            if first != second:
+                table.setdefault((second, first), []).append(relation_type)
+    return {pair: tuple(types) for pair, types in table.items()}
+
+
+# (글자, 글자) → 관계 유형들. 대칭이므로 어느 순서로 조회해도 같다
+BRANCH_RELATION_TABLE = _pair_table(BRANCH_PAIR_RELATIONS)
+STEM_RELATION_TABLE = _pair_table(STEM_PAIR_RELATIONS)
+
+
+def pair_relations(first: str, second: str) -> List[Relation]:
+    """Relations between two characters (two branches or two stems)."""
+    table = STEM_RELATION_TABLE if first in STEMS else BRANCH_RELATION_TABLE
+    return [(first, second, relation_type) for relation_type in table.get((first, second), ())]
+
+
+def detect_relations(chars: Sequence[str]) -> List[Relation]:
+    """All pairwise relations among ``chars`` (positions in the given order)."""
+    relations: List[Relation] = []
+    for first, second in combinations(chars, 2):
+        relations.extend(pair_relations(first, second))
+    return relations
+
+
+def cross_relations(chars: Iterable[str], other: str) -> List[Relation]:
+    """Relations between each of ``chars`` and one extra character ``other``."""
+    relations: List[Relation] = []
+    for char in chars:
+        relations.extend(pair_relations(char, other))
+    return relations
+
+
+def relation_label(relation: Relation) -> str:
+    """``("午", "卯", "破")`` → ``"午卯破"`` (the form used in rule texts)."""
+    return "".join(relation)
+
+
+__all__ = [
+    "STEMS",
+    "BRANCHES",
+    "YANG_STEMS",
+    "BRANCH_PAIR_RELATIONS",
+    "STEM_PAIR_RELATIONS",
+    "BRANCH_RELATION_TABLE",
+    "STEM_RELATION_TABLE",
+    "pair_relations",
+    "detect_relations",
+    "cross_relations",
+    "relation_label",
+]
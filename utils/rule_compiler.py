@@ -0,0 +1,225 @@
+import json
+import re
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from utils.chart_parser import PILLAR_LABELS, PILLAR_POSITIONS, Pillars
+from utils.relations import BRANCHES, STEMS, pair_relations
+
+# 컴파일 규칙이 바뀌면 올린다 — 저장된 술어의 버전이 다르면 다시 컴파일한다
+COMPILER_VERSION = 2
+
+# 조건 문장에 나오는 관계 표기 → relations.py 의 관계 유형
+RELATION_WORDS = {
+    "合": "合", "합": "合",
+    "沖": "沖", "冲": "沖", "충": "沖",
+    "破": "破", "파": "破",
+    "刑": "刑", "형": "刑",
+    "穿": "穿", "害": "穿", "천": "穿", "해": "穿",
+}
+# 한 글자 한글 표기는 글자 바로 뒤에 붙었을 때만 관계로 읽는다 (종합·파악 등 오인 방지)
+STANDALONE_RELATIONS = "合沖冲破刑穿害"
+
+# "戊戌日주", "丙午 時", "辛일간", "午월" — 위치가 붙은 기둥/글자.
+# 한자 라벨 앞에만 공백을 허용하고, 한글 라벨은 글자에 바로 붙어 주/간/지·조사가 오거나 낱말이 끝날 때만
+# 위치로 읽는다 ("午 시기에", "卯월급이" 같은 문장 오인 방지)
+HANJA_PILLAR_LABELS = "".join(label for label in PILLAR_LABELS if not "가" <= label <= "힣")
+HANGUL_PILLAR_LABELS = "".join(label for label in PILLAR_LABELS if "가" <= label <= "힣")
+PILLAR_CONDITION_PATTERN = re.compile(
+    f"([{STEMS}][{BRANCHES}]|[{STEMS}]|[{BRANCHES}])"
+    f"(?:\\s*([{HANJA_PILLAR_LABELS}])(?:柱|주|干|간|支|지)?"
+    f"|([{HANGUL_PILLAR_LABELS}])(?:[주간지]|(?=[에의은는이가을를과와로도])|(?![가-힣])))"
+)
+# "寅巳申형", "午卯破", "子丑암합", "丙辛合" — 글자 묶음 + 관계
+GROUP_RELATION_PATTERN = re.compile(
+    f"([{BRANCHES}]{{2,3}}|[{STEMS}]{{2}})\\s*(?:暗|암)?([{''.join(RELATION_WORDS)}])"
+)
+
+# 술어 트리: 잎은 ("stem", 丁) / ("branch", 午) / ("pillar", "day", 戊) / ("relation", 破) /
+# ("pair", "卯午", 破), 내부 노드는 ("and", (자식, ...)) / ("or", (자식, ...))
+Predicate = Tuple
+Facts = FrozenSet[Tuple[str, ...]]
+
+
+def _pair_key(first: str, second: str) -> str:
+    return "".join(sorted((first, second)))
+
+
+def _combine(op: str, children: Iterable[Predicate]) -> Optional[Predicate]:
+    """Flattened, deduplicated and sorted so equal sub-predicates are equal tuples."""
+    flat: List[Predicate] = []
+    for child in children:
+        flat.extend(child[1] if child[0] == op else (child,))
+    unique = sorted(set(flat), key=repr)
+    if not unique:
+        return None
+    return unique[0] if len(unique) == 1 else (op, tuple(unique))
+
+
+def _mask(text: str, match: "re.Match") -> str:
+    return text[: match.start()] + " " * (match.end() - match.start()) + text[match.end():]
+
+
+def compile_condition(text: Optional[str]) -> Optional[Predicate]:
+    """Compile a rule condition into a predicate tree, or ``None`` if nothing is recognisable.
+
+    ``戊戌日주가 丁火透出을 만나면`` → day stem 戊 ∧ day branch 戌 ∧ stem 丁;
+    ``寅巳申형`` → branches 寅, 巳, 申 ∧ a 刑 relation; ``午卯破`` → the 午卯 破 pair.
+    Every recognised fragment must hold (conjunction).
+    """
+    if not text:
+        return None
+    leaves: List[Predicate] = []
+
+    for match in PILLAR_CONDITION_PATTERN.finditer(text):
+        position = PILLAR_LABELS[match.group(2) or match.group(3)]
+        leaves.extend(("pillar", position, char) for char in match.group(1))
+        text = _mask(text, match)
+
+    for match in GROUP_RELATION_PATTERN.finditer(text):
+        chars, relation_type = match.group(1), RELATION_WORDS[match.group(2)]
+        if len(chars) == 2:
+            leaves.append(("pair", _pair_key(chars[0], chars[1]), relation_type))
+        else:
+            leaves.extend(("branch", char) for char in chars)
+            leaves.append(("relation", relation_type))
+        text = _mask(text, match)
+
+    for char in text:
+        if char in STEMS:
+            leaves.append(("stem", char))
+        elif char in BRANCHES:
+            leaves.append(("branch", char))
+        elif char in STANDALONE_RELATIONS:
+            leaves.append(("relation", RELATION_WORDS[char]))
+
+    return _combine("and", leaves)
+
+
+def rule_condition_text(title: Optional[str], example: Optional[str]) -> str:
+    """Condition text of a stored rule: its title, else the example's left side (``寅巳申형 → …``)."""
+    if compile_condition(title) is not None:
+        return title or ""
+    return (example or "").split("→")[0]
+
+
+def compile_rule(title: Optional[str], example: Optional[str] = None) -> Optional[Predicate]:
+    return compile_condition(rule_condition_text(title, example))
+
+
+def predicate_to_json(predicate: Optional[Predicate]) -> Optional[str]:
+    return None if predicate is None else json.dumps(predicate, ensure_ascii=False)
+
+
+def predicate_from_json(value: Optional[str]) -> Optional[Predicate]:
+    def to_tuple(node: list) -> Predicate:
+        if node[0] in ("and", "or"):
+            return (node[0], tuple(to_tuple(child) for child in node[1]))
+        return tuple(node)
+
+    return None if not value else to_tuple(json.loads(value))
+
+
+@lru_cache(maxsize=None)
+def _pair_facts(first: str, second: str) -> Tuple[Tuple[str, ...], ...]:
+    facts: List[Tuple[str, ...]] = []
+    for _, _, relation_type in pair_relations(first, second):
+        facts.append(("relation", relation_type))
+        facts.append(("pair", _pair_key(first, second), relation_type))
+    return tuple(facts)
+
+
+@lru_cache(maxsize=None)
+def _pillar_facts(position: str, pillar: str) -> Tuple[Tuple[str, ...], ...]:
+    return (
+        ("pillar", position, pillar[0]),
+        ("pillar", position, pillar[1]),
+        ("stem", pillar[0]),
+        ("branch", pillar[1]),
+    )
+
+
+def chart_facts(pillars: Pillars) -> Facts:
+    """Every predicate leaf that holds for ``pillars`` (per-pillar and per-pair facts are tabled)."""
+    facts = set()
+    ordered = [pillars[position] for position in PILLAR_POSITIONS if position in pillars]
+    for position in PILLAR_POSITIONS:
+        if position in pillars:
+            facts.update(_pillar_facts(position, pillars[position]))
+    for first, second in combinations(ordered, 2):
+        facts.update(_pair_facts(first[0], second[0]))
+        facts.update(_pair_facts(first[1], second[1]))
+    return frozenset(facts)
+
+
+class RuleNetwork:
+    """Discrimination network over compiled rule predicates.
+
+    Structurally equal sub-predicates across rules become one node, stored
+    children-first, so matching a chart evaluates every distinct leaf and
+    conjunction exactly once in a single pass, independent of how many
+    rules share them.
+    """
+
+    def __init__(self) -> None:
+        self._node_ids: Dict[Predicate, int] = {}
+        self._nodes: List[Tuple[str, object]] = []
+        self._rules: List[Tuple[object, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    @property
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    def _node(self, predicate: Predicate) -> int:
+        node_id = self._node_ids.get(predicate)
+        if node_id is None:
+            if predicate[0] in ("and", "or"):
+                node = (predicate[0], tuple(self._node(child) for child in predicate[1]))
+            else:
+                node = ("leaf", predicate)
+            node_id = len(self._nodes)
+            self._nodes.append(node)
+            self._node_ids[predicate] = node_id
+        return node_id
+
+    def add(self, rule_id: object, predicate: Optional[Predicate]) -> bool:
+        """Register a rule; rules without a predicate are skipped (``False``)."""
+        if predicate is None:
+            return False
+        self._rules.append((rule_id, self._node(predicate)))
+        return True
+
+    @classmethod
+    def from_predicates(cls, predicates: Iterable[Tuple[object, Optional[Predicate]]]) -> "RuleNetwork":
+        network = cls()
+        for rule_id, predicate in predicates:
+            network.add(rule_id, predicate)
+        return network
+
+    def match(self, facts: Facts) -> List[object]:
+        """Ids of the rules whose predicate holds for ``facts`` (registration order)."""
+        values: List[bool] = []
+        for kind, payload in self._nodes:
+            if kind == "leaf":
+                values.append(payload in facts)
+            elif kind == "and":
+                values.append(all(values[child] for child in payload))
+            else:
+                values.append(any(values[child] for child in payload))
+        return [rule_id for rule_id, node_id in self._rules if values[node_id]]
+
+
+__all__ = [
+    "COMPILER_VERSION",
+    "compile_condition",
+    "rule_condition_text",
+    "compile_rule",
+    "predicate_to_json",
+    "predicate_from_json",
+    "chart_facts",
+    "RuleNetwork",
+]
@@ -0,0 +1,126 @@
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.db_manager_v2 import fetch_terms
+from utils.master_data import MasterData
+
+# "活木/死木(활목/사목)" → 본표기 "活木/死木", 괄호 안 독음 "활목/사목"
+READING_PATTERN = re.compile(r"^(?P<head>[^()（）]*)[(（](?P<reading>[^()（）]*)[)）]\s*$")
+# 마스터 데이터에서 사례(case)는 이름 대신 id 를 쓰므로 자동완성 대상에서 뺀다
+MASTER_SKIP_SECTIONS = ("cases",)
+
+
+def normalize_key(text: str) -> str:
+    """Lookup key: case-folded with all whitespace removed."""
+    return "".join(text.split()).casefold()
+
+
+def surface_forms(name: str) -> List[str]:
+    """Every form a user may type for ``name``.
+
+    ``祿神(록신)`` yields the full name, ``祿神`` and ``록신``; slash variants
+    such as ``活木/死木(활목/사목)`` also yield each side (``活木``, ``死木``,
+    ``활목``, ``사목``).
+    """
+    name = name.strip()
+    if not name:
+        return []
+    forms = [name]
+    match = READING_PATTERN.match(name)
+    parts = [match.group("head"), match.group("reading")] if match else [name]
+    for part in parts:
+        part = part.strip()
+        if not part:
+            continue
+        forms.append(part)
+        if "/" in part:
+            forms.extend(variant.strip() for variant in part.split("/") if variant.strip())
+    return list(dict.fromkeys(forms))
+
+
+class TermIndex:
+    """Sorted-array prefix index over term surface forms.
+
+    Keys are kept in one sorted list; a completion is a ``bisect`` to the
+    first key with the prefix followed by a short forward scan, so lookups
+    cost O(log n + k) regardless of how many terms are indexed.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[Tuple[str, str], Optional[str]] = {}
+        self._keys: List[str] = []
+        self._rows: List[Tuple[str, str, Optional[str]]] = []
+
+    def add(self, name: str, source: Optional[str] = None) -> None:
+        """Register ``name`` under all of its surface forms (index rebuilt lazily)."""
+        for form in surface_forms(name):
+            key = normalize_key(form)
+            if key:
+                self._pending.setdefault((key, name), source)
+
+    def _build(self) -> None:
+        if not self._pending:
+            return
+        merged = {(key, name): source for key, name, source in self._rows}
+        for pair, source in self._pending.items():
+            merged.setdefault(pair, source)
+        self._pending = {}
+        self._rows = sorted((key, name, source) for (key, name), source in merged.items())
+        self._keys = [row[0] for row in self._rows]
+
+    def __len__(self) -> int:
+        self._build()
+        return len({row[1] for row in self._rows})
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Dict[str, Optional[str]]]:
+        """Return up to ``limit`` distinct terms having a surface form starting with ``prefix``.
+
+        Exact surface matches sort first, then completions follow in key order.
+        """
+        self._build()
+        key = normalize_key(prefix)
+        if not key or limit <= 0:
+            return []
+
+        results: Dict[str, Dict[str, Optional[str]]] = {}
+        position = bisect_left(self._keys, key)
+        while position < len(self._rows) and len(results) < limit:
+            surface, name, source = self._rows[position]
+            if not surface.startswith(key):
+                break
+            if name not in results:
+                results[name] = {"name": name, "matched": surface, "source": source}
+            position += 1
+        return list(results.values())
+
+
+def build_term_index(
+    db_path: Optional[str] = None,
+    master: Optional[MasterData] = None,
+    *,
+    sections: Optional[Sequence[str]] = None,
+) -> TermIndex:
+    """Index term names from the SQLite ``terms`` table and/or the compiled master data.
+
+    Master data names come straight from its offset index, so no item is decoded.
+    """
+    index = TermIndex()
+    if db_path:
+        for row in fetch_terms(db_path):
+            if row.get("term"):
+                index.add(str(row["term"]), "db")
+    if master is not None:
+        for section in sections or [name for name in master.sections() if name not in MASTER_SKIP_SECTIONS]:
+            for name in master.names(section):
+                if name:
+                    index.add(name, section)
+    return index
+
+
+__all__ = [
+    "normalize_key",
+    "surface_forms",
+    "TermIndex",
+    "build_term_index",
+]
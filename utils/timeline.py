@@ -0,0 +1,110 @@
+from typing import Any, Callable, Dict, List, Tuple
+
+from utils.interpreter_v2 import DETECTED_RELATIONS, natal_chart
+from utils.logic_engine import infer_logic
+from utils.relations import BRANCHES, STEMS, YANG_STEMS, Relation, relation_label
+
+DAEWOON_YEARS = 10
+TIMELINE_YEARS = 100
+RELATION_TYPES = tuple(dict.fromkeys(relation[2] for relation in DETECTED_RELATIONS))
+# 타임라인의 관계 수 열 — 대운/세운이 더한 관계만 센다
+TRANSIT_COUNT_COLUMNS = tuple(f"운{relation_type}" for relation_type in RELATION_TYPES)
+MALE_LABELS = ("乾", "남", "男", "m", "male")
+MALE_PREFIXES = ("乾", "남", "男")
+
+
+def sexagenary(index: int) -> str:
+    """60갑자 순번 → 간지 (0 = 甲子)."""
+    return STEMS[index % 10] + BRANCHES[index % 12]
+
+
+def sexagenary_index(pillar: str) -> int:
+    stem, branch = STEMS.index(pillar[0]), BRANCHES.index(pillar[1])
+    # stem ≡ i (mod 10), branch ≡ i (mod 12) 를 만족하는 0..59 의 i
+    return (6 * stem - 5 * branch) % 60
+
+
+def year_pillar(year: int) -> str:
+    """Gregorian year → its 세운 pillar (1984 = 甲子)."""
+    return sexagenary(year - 4)
+
+
+def is_forward(year_stem: str, gender: str) -> bool:
+    """대운 순행 여부: 양간 남명·음간 여명은 순행, 나머지는 역행."""
+    # "坤(여)"·"female" 처럼 다른 표기에 포함된 글자는 남명으로 보지 않는다
+    label = gender.strip().lower()
+    male = label in MALE_LABELS or label.startswith(MALE_PREFIXES)
+    return (year_stem in YANG_STEMS) == male
+
+
+def daewoon_pillars(month_pillar: str, forward: bool, count: int) -> List[str]:
+    """월주에서 한 칸씩 순행/역행한 ``count`` 개의 대운 간지."""
+    start = sexagenary_index(month_pillar)
+    step = 1 if forward else -1
+    return [sexagenary(start + step * offset) for offset in range(1, count + 1)]
+
+
+def build_timeline(
+    gan: str,
+    zhi: str,
+    gender: str,
+    birth_year: int,
+    *,
+    start_age: int = 1,
+    years: int = TIMELINE_YEARS,
+    infer: Callable[[Dict[str, Any]], List[Dict[str, Any]]] = infer_logic,
+) -> List[Dict[str, Any]]:
+    """One row per year of life with the active 대운, the 세운 and their interpretation.
+
+    Ages are counted the Korean way (birth year = 1). ``start_age`` is the
+    대운수: the first 대운 begins at that age and each lasts ten years.
+    Each row interprets the natal relations together with those the year's
+    대운/세운 add; the ``운破``/``운合`` counts and ``운관계`` list only the
+    added ones. Natal relations are computed once; transit relations are
+    memoised per pillar and inference per distinct relation set, so the
+    whole century is a batch of table lookups.
+    """
+    natal = natal_chart(" ".join(gan.split()), " ".join(zhi.split()))
+    forward = is_forward(natal.year_pillar[0], gender)
+    daewoon_count = max(0, (years - start_age) // DAEWOON_YEARS + 1)
+    daewoons = daewoon_pillars(natal.month_pillar, forward, daewoon_count)
+
+    inference_cache: Dict[Tuple[Relation, ...], List[Dict[str, Any]]] = {}
+    rows: List[Dict[str, Any]] = []
+    for age in range(1, years + 1):
+        year = birth_year + age - 1
+        sewoon = year_pillar(year)
+        period = (age - start_age) // DAEWOON_YEARS if age >= start_age else None
+        daewoon = daewoons[period] if period is not None and period < len(daewoons) else None
+
+        transit = natal.transit_relations(daewoon or "", sewoon)
+        key = tuple(transit)
+        results = inference_cache.get(key)
+        if results is None:
+            # 해석은 interpret() 와 같이 원국 관계까지 포함해서 한다
+            results = infer({"감지관계": natal.relations + transit})
+            inference_cache[key] = results
+
+        row: Dict[str, Any] = {
+            "나이": age,
+            "연도": year,
+            "대운": daewoon or "-",
+            "세운": sewoon,
+        }
+        for relation_type in RELATION_TYPES:
+            row[f"운{relation_type}"] = sum(1 for relation in transit if relation[2] == relation_type)
+        row["운관계"] = ", ".join(relation_label(relation) for relation in transit)
+        row["해석"] = "; ".join(f"{result['카테고리']}: {result['결과']}" for result in results)
+        rows.append(row)
+    return rows
+
+
+__all__ = [
+    "TRANSIT_COUNT_COLUMNS",
+    "sexagenary",
+    "sexagenary_index",
+    "year_pillar",
+    "is_forward",
+    "daewoon_pillars",
+    "build_timeline",
+]
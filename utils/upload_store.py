@@ -0,0 +1,216 @@
+import hashlib
+import io
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Union
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+UPLOAD_DIR = BASE_DIR / "data" / "uploads"
+PROTECTED_DIR = BASE_DIR / "data" / "protected"
+INDEX_NAME = "index.db"
+OBJECTS_DIR_NAME = "objects"
+CHUNK_SIZE = 1 << 20
+DEFAULT_QUOTA_BYTES = 1 << 30
+
+KIND_UPLOAD = "upload"
+KIND_RENDER = "render"
+
+PathLike = Union[str, Path]
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stored_files (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stored_files_accessed ON stored_files(accessed_at);
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class StoredFile:
+    key: str
+    path: Path
+    name: str
+    size: int
+    kind: str
+    created: bool
+
+
+class UploadStore:
+    """Content-addressed file store with a size quota.
+
+    Files are streamed in ``chunk_size`` pieces while their SHA-256 is
+    computed and stored as ``objects/<2 hex>/<sha256><suffix>``, so identical
+    uploads share one file and same-named uploads never overwrite each other.
+    The suffix is kept because extraction picks the reader from it. A SQLite
+    index next to the objects records each file's original name, size, kind
+    (upload or render artifact) and creation/last-access time. When the total
+    size exceeds ``quota_bytes``, the least recently used files are evicted.
+    ``quota_bytes=None`` disables eviction.
+    """
+
+    def __init__(
+        self,
+        root: PathLike,
+        quota_bytes: Optional[int] = DEFAULT_QUOTA_BYTES,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        self.root = Path(root)
+        self.objects_dir = self.root / OBJECTS_DIR_NAME
+        self.index_path = self.root / INDEX_NAME
+        self.quota_bytes = quota_bytes
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        with self._index() as conn:
+            conn.executescript(INDEX_SCHEMA)
+
+    @contextmanager
+    def _index(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _object_path(self, key: str) -> Path:
+        return self.objects_dir / key[:2] / key
+
+    def save(
+        self,
+        stream: IO[bytes],
+        name: str,
+        *,
+        kind: str = KIND_UPLOAD,
+        protect: Iterable[str] = (),
+    ) -> StoredFile:
+        """Stream ``stream`` into the store under its content hash.
+
+        ``protect`` lists keys that must survive the quota check triggered by
+        this save (e.g. earlier files of the same upload batch).
+        """
+        if hasattr(stream, "seek"):
+            stream.seek(0)
+        hasher = hashlib.sha256()
+        size = 0
+        # 임시 파일에 쓰면서 해시를 계산하고, 다 쓴 뒤에야 주소가 정해진다
+        with tempfile.NamedTemporaryFile(dir=self.objects_dir, suffix=".part", delete=False) as temp_file:
+            try:
+                for chunk in iter(lambda: stream.read(self.chunk_size), b""):
+                    hasher.update(chunk)
+                    temp_file.write(chunk)
+                    size += len(chunk)
+            except BaseException:
+                temp_file.close()
+                os.unlink(temp_file.name)
+                raise
+
+        key = hasher.hexdigest() + Path(name).suffix.lower()
+        path = self._object_path(key)
+        now = time.time()
+        with self._lock:
+            path.parent.mkdir(exist_ok=True)
+            created = not path.exists()
+            if created:
+                os.replace(temp_file.name, path)
+            else:
+                os.unlink(temp_file.name)
+            with self._index() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO stored_files (key, kind, name, size, created_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET name=excluded.name, accessed_at=excluded.accessed_at
+                    """,
+                    (key, kind, name, size, now, now),
+                )
+            self._enforce_quota({key, *protect})
+        return StoredFile(key=key, path=path, name=name, size=size, kind=kind, created=created)
+
+    def save_bytes(self, data: bytes, name: str, *, kind: str = KIND_RENDER) -> StoredFile:
+        """Store an in-memory artifact (rendered HTML and the like)."""
+        return self.save(io.BytesIO(data), name, kind=kind)
+
+    def open(self, key: str) -> IO[bytes]:
+        """Open a stored file for reading and mark it as recently used."""
+        handle = self._object_path(key).open("rb")
+        with self._index() as conn:
+            conn.execute("UPDATE stored_files SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return handle
+
+    def entries(self, kind: Optional[str] = None) -> List[Dict[str, object]]:
+        """Index rows, most recently used first."""
+        sql = "SELECT key, kind, name, size, created_at, accessed_at FROM stored_files"
+        params: tuple = ()
+        if kind is not None:
+            sql += " WHERE kind = ?"
+            params = (kind,)
+        with self._index() as conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(sql + " ORDER BY accessed_at DESC", params)]
+
+    def usage(self) -> int:
+        with self._index() as conn:
+            return int(conn.execute("SELECT COALESCE(SUM(size), 0) FROM stored_files").fetchone()[0])
+
+    def enforce_quota(self, protect: Iterable[str] = ()) -> List[str]:
+        """Evict least recently used files until the store fits its quota; returns evicted keys."""
+        with self._lock:
+            return self._enforce_quota(set(protect))
+
+    def _enforce_quota(self, protect: set) -> List[str]:
+        if self.quota_bytes is None:
+            return []
+        evicted: List[str] = []
+        with self._index() as conn:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM stored_files").fetchone()[0]
+            if total <= self.quota_bytes:
+                return evicted
+            candidates = conn.execute("SELECT key, size FROM stored_files ORDER BY accessed_at").fetchall()
+            for key, size in candidates:
+                if total <= self.quota_bytes:
+                    break
+                if key in protect:
+                    continue
+                self._object_path(key).unlink(missing_ok=True)
+                conn.execute("DELETE FROM stored_files WHERE key = ?", (key,))
+                total -= size
+                evicted.append(key)
+        return evicted
+
+
+@lru_cache(maxsize=None)
+def upload_store() -> UploadStore:
+    """Shared store for uploads and render artifacts under ``data/uploads``."""
+    return UploadStore(UPLOAD_DIR)
+
+
+@lru_cache(maxsize=None)
+def protected_store() -> UploadStore:
+    """Store for sensitive uploads (``.env`` …) — same layout, never evicted."""
+    return UploadStore(PROTECTED_DIR, quota_bytes=None)
+
+
+__all__ = [
+    "UPLOAD_DIR",
+    "PROTECTED_DIR",
+    "DEFAULT_QUOTA_BYTES",
+    "KIND_UPLOAD",
+    "KIND_RENDER",
+    "StoredFile",
+    "UploadStore",
+    "upload_store",
+    "protected_store",
+]
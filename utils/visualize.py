@@ -1,8 +1,9 @@
-import os
 from typing import Iterable, Tuple
 
 from pyvis.network import Network
 
+from utils.upload_store import KIND_RENDER, upload_store
+
 Relation = Tuple[str, str, str]
 
 
@@ -22,9 +23,7 @@ def draw_chart_relations(name: str, relations: Iterable[Relation]) -> str:
         net.add_node(end, label=end)
         net.add_edge(start, end, label=relation, color=color)
 
-    output_dir = os.path.join("data", "uploads")
-    os.makedirs(output_dir, exist_ok=True)
-
-    html_path = os.path.join(output_dir, f"{name}_relations.html")
-    net.save_graph(html_path)
-    return html_path
+    # 렌더 결과도 업로드 저장소에 넣어 용량 한도 안에서 오래된 것부터 지운다
+    html = net.generate_html()
+    stored = upload_store().save_bytes(html.encode("utf-8"), f"{name}_relations.html", kind=KIND_RENDER)
+    return str(stored.path)